@@ -4,6 +4,8 @@ from .job_result_service import JobResultService
 from .connection_service import ConnectionService
 from .reachability_service import ReachabilityService
 from .reachability_persistence_service import ReachabilityPersistenceService
+from .reachability_history_service import ReachabilityHistoryService
+from .reachability_schedule_service import ReachabilityScheduleService
 
 __all__ = [
     "JobService",
@@ -12,4 +14,6 @@ __all__ = [
     "ConnectionService",
     "ReachabilityService",
     "ReachabilityPersistenceService",
+    "ReachabilityHistoryService",
+    "ReachabilityScheduleService",
 ]
\ No newline at end of file
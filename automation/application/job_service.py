@@ -38,3 +38,19 @@ class JobService:
         )
         run.devices.set(devices)
         return job, run
+
+    @staticmethod
+    @transaction.atomic
+    def create_sync_job(*, devices, created_by, params=None):
+        job = AutomationJob.objects.create(
+            job_type=JobType.DEVICE_SYNC,
+            status=JobStatus.PENDING,
+            created_by=created_by,
+        )
+        run = JobRun.objects.create(
+            job=job,
+            status=JobStatus.PENDING,
+            params=params or {},
+        )
+        run.devices.set(devices)
+        return job, run
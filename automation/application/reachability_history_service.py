@@ -0,0 +1,249 @@
+import re
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from typing import Iterable
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Exists, F, Max, OuterRef, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from automation.models import ReachabilityRollup, ReachabilitySample
+from dcim.models import Device
+
+
+SAMPLE_TABLE = ReachabilitySample._meta.db_table
+PARTITION_PATTERN = re.compile(rf"^{SAMPLE_TABLE}_p(?P<day>\d{{8}})$")
+ROLLUP_FIELDS = ["samples", "up", "rtt_count", "rtt_sum_us", "rtt_max_us"]
+
+
+class ReachabilityHistoryService:
+    """
+    Reachability time series: one ``ReachabilitySample`` per device per run,
+    hourly/daily ``ReachabilityRollup`` rows, and partition-based retention.
+
+    Days and hour buckets are UTC so partitions never straddle a DST change.
+    """
+
+    PROBE_BITS = {"ping": 1, "snmp": 2, "ssh": 4, "netconf": 8}
+
+    # -------------------------------------------------
+    # Samples
+    # -------------------------------------------------
+    @staticmethod
+    def record(payload: dict) -> int:
+        checked_at = payload.get("checked_at")
+        checked_at = (parse_datetime(checked_at) if checked_at else None) or timezone.now()
+        day = checked_at.astimezone(dt_timezone.utc).date()
+
+        samples = []
+        for r in payload.get("results", []):
+            statuses = r.get("statuses") or {}
+            checked = reachable = 0
+            for name, ok in statuses.items():
+                bit = ReachabilityHistoryService.PROBE_BITS.get(name)
+                if bit is None:
+                    continue
+                checked |= bit
+                if ok:
+                    reachable |= bit
+            if not checked:
+                continue
+            rtt_ms = r.get("rtt_ms")
+            samples.append(
+                ReachabilitySample(
+                    day=day,
+                    device_id=r["device_id"],
+                    checked_at=checked_at,
+                    checked=checked,
+                    reachable=reachable,
+                    rtt_us=round(rtt_ms * 1000) if rtt_ms is not None else None,
+                )
+            )
+        if not samples:
+            return 0
+
+        ReachabilityHistoryService.ensure_partitions([day])
+        ReachabilitySample.objects.bulk_create(samples, batch_size=2000, ignore_conflicts=True)
+        return len(samples)
+
+    @staticmethod
+    def ensure_partitions(days: Iterable[date]) -> None:
+        """Create the daily sample partitions that do not exist yet (PostgreSQL only)."""
+        if connection.vendor != "postgresql":
+            return
+        with connection.cursor() as cursor:
+            for day in sorted(set(days)):
+                name = f"{SAMPLE_TABLE}_p{day:%Y%m%d}"
+                cursor.execute("SELECT to_regclass(%s)", [name])
+                if cursor.fetchone()[0] is not None:
+                    continue
+                cursor.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{SAMPLE_TABLE}" '
+                    f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+                )
+
+    @staticmethod
+    def partitions() -> list[date]:
+        if connection.vendor != "postgresql":
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = %s::regclass",
+                [SAMPLE_TABLE],
+            )
+            names = [row[0] for row in cursor.fetchall()]
+        days = []
+        for name in names:
+            match = PARTITION_PATTERN.match(name)
+            if match:
+                days.append(datetime.strptime(match["day"], "%Y%m%d").date())
+        return sorted(days)
+
+    # -------------------------------------------------
+    # Rollups
+    # -------------------------------------------------
+    @staticmethod
+    def rollup(*, now: datetime | None = None, hours: int = 3) -> dict:
+        """
+        Recompute the hourly rollups of the last ``hours`` hour buckets
+        (including the current one) and the daily rollups of the days they
+        fall on. Rollups are upserted, so re-running is harmless.
+        """
+        now = now or timezone.now()
+        current_hour = now.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+        start = current_hour - timedelta(hours=max(1, hours) - 1)
+
+        hourly = (
+            ReachabilitySample.objects.filter(day__gte=start.date(), checked_at__gte=start)
+            .filter(Exists(Device.objects.filter(pk=OuterRef("device_id"))))
+            .annotate(bucket=TruncHour("checked_at", tzinfo=dt_timezone.utc))
+            .values("device_id", "bucket")
+            .annotate(
+                samples=Count("checked_at"),
+                up=Count("checked_at", filter=Q(checked__gt=0, reachable=F("checked"))),
+                rtt_count=Count("rtt_us"),
+                rtt_sum_us=Sum("rtt_us"),
+                rtt_max_us=Max("rtt_us"),
+            )
+        )
+        hours_written = ReachabilityHistoryService._upsert(ReachabilityRollup.Period.HOUR, hourly)
+
+        day_start = datetime.combine(start.date(), datetime.min.time(), tzinfo=dt_timezone.utc)
+        daily = (
+            ReachabilityRollup.objects.filter(period=ReachabilityRollup.Period.HOUR, bucket__gte=day_start)
+            .annotate(day=TruncDay("bucket", tzinfo=dt_timezone.utc))
+            .values("device_id", "day")
+            .annotate(
+                day_samples=Sum("samples"),
+                day_up=Sum("up"),
+                day_rtt_count=Sum("rtt_count"),
+                day_rtt_sum_us=Sum("rtt_sum_us"),
+                day_rtt_max_us=Max("rtt_max_us"),
+            )
+        )
+        days_written = ReachabilityHistoryService._upsert(
+            ReachabilityRollup.Period.DAY,
+            (
+                {
+                    "device_id": row["device_id"],
+                    "bucket": row["day"],
+                    "samples": row["day_samples"],
+                    "up": row["day_up"],
+                    "rtt_count": row["day_rtt_count"],
+                    "rtt_sum_us": row["day_rtt_sum_us"],
+                    "rtt_max_us": row["day_rtt_max_us"],
+                }
+                for row in daily
+            ),
+        )
+        return {"hourly": hours_written, "daily": days_written}
+
+    @staticmethod
+    def _upsert(period: str, rows) -> int:
+        rollups = [
+            ReachabilityRollup(
+                device_id=row["device_id"],
+                period=period,
+                bucket=row["bucket"],
+                samples=row["samples"],
+                up=row["up"],
+                rtt_count=row["rtt_count"],
+                rtt_sum_us=row["rtt_sum_us"] or 0,
+                rtt_max_us=row["rtt_max_us"],
+            )
+            for row in rows
+        ]
+        ReachabilityRollup.objects.bulk_create(
+            rollups,
+            batch_size=2000,
+            update_conflicts=True,
+            unique_fields=["device", "period", "bucket"],
+            update_fields=ROLLUP_FIELDS,
+        )
+        return len(rollups)
+
+    @staticmethod
+    def availability(device, *, now: datetime | None = None) -> dict:
+        """Availability percentage over the last 24 hours, 7 and 30 days (one query)."""
+        now = now or timezone.now()
+        today = datetime.combine(
+            now.astimezone(dt_timezone.utc).date(), datetime.min.time(), tzinfo=dt_timezone.utc
+        )
+        windows = {
+            "last_24h": Q(period=ReachabilityRollup.Period.HOUR, bucket__gte=now - timedelta(hours=24)),
+            "last_7d": Q(period=ReachabilityRollup.Period.DAY, bucket__gte=today - timedelta(days=6)),
+            "last_30d": Q(period=ReachabilityRollup.Period.DAY, bucket__gte=today - timedelta(days=29)),
+        }
+        aggregates = {}
+        for key, window in windows.items():
+            aggregates[f"up_{key}"] = Sum("up", filter=window)
+            aggregates[f"samples_{key}"] = Sum("samples", filter=window)
+        totals = ReachabilityRollup.objects.filter(device=device).aggregate(**aggregates)
+        return {
+            key: (
+                round(totals[f"up_{key}"] / totals[f"samples_{key}"] * 100, 2)
+                if totals[f"samples_{key}"]
+                else None
+            )
+            for key in windows
+        }
+
+    # -------------------------------------------------
+    # Retention
+    # -------------------------------------------------
+    @staticmethod
+    def purge(*, now: datetime | None = None) -> dict:
+        """
+        Drop sample partitions older than ``REACHABILITY_SAMPLE_RETENTION_DAYS``
+        and rollups past their own retention.
+        """
+        now = now or timezone.now()
+        cutoff_day = now.astimezone(dt_timezone.utc).date() - timedelta(
+            days=settings.REACHABILITY_SAMPLE_RETENTION_DAYS
+        )
+
+        dropped = 0
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                for day in ReachabilityHistoryService.partitions():
+                    if day < cutoff_day:
+                        cursor.execute(f'DROP TABLE IF EXISTS "{SAMPLE_TABLE}_p{day:%Y%m%d}"')
+                        dropped += 1
+        else:
+            dropped, _ = ReachabilitySample.objects.filter(day__lt=cutoff_day).delete()
+
+        rollups, _ = ReachabilityRollup.objects.filter(
+            Q(
+                period=ReachabilityRollup.Period.HOUR,
+                bucket__lt=now - timedelta(days=settings.REACHABILITY_HOURLY_ROLLUP_RETENTION_DAYS),
+            )
+            | Q(
+                period=ReachabilityRollup.Period.DAY,
+                bucket__lt=now - timedelta(days=settings.REACHABILITY_DAILY_ROLLUP_RETENTION_DAYS),
+            )
+        ).delete()
+        return {"partitions": dropped, "rollups": rollups}
@@ -1,32 +1,166 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Value
 from django.utils.dateparse import parse_datetime
 from django.utils import timezone
 
+from automation.application.reachability_schedule_service import ReachabilityScheduleService
 from dcim.models import DeviceRuntimeStatus, Device
 
 
 class ReachabilityPersistenceService:
+    STATUS_FIELDS = {
+        "ping": "reachable_ping",
+        "snmp": "reachable_snmp",
+        "ssh": "reachable_ssh",
+        "netconf": "reachable_netconf",
+    }
+
     @staticmethod
-    def persist(payload: dict) -> None:
+    def persist(
+        payload: dict,
+        *,
+        touch_unchanged: bool | None = None,
+        base_interval: timedelta | None = None,
+    ) -> dict:
+        """
+        Write a reachability payload in bulk.
+
+        Runtime rows are loaded in one query; missing rows are bulk-created,
+        rows whose flags changed, whose device rebooted or that got their
+        first SNMP uptime are written with one ``bulk_update``. The rest only
+        get ``last_check`` bumped in one UPDATE, which also advances a still
+        counting uptime by the time since the last check (skipped when
+        ``touch_unchanged`` / ``REACHABILITY_TOUCH_UNCHANGED`` is off).
+
+        With ``base_interval`` the adaptive schedule (``next_check`` /
+        ``stable_checks``, see ``ReachabilityScheduleService``) is advanced
+        too: unchanged rows get one UPDATE per resulting interval and the ids
+        of devices whose flags changed are returned under ``"recheck"``.
+        """
+        if touch_unchanged is None:
+            touch_unchanged = settings.REACHABILITY_TOUCH_UNCHANGED
+
         checked_at = payload.get("checked_at")
         dt = parse_datetime(checked_at) if checked_at else None
         now = dt or timezone.now()
 
-        for r in payload.get("results", []):
-            device_id = r["device_id"]
-            statuses = r.get("statuses", {})
+        statuses_by_device = {
+            str(r["device_id"]): {
+                ReachabilityPersistenceService.STATUS_FIELDS[name]: bool(ok)
+                for name, ok in (r.get("statuses") or {}).items()
+                if name in ReachabilityPersistenceService.STATUS_FIELDS
+            }
+            for r in payload.get("results", [])
+        }
+        uptimes = {
+            str(r["device_id"]): timedelta(seconds=r["uptime_seconds"])
+            for r in payload.get("results", [])
+            if r.get("uptime_seconds") is not None
+        }
+        schedule = base_interval is not None
+        if not statuses_by_device:
+            return {"created": 0, "changed": 0, "touched": 0, **({"recheck": []} if schedule else {})}
 
-            device = Device.objects.get(id=device_id)
-            runtime, _ = DeviceRuntimeStatus.objects.get_or_create(device=device)
+        runtimes = {
+            str(runtime.device_id): runtime
+            for runtime in DeviceRuntimeStatus.objects.filter(device_id__in=statuses_by_device)
+        }
 
-            # set known fields if present
-            if "ping" in statuses:
-                runtime.reachable_ping = bool(statuses["ping"])
-            if "snmp" in statuses:
-                runtime.reachable_snmp = bool(statuses["snmp"])
-            if "ssh" in statuses:
-                runtime.reachable_ssh = bool(statuses["ssh"])
-            if "netconf" in statuses:
-                runtime.reachable_netconf = bool(statuses["netconf"])
+        missing = [device_id for device_id in statuses_by_device if device_id not in runtimes]
+        created = []
+        if missing:
+            existing_ids = Device.objects.filter(id__in=missing).values_list("id", flat=True)
+            created = [
+                DeviceRuntimeStatus(
+                    device_id=device_id,
+                    last_check=now,
+                    uptime=uptimes.get(str(device_id)),
+                    next_check=now + base_interval if schedule else None,
+                    **statuses_by_device[str(device_id)],
+                )
+                for device_id in existing_ids
+            ]
+            # A concurrent sync may create the same row; it is updated next run.
+            DeviceRuntimeStatus.objects.bulk_create(created, ignore_conflicts=True)
 
+        changed = 0
+        recheck = []
+        to_update = []
+        unchanged = []
+        update_fields = set()
+        for device_id, runtime in runtimes.items():
+            diff = {
+                field: value
+                for field, value in statuses_by_device[device_id].items()
+                if getattr(runtime, field) != value
+            }
+            uptime = uptimes.get(device_id)
+            counting = uptime is None or (
+                runtime.uptime is not None and runtime.last_check is not None and uptime >= runtime.uptime
+            )
+            if not diff and counting:
+                unchanged.append(runtime)
+                continue
+            if schedule:
+                # A lower uptime than last time means the device rebooted.
+                rebooted = uptime is not None and runtime.uptime is not None and uptime < runtime.uptime
+                runtime.stable_checks = 0 if diff or rebooted else runtime.stable_checks + 1
+                if diff:
+                    recheck.append(device_id)
+                    interval = ReachabilityScheduleService.recheck_delay(base_interval)
+                else:
+                    interval = ReachabilityScheduleService.next_interval(
+                        runtime.stable_checks,
+                        up=all(statuses_by_device[device_id].values()),
+                        base=base_interval,
+                    )
+                runtime.next_check = now + interval
+                update_fields.update(["stable_checks", "next_check"])
+            for field, value in diff.items():
+                setattr(runtime, field, value)
+            if diff:
+                runtime.updated_at = now
+                update_fields.update([*diff, "updated_at"])
+                changed += 1
+            if uptime is not None:
+                runtime.uptime = uptime
+                update_fields.add("uptime")
             runtime.last_check = now
-            runtime.save()
+            to_update.append(runtime)
+
+        if to_update:
+            DeviceRuntimeStatus.objects.bulk_update(to_update, [*sorted(update_fields), "last_check"])
+        if unchanged and (schedule or touch_unchanged):
+            groups = {}
+            for runtime in unchanged:
+                device_id = str(runtime.device_id)
+                interval = (
+                    ReachabilityScheduleService.next_interval(
+                        runtime.stable_checks + 1,
+                        up=all(statuses_by_device[device_id].values()),
+                        base=base_interval,
+                    )
+                    if schedule
+                    else None
+                )
+                groups.setdefault((interval, device_id in uptimes), []).append(runtime.pk)
+            for (interval, counting), pks in groups.items():
+                fields = {}
+                if schedule:
+                    fields.update(stable_checks=F("stable_checks") + 1, next_check=now + interval)
+                if touch_unchanged:
+                    fields["last_check"] = now
+                    if counting:
+                        fields["uptime"] = F("uptime") + (Value(now) - F("last_check"))
+                DeviceRuntimeStatus.objects.filter(pk__in=pks).update(**fields)
+
+        counts = {
+            "created": len(created),
+            "changed": changed,
+            "touched": len(to_update) - changed + (len(unchanged) if touch_unchanged else 0),
+        }
+        if schedule:
+            counts["recheck"] = recheck
+        return counts
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+
+class ReachabilityScheduleService:
+    """
+    Adaptive per-device reachability scheduling.
+
+    The beat task still ticks every ``reachability_interval_minutes`` (the
+    base interval) but only probes devices whose ``runtime.next_check`` is
+    due. A device that stays reachable backs off: its interval doubles every
+    ``REACHABILITY_BACKOFF_CHECKS`` unchanged checks, up to
+    ``REACHABILITY_MAX_STALENESS_MINUTES``. Unreachable devices stay at the
+    base interval and devices whose state just changed get a follow-up
+    recheck after ``REACHABILITY_RECHECK_SECONDS``.
+    """
+
+    @staticmethod
+    def enabled() -> bool:
+        return settings.REACHABILITY_ADAPTIVE
+
+    @staticmethod
+    def max_staleness(base: timedelta) -> timedelta:
+        return max(base, timedelta(minutes=settings.REACHABILITY_MAX_STALENESS_MINUTES))
+
+    @staticmethod
+    def recheck_delay(base: timedelta) -> timedelta:
+        return min(base, timedelta(seconds=settings.REACHABILITY_RECHECK_SECONDS))
+
+    @staticmethod
+    def next_interval(stable_checks: int, *, up: bool, base: timedelta) -> timedelta:
+        if not up:
+            return base
+        step = max(1, settings.REACHABILITY_BACKOFF_CHECKS)
+        cap = ReachabilityScheduleService.max_staleness(base)
+        interval = base
+        for _ in range(stable_checks // step):
+            interval *= 2
+            if interval >= cap:
+                return cap
+        return interval
+
+    @staticmethod
+    def due(devices, *, base: timedelta, now: datetime | None = None):
+        """
+        Narrow ``devices`` to those due at this tick. Half a tick of slack keeps
+        a device from slipping a whole tick because of beat jitter; devices
+        never probed, or not probed within the staleness bound, are always due.
+        """
+        if not ReachabilityScheduleService.enabled():
+            return devices
+        now = now or timezone.now()
+        horizon = now + base / 2
+        stale = horizon - ReachabilityScheduleService.max_staleness(base)
+        return devices.filter(
+            Q(runtime__isnull=True)
+            | Q(runtime__next_check__isnull=True)
+            | Q(runtime__last_check__isnull=True)
+            | Q(runtime__next_check__lte=horizon)
+            | Q(runtime__last_check__lte=stale)
+        )
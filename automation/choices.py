@@ -36,12 +36,14 @@ class JobType:
     REACHABILITY = "reachability"
     TELEMETRY = "telemetry"
     COMMAND = "command"
+    DEVICE_SYNC = "device_sync"
 
     CHOICES = (
         (CONFIG_BACKUP, "Configuration Backup"),
         (REACHABILITY, "Reachability Check"),
         (TELEMETRY, "Telemetry Snapshot"),
         (COMMAND, "Run Command"),
+        (DEVICE_SYNC, "Device Sync"),
     )
 
 
@@ -0,0 +1,216 @@
+import ipaddress
+import os
+import random
+import select
+import socket
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ICMP_HEADER = struct.Struct("!BBHHH")
+PAYLOAD_SIZE = 56
+
+
+class IcmpUnavailableError(OSError):
+    """Neither an unprivileged ICMP datagram socket nor a raw socket could be opened."""
+
+
+@dataclass
+class PingResult:
+    host: str
+    sent: int = 0
+    received: int = 0
+    rtts_ms: List[float] = field(default_factory=list)
+
+    @property
+    def alive(self) -> bool:
+        return self.received > 0
+
+    @property
+    def loss(self) -> float:
+        return 1.0 - self.received / self.sent if self.sent else 1.0
+
+    @property
+    def rtt_avg_ms(self) -> Optional[float]:
+        return sum(self.rtts_ms) / len(self.rtts_ms) if self.rtts_ms else None
+
+    @property
+    def rtt_min_ms(self) -> Optional[float]:
+        return min(self.rtts_ms) if self.rtts_ms else None
+
+    @property
+    def rtt_max_ms(self) -> Optional[float]:
+        return max(self.rtts_ms) if self.rtts_ms else None
+
+
+def checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def is_ipv4(host: Optional[str]) -> bool:
+    try:
+        return isinstance(ipaddress.ip_address(str(host)), ipaddress.IPv4Address)
+    except ValueError:
+        return False
+
+
+class IcmpPinger:
+    """
+    In-process batched ICMP echo for IPv4.
+
+    One socket sends echo requests to every target and replies are matched
+    back by identifier and sequence number, so a sweep costs no process
+    spawns. Linux unprivileged ICMP datagram sockets are used when
+    ``net.ipv4.ping_group_range`` allows it, raw sockets otherwise.
+    ``IcmpUnavailableError`` means the caller has to fall back to ``ping``.
+
+    Every host gets ``count`` echoes; each one is lost after ``timeout``
+    seconds. At most ``max_in_flight`` echoes are outstanding at a time.
+    """
+
+    def __init__(self, *, timeout: float = 1.0, count: int = 1, max_in_flight: int = 4096):
+        self.timeout = timeout
+        self.count = max(1, count)
+        self.max_in_flight = max(1, min(max_in_flight, 0xFFFF))
+
+    @staticmethod
+    def open_socket() -> tuple[socket.socket, bool]:
+        """Return ``(sock, is_raw)``."""
+        try:
+            return socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP), False
+        except (OSError, AttributeError):
+            pass
+        try:
+            return socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP), True
+        except (OSError, AttributeError) as exc:
+            raise IcmpUnavailableError(f"ICMP sockets unavailable: {exc}") from exc
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            sock, _ = cls.open_socket()
+        except IcmpUnavailableError:
+            return False
+        sock.close()
+        return True
+
+    def ping(self, host: str) -> PingResult:
+        return self.ping_many([host])[host]
+
+    def ping_many(self, hosts: Iterable[str]) -> Dict[str, PingResult]:
+        """
+        Ping every host and return ``{host: PingResult}`` in input order.
+
+        Hosts that are not IPv4 addresses are reported with nothing sent.
+        """
+        results: Dict[str, PingResult] = {}
+        for host in hosts:
+            results.setdefault(str(host), PingResult(host=str(host)))
+        targets = [host for host in results if is_ipv4(host)]
+        if not targets:
+            return results
+
+        sock, is_raw = self.open_socket()
+        try:
+            sock.setblocking(False)
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+            except OSError:
+                pass
+            self._run(sock, is_raw, targets, results)
+        finally:
+            sock.close()
+        return results
+
+    # -------------------------------------------------
+    # Echo loop
+    # -------------------------------------------------
+    def _run(self, sock, is_raw: bool, targets: List[str], results: Dict[str, PingResult]) -> None:
+        # Datagram sockets get their identifier from the kernel, which also
+        # filters replies; raw sockets see every ICMP packet on the host.
+        identifier = (os.getpid() ^ random.getrandbits(16)) & 0xFFFF
+        token = random.getrandbits(64).to_bytes(8, "big")
+        payload = token + bytes(PAYLOAD_SIZE - len(token))
+
+        queue = deque(host for _ in range(self.count) for host in targets)
+        pending: Dict[int, tuple[str, float]] = {}
+        expiry: deque = deque()
+        next_seq = 0
+
+        while queue or pending:
+            blocked = False
+            while queue and len(pending) < self.max_in_flight:
+                while next_seq in pending:
+                    next_seq = (next_seq + 1) & 0xFFFF
+                seq = next_seq
+                next_seq = (next_seq + 1) & 0xFFFF
+                host = queue[0]
+                header = ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, 0, identifier, seq)
+                packet = ICMP_HEADER.pack(
+                    ICMP_ECHO_REQUEST, 0, checksum(header + payload), identifier, seq
+                ) + payload
+                try:
+                    sock.sendto(packet, (host, 0))
+                except BlockingIOError:
+                    blocked = True
+                    break
+                except OSError:
+                    # Unreachable network and the like: the echo is lost.
+                    queue.popleft()
+                    results[host].sent += 1
+                    continue
+                queue.popleft()
+                results[host].sent += 1
+                sent_at = time.monotonic()
+                pending[seq] = (host, sent_at)
+                expiry.append((sent_at + self.timeout, seq, sent_at))
+
+            now = time.monotonic()
+            while expiry and expiry[0][0] <= now:
+                _, seq, sent_at = expiry.popleft()
+                if seq in pending and pending[seq][1] == sent_at:
+                    del pending[seq]
+            if not pending and not queue:
+                break
+
+            wait = expiry[0][0] - now if expiry else 0.0
+            if blocked:
+                wait = min(wait, 0.01)
+            readable, _, _ = select.select([sock], [], [], max(0.0, wait))
+            if readable:
+                self._drain(sock, is_raw, identifier, token, pending, results)
+
+    @staticmethod
+    def _drain(sock, is_raw, identifier, token, pending, results) -> None:
+        while True:
+            try:
+                data, address = sock.recvfrom(2048)
+            except OSError:
+                return
+            received_at = time.monotonic()
+            if is_raw:
+                data = data[(data[0] & 0x0F) * 4:]
+            if len(data) < ICMP_HEADER.size:
+                continue
+            icmp_type, _, _, reply_id, seq = ICMP_HEADER.unpack_from(data)
+            if icmp_type != ICMP_ECHO_REPLY:
+                continue
+            if is_raw and (reply_id != identifier or data[ICMP_HEADER.size:ICMP_HEADER.size + 8] != token):
+                continue
+            entry = pending.get(seq)
+            if entry is None or entry[0] != address[0]:
+                continue
+            host, sent_at = pending.pop(seq)
+            result = results[host]
+            result.received += 1
+            result.rtts_ms.append((received_at - sent_at) * 1000.0)
@@ -1,11 +1,17 @@
 # automation/engine/reachability_engine.py
 
-from typing import Iterable, Optional, List, Tuple, Dict, Any
+import asyncio
+import logging
+from functools import partial
+from typing import Iterable, Optional, List, Dict, Any, Tuple
+
+from django.conf import settings
 from django.utils import timezone
 
 from accounts.models import SSHCredential, SNMPCredential
 from dcim.models import Device
-from .snmp_engine import SNMPEngine
+from .icmp_engine import IcmpPinger, IcmpUnavailableError, PingResult, is_ipv4
+from .snmp_engine import SNMPEngine, SnmpSystemInfo
 from .netconf_engine import NetconfEngine
 
 import subprocess
@@ -14,6 +20,9 @@ import struct
 from contextlib import closing
 
 
+logger = logging.getLogger(__name__)
+
+
 class ReachabilityEngine:
     """
     Unified engine for ping + SNMP + SSH + NETCONF reachability checks.
@@ -23,10 +32,19 @@ class ReachabilityEngine:
     - It returns measurement results.
     """
 
+    PROBE_TIMEOUTS = {"ping": 2.0, "snmp": 1.0, "ssh": 1.0, "netconf": 2.0}
+    # Reply wait of the batched in-process ping (``ping -W 1`` equivalent).
+    ECHO_TIMEOUT = 1.0
+
     @staticmethod
     def ping(host: Optional[str]) -> bool:
         if not host:
             return False
+        if is_ipv4(host):
+            try:
+                return IcmpPinger(timeout=1.0).ping(str(host)).alive
+            except IcmpUnavailableError:
+                pass
         try:
             result = subprocess.run(
                 ["ping", "-c", "1", "-W", "1", host],
@@ -61,9 +79,12 @@ class ReachabilityEngine:
         except OSError:
             return False
 
-    def __init__(self):
-        self.snmp_engine = SNMPEngine()
+    def __init__(self, *, concurrency: Optional[int] = None, timeouts: Optional[Dict[str, float]] = None):
+        self.concurrency = max(1, concurrency or settings.REACHABILITY_CONCURRENCY)
+        self.timeouts = {**self.PROBE_TIMEOUTS, **(timeouts or {})}
+        self.snmp_engine = SNMPEngine(timeout=self.timeouts["snmp"], max_in_flight=self.concurrency)
         self.netconf_engine = NetconfEngine()
+        self.pinger = IcmpPinger(timeout=self.ECHO_TIMEOUT)
 
     def measure(
         self,
@@ -77,71 +98,205 @@ class ReachabilityEngine:
         """
         Measure reachability. Does NOT persist anything.
         Returns serializable payload.
+
+        Every enabled probe of every device runs concurrently, at most
+        ``self.concurrency`` at a time, and each probe is bounded by its
+        timeout in ``self.timeouts``.
         """
         now = timezone.now()
-        results: List[Dict[str, Any]] = []
-        snmp_cache = {}
-        ssh_cache = {}
-
-        for device in devices:
-            statuses: List[Tuple[str, bool]] = []
-
-            # Ping
-            if check_ping:
-                val = self.ping(device.management_ip)
-                statuses.append(("ping", val))
+        devices = list(devices)
+        snmp_configs, ssh_ports = self._site_credentials(
+            devices, check_snmp=check_snmp, check_ssh=check_ssh
+        )
+        checks = [
+            name
+            for name, enabled in (
+                ("ping", check_ping),
+                ("snmp", check_snmp),
+                ("ssh", check_ssh),
+                ("netconf", check_netconf),
+            )
+            if enabled
+        ]
 
-            # SNMP
-            if check_snmp:
-                snmp_creds = snmp_cache.get(device.site_id)
-                if device.site_id and device.site_id not in snmp_cache:
-                    snmp_creds = SNMPCredential.objects.filter(site=device.site).first()
-                    snmp_cache[device.site_id] = snmp_creds
-                snmp_config = self._build_snmp_config(snmp_creds)
-                val = (
-                    self.snmp_engine.check(device.management_ip, snmp_config)
-                    if snmp_config
-                    else False
+        rtts: Dict[str, float] = {}
+        uptimes: Dict[Any, float] = {}
+        try:
+            statuses = asyncio.run(
+                self._probe_all(
+                    devices,
+                    checks,
+                    snmp_configs=snmp_configs,
+                    ssh_ports=ssh_ports,
+                    rtts=rtts,
+                    uptimes=uptimes,
                 )
-                statuses.append(("snmp", val))
+            )
+        finally:
+            self.snmp_engine.close()
 
-            # SSH (TCP port check)
-            if check_ssh:
-                ssh_creds = ssh_cache.get(device.site_id)
-                if device.site_id and device.site_id not in ssh_cache:
-                    ssh_creds = SSHCredential.objects.filter(site=device.site).first()
-                    ssh_cache[device.site_id] = ssh_creds
-                port = ssh_creds.ssh_port if ssh_creds else 22
-                val = self.ssh_check(device.management_ip, port=port) if device.management_ip else False
-                statuses.append(("ssh", val))
-
-            # NETCONF
-            if check_netconf:
-                val = self.netconf_check(device.management_ip)
-                statuses.append(("netconf", val))
-
-            results.append({
+        results: List[Dict[str, Any]] = []
+        for device, device_statuses in zip(devices, statuses):
+            management_ip = str(device.management_ip) if device.management_ip else None
+            result = {
                 "device_id": str(device.id),
                 "hostname": device.name,
-                "management_ip": str(device.management_ip) if device.management_ip else None,
-                "statuses": {name: bool(ok) for name, ok in statuses},
-            })
-
-            summary = {
-                "total": len(results),
-                "reachable": sum(
-                    1 for r in results
-                    if r.get("statuses") and all(r["statuses"].values())
-                ),
-                "unreachable": sum(
-                    1 for r in results
-                    if not (r.get("statuses") and all(r["statuses"].values()))
-                ),
+                "management_ip": management_ip,
+                "statuses": {name: bool(ok) for name, ok in zip(checks, device_statuses)},
             }
-
+            if check_ping:
+                result["rtt_ms"] = rtts.get(management_ip)
+            if check_snmp:
+                result["uptime_seconds"] = uptimes.get(device.id)
+            results.append(result)
+        reachable = sum(1 for r in results if r["statuses"] and all(r["statuses"].values()))
+        summary = {
+            "total": len(results),
+            "reachable": reachable,
+            "unreachable": len(results) - reachable,
+        }
 
         return {"checked_at": now.isoformat(), "summary": summary, "results": results}
 
+    # -------------------------------------------------
+    # Concurrent probes
+    # -------------------------------------------------
+    async def _probe_all(
+        self, devices, checks, *, snmp_configs, ssh_ports, rtts, uptimes
+    ) -> List[List[bool]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _bounded(name, coro_factory):
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(coro_factory(), timeout=self.timeouts[name])
+                except asyncio.TimeoutError:
+                    return False
+                except Exception:
+                    logger.debug("Reachability probe %s failed", name, exc_info=True)
+                    return False
+
+        # Every IPv4 host is pinged from one ICMP socket; the per-device ping
+        # probe waits for that batch and only spawns ``ping`` for the rest.
+        ping_batch = None
+        if "ping" in checks:
+            hosts = [str(device.management_ip) for device in devices if device.management_ip]
+            ping_batch = asyncio.ensure_future(asyncio.to_thread(self.ping_many, hosts))
+
+        # SNMP GETs for all devices share one pysnmp engine and dispatcher,
+        # which runs on its own thread next to the other probes.
+        snmp_batch = None
+        if "snmp" in checks:
+            targets = {
+                device.id: (str(device.management_ip), snmp_configs[device.site_id])
+                for device in devices
+                if device.management_ip and snmp_configs.get(device.site_id)
+            }
+            snmp_batch = asyncio.ensure_future(asyncio.to_thread(self.snmp_many, targets))
+
+        async def _snmp(device):
+            info = (await snmp_batch).get(device.id)
+            if info is None:
+                return False
+            if info.uptime_seconds is not None:
+                uptimes[device.id] = info.uptime_seconds
+            return info.ok
+
+        async def _ping(host):
+            result = (await ping_batch).get(host)
+            if result is None:
+                return await _bounded("ping", partial(self.async_ping, host))
+            if result.rtt_avg_ms is not None:
+                rtts[host] = round(result.rtt_avg_ms, 3)
+            return result.alive
+
+        def _probes(device):
+            host = str(device.management_ip) if device.management_ip else None
+            probes = []
+            for name in checks:
+                if name == "ping":
+                    probes.append(_ping(host) if host else self._false())
+                    continue
+                if name == "snmp":
+                    probes.append(_snmp(device))
+                    continue
+                if name == "ssh":
+                    factory = partial(self.async_tcp_check, host, ssh_ports.get(device.site_id, 22))
+                else:
+                    factory = partial(self.async_tcp_check, host, 830)
+                probes.append(_bounded(name, factory) if host else self._false())
+            return probes
+
+        return list(
+            await asyncio.gather(
+                *(self._gather(_probes(device)) for device in devices)
+            )
+        )
+
+    def snmp_many(self, targets: Dict[Any, Tuple[str, dict]]) -> Dict[Any, SnmpSystemInfo]:
+        try:
+            return self.snmp_engine.get_system_many(targets)
+        except Exception as exc:
+            logger.warning("SNMP reachability batch failed: %s", exc)
+            return {}
+
+    def ping_many(self, hosts: Iterable[str]) -> Dict[str, PingResult]:
+        """Batch-ping ``hosts``; hosts missing from the result need ``async_ping``."""
+        try:
+            results = self.pinger.ping_many(hosts)
+        except OSError as exc:
+            logger.info("In-process ICMP unavailable, falling back to ping: %s", exc)
+            return {}
+        return {host: result for host, result in results.items() if result.sent}
+
+    @staticmethod
+    async def _gather(probes) -> List[bool]:
+        return list(await asyncio.gather(*probes))
+
+    @staticmethod
+    async def _false() -> bool:
+        return False
+
+    @staticmethod
+    async def async_ping(host: str, wait: int = 1) -> bool:
+        process = await asyncio.create_subprocess_exec(
+            "ping", "-c", "1", "-W", str(wait), host,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            return await process.wait() == 0
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+    @staticmethod
+    async def async_tcp_check(host: str, port: int) -> bool:
+        _, writer = await asyncio.open_connection(host, port)
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            # Reset instead of FIN so sweeps do not pile up TIME_WAIT sockets.
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        writer.close()
+        return True
+
+    @classmethod
+    def _site_credentials(cls, devices, *, check_snmp: bool, check_ssh: bool):
+        """Resolve SNMP config and SSH port once per site before probing."""
+        site_ids = {device.site_id for device in devices if device.site_id}
+        snmp_configs = {}
+        ssh_ports = {}
+        for site_id in site_ids:
+            if check_snmp:
+                snmp_configs[site_id] = cls._build_snmp_config(
+                    SNMPCredential.objects.filter(site_id=site_id).first()
+                )
+            if check_ssh:
+                ssh_creds = SSHCredential.objects.filter(site_id=site_id).first()
+                ssh_ports[site_id] = ssh_creds.ssh_port if ssh_creds else 22
+        return snmp_configs, ssh_ports
+
     @staticmethod
     def _build_snmp_config(credential: Optional[SNMPCredential]):
         if not credential:
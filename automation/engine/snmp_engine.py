@@ -1,31 +1,235 @@
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+SYS_DESCR_OID = "1.3.6.1.2.1.1.1.0"
+SYS_UPTIME_OID = "1.3.6.1.2.1.1.3.0"
+SYS_NAME_OID = "1.3.6.1.2.1.1.5.0"
+
+AUTH_PROTOCOLS = {
+    "md5": "usmHMACMD5AuthProtocol",
+    "sha": "usmHMACSHAAuthProtocol",
+    "sha1": "usmHMACSHAAuthProtocol",
+    "sha224": "usmHMAC128SHA224AuthProtocol",
+    "sha256": "usmHMAC192SHA256AuthProtocol",
+    "sha384": "usmHMAC256SHA384AuthProtocol",
+    "sha512": "usmHMAC384SHA512AuthProtocol",
+}
+PRIV_PROTOCOLS = {
+    "des": "usmDESPrivProtocol",
+    "3des": "usm3DESEDEPrivProtocol",
+    "aes": "usmAesCfb128Protocol",
+    "aes128": "usmAesCfb128Protocol",
+    "aes192": "usmAesCfb192Protocol",
+    "aes256": "usmAesCfb256Protocol",
+}
+
+
+@dataclass
+class SnmpSystemInfo:
+    host: str
+    ok: bool
+    sys_descr: Optional[str] = None
+    sys_name: Optional[str] = None
+    uptime_seconds: Optional[float] = None
+    error: Optional[str] = None
+
 
 class SNMPEngine:
     """
     Low-level SNMP helper engine.
+
+    One pysnmp ``SnmpEngine`` and its transport dispatcher are created on
+    first use and reused by every request of this instance (plus one more
+    per conflicting SNMPv3 user name, see ``_engine_index``). Batched GETs
+    are all queued on that dispatcher (at most ``max_in_flight`` at a time)
+    and answered concurrently; each one fetches sysUpTime, sysName and
+    sysDescr in a single PDU. v1, v2c and v3 (noAuthNoPriv, authNoPriv,
+    authPriv) configs from ``ReachabilityEngine._build_snmp_config`` are
+    supported.
     """
 
+    def __init__(self, *, timeout: float = 1, retries: int = 0, max_in_flight: int = 500):
+        self.timeout = timeout
+        self.retries = retries
+        self.max_in_flight = max(1, max_in_flight)
+        self._engines: list = []
+
     def check(self, host, config):
-        from pysnmp.hlapi import (
-            SnmpEngine, CommunityData, UdpTransportTarget, ContextData,
-            ObjectType, ObjectIdentity, getCmd
-        )
         if not host:
             return False
+        return self.get_system(host, config).ok
 
-        version = (config.get("version") or "v2c").lower()
-        community = config.get("community", "public")
-        port = int(config.get("port") or 161)
+    def get_system(self, host: str, config: dict) -> SnmpSystemInfo:
+        return self.get_system_many({host: (host, config)})[host]
+
+    def get_system_many(self, targets: Dict[Hashable, Tuple[str, dict]]) -> Dict[Hashable, SnmpSystemInfo]:
+        """GET the system group of every ``{key: (host, config)}`` target concurrently."""
+        results: Dict[Hashable, SnmpSystemInfo] = {}
+        batches: Dict[int, list] = {}
+        for key, (host, config) in targets.items():
+            batches.setdefault(self._engine_index(config), []).append((key, host, config))
+        for index, batch in batches.items():
+            self._run_batch(self._engines[index][0], batch, results)
+        for key, (host, _) in targets.items():
+            results.setdefault(key, SnmpSystemInfo(host=host, ok=False, error="no response"))
+        return results
+
+    def close(self) -> None:
+        for engine, _ in self._engines:
+            engine.transportDispatcher.closeDispatcher()
+        self._engines = []
+
+    def _engine_index(self, config: dict) -> int:
+        """
+        pysnmp caches USM users per engine by user name, so two v3 credentials
+        with the same user name but different keys need separate engines.
+        Everything else shares the first one.
+        """
+        user = None
+        if (config.get("version") or "").lower() == "v3":
+            user = config.get("username") or ""
+            identity = tuple(
+                config.get(name)
+                for name in ("security_level", "auth_protocol", "auth_key", "priv_protocol", "priv_key")
+            )
+        for index, (_, users) in enumerate(self._engines):
+            if user is None or users.setdefault(user, identity) == identity:
+                return index
+        from pysnmp.hlapi.asyncore import SnmpEngine
+
+        self._engines.append((SnmpEngine(), {} if user is None else {user: identity}))
+        return len(self._engines) - 1
+
+    def _run_batch(self, engine, batch: list, results: Dict[Hashable, SnmpSystemInfo]) -> None:
+        from pysnmp.hlapi.asyncore import (
+            ContextData, ObjectIdentity, ObjectType, UdpTransportTarget, getCmd,
+        )
+
+        queue = deque(batch)
+        in_flight = 0
+        objects = [
+            ObjectType(ObjectIdentity(oid))
+            for oid in (SYS_UPTIME_OID, SYS_NAME_OID, SYS_DESCR_OID)
+        ]
 
+        def _fill():
+            nonlocal in_flight
+            while queue and in_flight < self.max_in_flight:
+                key, host, config = queue.popleft()
+                try:
+                    getCmd(
+                        engine,
+                        self._auth_data(config),
+                        UdpTransportTarget(
+                            (host, int(config.get("port") or 161)),
+                            timeout=self.timeout,
+                            retries=self.retries,
+                        ),
+                        ContextData(),
+                        *objects,
+                        cbFun=_done,
+                        cbCtx=(key, host),
+                    )
+                except Exception as exc:
+                    results[key] = SnmpSystemInfo(host=host, ok=False, error=str(exc))
+                    continue
+                in_flight += 1
+
+        def _done(snmpEngine, sendRequestHandle, errorIndication, errorStatus, errorIndex, varBinds, cbCtx):
+            nonlocal in_flight
+            in_flight -= 1
+            key, host = cbCtx
+            results[key] = self._system_info(host, errorIndication, errorStatus, varBinds)
+            _fill()
+
+        _fill()
         try:
-            iterator = getCmd(
-                SnmpEngine(),
-                CommunityData(community, mpModel=1 if version == "v2c" else 0),
-                UdpTransportTarget((host, port), timeout=1, retries=0),
-                ContextData(),
-                ObjectType(ObjectIdentity("1.3.6.1.2.1.1.1.0")),
+            engine.transportDispatcher.runDispatcher()
+        except Exception as exc:
+            # Unanswered targets are reported as failed by the caller.
+            logger.warning("SNMP dispatcher failed: %s", exc)
+
+    @staticmethod
+    def _auth_data(config: dict):
+        from pysnmp.hlapi import asyncore as hlapi
+
+        version = (config.get("version") or "v2c").lower()
+        if version != "v3":
+            return hlapi.CommunityData(
+                config.get("community") or "public",
+                mpModel=0 if version in ("v1", "1") else 1,
+            )
+
+        level = (config.get("security_level") or "").lower()
+        auth_key = config.get("auth_key")
+        priv_key = config.get("priv_key")
+        if not level:
+            level = "authpriv" if priv_key else "authnopriv" if auth_key else "noauthnopriv"
+
+        auth_protocol = hlapi.usmNoAuthProtocol
+        priv_protocol = hlapi.usmNoPrivProtocol
+        if level in ("authnopriv", "authpriv"):
+            name = AUTH_PROTOCOLS.get(_protocol_key(config.get("auth_protocol")) or "sha")
+            if name is None:
+                raise ValueError(f"Unsupported SNMPv3 auth protocol: {config.get('auth_protocol')}")
+            auth_protocol = getattr(hlapi, name)
+        else:
+            auth_key = None
+        if level == "authpriv":
+            name = PRIV_PROTOCOLS.get(_protocol_key(config.get("priv_protocol")) or "aes")
+            if name is None:
+                raise ValueError(f"Unsupported SNMPv3 priv protocol: {config.get('priv_protocol')}")
+            priv_protocol = getattr(hlapi, name)
+        else:
+            priv_key = None
+
+        return hlapi.UsmUserData(
+            config.get("username") or "",
+            authKey=auth_key,
+            privKey=priv_key,
+            authProtocol=auth_protocol,
+            privProtocol=priv_protocol,
+        )
+
+    @staticmethod
+    def _system_info(host, error_indication, error_status, var_binds) -> SnmpSystemInfo:
+        if error_indication or error_status:
+            return SnmpSystemInfo(
+                host=host,
+                ok=False,
+                error=str(error_indication or error_status.prettyPrint()),
             )
-            error_indication, error_status, _, _ = next(iterator)
-            return error_indication is None and error_status == 0
+        values = {}
+        for oid, value in var_binds:
+            if value.tagSet in _missing_value_tags():
+                continue
+            values[str(oid)] = value
+        uptime = values.get(SYS_UPTIME_OID)
+        return SnmpSystemInfo(
+            host=host,
+            ok=True,
+            sys_descr=_text(values.get(SYS_DESCR_OID)),
+            sys_name=_text(values.get(SYS_NAME_OID)),
+            uptime_seconds=int(uptime) / 100 if uptime is not None else None,
+        )
+
+
+def _protocol_key(value: Optional[str]) -> str:
+    return (value or "").lower().replace("-", "").replace("_", "")
+
+
+def _text(value) -> Optional[str]:
+    if value is None:
+        return None
+    return value.prettyPrint() if hasattr(value, "prettyPrint") else str(value)
+
+
+def _missing_value_tags():
+    from pysnmp.proto.rfc1905 import EndOfMibView, NoSuchInstance, NoSuchObject
 
-        except Exception:
-            return False
\ No newline at end of file
+    return (NoSuchObject.tagSet, NoSuchInstance.tagSet, EndOfMibView.tagSet)
@@ -4,6 +4,7 @@ from automation.services.scheduler_sync import (
     sync_config_backup_schedule,
     sync_reachability_from_system_settings,
     sync_reachability_cleanup_schedule,
+    sync_reachability_rollup_schedule,
 )
 from accounts.services.settings_service import get_system_settings
 
@@ -33,6 +34,12 @@ class Command(BaseCommand):
             self.style.SUCCESS("✓ Reachability cleanup schedule synchronized")
         )
 
+        # --- Reachability availability rollups (hourly cron) ---
+        sync_reachability_rollup_schedule()
+        self.stdout.write(
+            self.style.SUCCESS("✓ Reachability rollup schedule synchronized")
+        )
+
         self.stdout.write(
             self.style.SUCCESS("All automation schedules are up to date.")
         )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-17 06:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0006_update_discovery_schedule_tasks'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='automationjob',
+            name='job_type',
+            field=models.CharField(choices=[('config_backup', 'Configuration Backup'), ('reachability', 'Reachability Check'), ('telemetry', 'Telemetry Snapshot'), ('command', 'Run Command'), ('device_sync', 'Device Sync')], max_length=30),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.7 on 2026-10-17 06:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+SAMPLE_TABLE_SQL = """
+CREATE TABLE automation_reachabilitysample (
+    id bigserial NOT NULL,
+    day date NOT NULL,
+    device_id uuid NOT NULL,
+    checked_at timestamp with time zone NOT NULL,
+    checked smallint NOT NULL CHECK (checked >= 0),
+    reachable smallint NOT NULL CHECK (reachable >= 0),
+    rtt_us integer NULL CHECK (rtt_us >= 0),
+    PRIMARY KEY (id, day),
+    CONSTRAINT uniq_reachability_sample UNIQUE (day, device_id, checked_at)
+) PARTITION BY RANGE (day);
+CREATE INDEX automation__device__13ca45_idx
+    ON automation_reachabilitysample (device_id, checked_at);
+"""
+
+
+def create_sample_table(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(SAMPLE_TABLE_SQL)
+    else:
+        schema_editor.create_model(apps.get_model("automation", "ReachabilitySample"))
+
+
+def drop_sample_table(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP TABLE IF EXISTS automation_reachabilitysample CASCADE")
+    else:
+        schema_editor.delete_model(apps.get_model("automation", "ReachabilitySample"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0007_alter_automationjob_job_type'),
+        ('dcim', '0023_deviceruntimestatus_sync_fingerprints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReachabilityRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('bucket', models.DateTimeField()),
+                ('samples', models.PositiveIntegerField(default=0)),
+                ('up', models.PositiveIntegerField(default=0)),
+                ('rtt_count', models.PositiveIntegerField(default=0)),
+                ('rtt_sum_us', models.BigIntegerField(default=0)),
+                ('rtt_max_us', models.PositiveIntegerField(blank=True, null=True)),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reachability_rollups', to='dcim.device')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period', 'bucket'], name='automation__period_3b62ee_idx')],
+                'constraints': [models.UniqueConstraint(fields=('device', 'period', 'bucket'), name='uniq_reachability_rollup_bucket')],
+            },
+        ),
+        # PostgreSQL gets a table range-partitioned by day; partitions are
+        # created on demand by ReachabilityHistoryService.ensure_partitions().
+        # The table is created after the state operation so other backends
+        # can build it from the registered model.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='ReachabilitySample',
+                    fields=[
+                        ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                        ('day', models.DateField()),
+                        ('checked_at', models.DateTimeField()),
+                        ('checked', models.PositiveSmallIntegerField()),
+                        ('reachable', models.PositiveSmallIntegerField()),
+                        ('rtt_us', models.PositiveIntegerField(blank=True, null=True)),
+                        ('device', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='dcim.device')),
+                    ],
+                    options={
+                        'indexes': [models.Index(fields=['device', 'checked_at'], name='automation__device__13ca45_idx')],
+                        'constraints': [models.UniqueConstraint(fields=('day', 'device', 'checked_at'), name='uniq_reachability_sample')],
+                    },
+                ),
+            ],
+        ),
+        migrations.RunPython(create_sample_table, drop_sample_table),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def seed_reachability_rollup_task(apps, schema_editor):
+    TaskDefinition = apps.get_model("automation", "AutomationTaskDefinition")
+
+    TaskDefinition.objects.update_or_create(
+        task_name="automation.tasks.rollup_reachability_history",
+        defaults={
+            "name": "Reachability Availability Rollup",
+            "category": "automation",
+            "description": "Hourly/daily availability rollups from reachability samples.",
+            "managed_by": "system",
+            "supports_schedule": True,
+        },
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("automation", "0008_reachability_history"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_reachability_rollup_task, migrations.RunPython.noop),
+    ]
@@ -3,10 +3,13 @@ from .job_run import JobRun
 from .device_telemetry import DeviceTelemetry
 from .schedule import AutomationSchedule  # noqa
 from .task_definition import AutomationTaskDefinition
+from .reachability_history import ReachabilitySample, ReachabilityRollup
 
 
 __all__ = ["AutomationJob",
            "JobRun",
            "DeviceTelemetry",
            "AutomationSchedule",
-           "AutomationTaskDefinition"]
+           "AutomationTaskDefinition",
+           "ReachabilitySample",
+           "ReachabilityRollup"]
@@ -0,0 +1,85 @@
+from django.db import models
+
+from dcim.models import Device
+
+
+class ReachabilitySample(models.Model):
+    """
+    One narrow row per device per reachability check.
+
+    On PostgreSQL the table is range-partitioned by ``day`` (one partition
+    per day, see ``ReachabilityHistoryService``) so retention drops whole
+    partitions. ``checked``/``reachable`` are bitmasks of
+    ``ReachabilityHistoryService.PROBE_BITS``. There is no FK constraint:
+    samples of deleted devices simply expire with their partition.
+
+    ``id`` is a surrogate key; on PostgreSQL the table's primary key is
+    ``(id, day)`` because a partitioned table's keys must contain ``day``.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    day = models.DateField()
+    device = models.ForeignKey(
+        Device,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    checked_at = models.DateTimeField()
+    checked = models.PositiveSmallIntegerField()
+    reachable = models.PositiveSmallIntegerField()
+    rtt_us = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "device", "checked_at"],
+                name="uniq_reachability_sample",
+            )
+        ]
+        indexes = [models.Index(fields=["device", "checked_at"])]
+
+    @property
+    def up(self) -> bool:
+        return bool(self.checked) and self.reachable == self.checked
+
+
+class ReachabilityRollup(models.Model):
+    """Hourly / daily availability per device aggregated from samples."""
+
+    class Period(models.TextChoices):
+        HOUR = "hour", "Hour"
+        DAY = "day", "Day"
+
+    device = models.ForeignKey(
+        Device,
+        on_delete=models.CASCADE,
+        related_name="reachability_rollups",
+    )
+    period = models.CharField(max_length=4, choices=Period.choices)
+    bucket = models.DateTimeField()
+    samples = models.PositiveIntegerField(default=0)
+    up = models.PositiveIntegerField(default=0)
+    rtt_count = models.PositiveIntegerField(default=0)
+    rtt_sum_us = models.BigIntegerField(default=0)
+    rtt_max_us = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["device", "period", "bucket"],
+                name="uniq_reachability_rollup_bucket",
+            )
+        ]
+        indexes = [models.Index(fields=["period", "bucket"])]
+
+    @property
+    def availability(self) -> float | None:
+        return self.up / self.samples * 100 if self.samples else None
+
+    @property
+    def rtt_avg_ms(self) -> float | None:
+        return self.rtt_sum_us / self.rtt_count / 1000 if self.rtt_count else None
+
+    def __str__(self):
+        return f"{self.device_id} {self.period} {self.bucket:%Y-%m-%d %H:%M}"
@@ -184,6 +184,26 @@ def sync_reachability_cleanup_schedule(days: int = 7):
     sync_schedule(schedule)
 
 
+def sync_reachability_rollup_schedule():
+    schedule, _ = AutomationSchedule.objects.get_or_create(
+        name="Reachability Availability Rollup",
+        defaults={
+            "task_name": "automation.tasks.rollup_reachability_history",
+            "schedule_type": AutomationSchedule.ScheduleType.CRONTAB,
+            "minute": "5",
+            "hour": "*",
+            "day_of_week": "*",
+            "day_of_month": "*",
+            "month_of_year": "*",
+            "enabled": True,
+        },
+    )
+
+    schedule.save()
+    sync_schedule(schedule)
+    return schedule
+
+
 def remove_schedule(schedule: AutomationSchedule) -> None:
     pt = schedule.periodic_task
     if pt:
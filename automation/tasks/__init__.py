@@ -1,8 +1,13 @@
 # automation/tasks.py
 # MAke the ZAS Spine
-from datetime import timedelta
+import logging
+import math
+from datetime import timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
-from celery import shared_task
+from celery import chord, shared_task
+from celery.exceptions import SoftTimeLimitExceeded
 
 from dcim.models import Device
 from automation.choices import JobType
@@ -10,10 +15,61 @@ from automation.choices import JobStatus
 from dcim.choices import DeviceStatusChoices
 from automation.models import JobRun, AutomationJob
 from automation.application import JobService, JobDispatcher, JobResultService
-from automation.application import ReachabilityPersistenceService, ReachabilityService
+from automation.application import (
+    ReachabilityHistoryService,
+    ReachabilityPersistenceService,
+    ReachabilityScheduleService,
+    ReachabilityService,
+)
 from automation.workers.backup_worker import execute_backup
 from accounts.services.settings_service import get_system_settings
-from automation.workers.reachability_worker import execute_reachability
+from automation.workers.reachability_worker import execute_reachability, measure_devices
+
+logger = logging.getLogger(__name__)
+
+
+def _store_reachability(payload: dict) -> int:
+    """Persist runtime flags and history samples of one payload; returns the sample count."""
+    base = timedelta(minutes=get_system_settings().reachability_interval_minutes)
+    adaptive = ReachabilityScheduleService.enabled()
+
+    # persist runtime status (DB writes live here/application)
+    counts = ReachabilityPersistenceService.persist(payload, base_interval=base if adaptive else None)
+    samples = ReachabilityHistoryService.record(payload)
+
+    if counts.get("recheck"):
+        # confirm state changes quickly instead of waiting for the next tick
+        run_scheduled_reachability.apply_async(
+            kwargs={"device_ids": counts["recheck"]},
+            countdown=ReachabilityScheduleService.recheck_delay(base).total_seconds(),
+        )
+    return samples
+
+
+def _plan_reachability_shards(device_ids: list[str], *, shard_size: int, max_shards: int) -> list[list[str]]:
+    """
+    Split a run's devices into contiguous shards of at most ``shard_size``
+    devices. Past ``shard_size * max_shards`` devices the shards grow instead
+    of multiplying; ``shard_size <= 0`` disables sharding.
+    """
+    if not device_ids:
+        return []
+    if shard_size <= 0:
+        return [device_ids]
+    count = min(max(1, max_shards), math.ceil(len(device_ids) / shard_size))
+    size = math.ceil(len(device_ids) / count)
+    return [device_ids[i:i + size] for i in range(0, len(device_ids), size)]
+
+
+def _record_reachability_shard(run_id: str, index: int, **fields) -> dict:
+    with transaction.atomic():
+        run = JobRun.objects.select_for_update().get(id=run_id)
+        result = run.result or {}
+        shard = result["shards"][index]
+        shard.update(fields)
+        run.result = result
+        run.save(update_fields=["result"])
+    return shard
 
 
 @shared_task(bind=True)
@@ -24,32 +80,143 @@ def run_reachability_job(self, run_id):
     run.started_at = timezone.now()
     run.save(update_fields=["status", "started_at"])
 
+    checks = (run.params or {}).get("checks", {})
     try:
-        checks = (run.params or {}).get("checks", {})
-        payload = execute_reachability(run, checks=checks)
+        # ordered by site so a shard resolves as few site credentials as possible
+        device_ids = [str(pk) for pk in run.devices.order_by("site_id", "id").values_list("id", flat=True)]
+        shards = _plan_reachability_shards(
+            device_ids,
+            shard_size=settings.REACHABILITY_SHARD_SIZE,
+            max_shards=settings.REACHABILITY_SHARD_CONCURRENCY,
+        )
+        if len(shards) > 1:
+            run.result = {
+                "shards": [{"devices": len(shard), "status": JobStatus.QUEUED} for shard in shards]
+            }
+            run.save(update_fields=["result"])
+            limit = settings.REACHABILITY_SHARD_TIME_LIMIT
+            chord(
+                run_reachability_shard.s(str(run.id), index, shard, checks).set(
+                    soft_time_limit=limit, time_limit=limit + 30
+                )
+                for index, shard in enumerate(shards)
+            )(finalize_reachability_job.s(str(run.id)).on_error(fail_reachability_job.s(str(run.id))))
+            return {"run_id": str(run.id), "devices": len(device_ids), "shards": len(shards)}
 
-        # persist runtime status (DB writes live here/application)
-        ReachabilityPersistenceService.persist(payload)
-
-        # store payload in the run for audit/debug
-        JobResultService.finalize_success(run, payload)
+        payload = execute_reachability(run, checks=checks)
+        samples = _store_reachability(payload)
+
+        # per-device results live in the time series; keep the run small
+        JobResultService.finalize_success(
+            run,
+            {
+                "checked_at": payload["checked_at"],
+                "summary": payload["summary"],
+                "samples": samples,
+            },
+        )
 
     except Exception as exc:
         JobResultService.finalize_failure(run, exc)
         raise
     finally:
-        run.finished_at = timezone.now()
-        run.save(update_fields=["finished_at"])
+        # a dispatched sharded run is finished by its chord callback or errback
+        if run.status != JobStatus.RUNNING:
+            run.finished_at = timezone.now()
+            run.save(update_fields=["finished_at"])
+
+
+@shared_task
+def run_reachability_shard(run_id: str, index: int, device_ids: list[str], checks: dict):
+    """Probe and persist one shard; its outcome is recorded on the run as soon as it is known."""
+    _record_reachability_shard(run_id, index, status=JobStatus.RUNNING)
+    try:
+        payload = measure_devices(Device.objects.filter(id__in=device_ids), checks)
+        samples = _store_reachability(payload)
+    except SoftTimeLimitExceeded:
+        outcome = {"status": JobStatus.FAILED, "error": "timed out"}
+    except Exception as exc:
+        logger.exception("Reachability shard %s of run %s failed", index, run_id)
+        outcome = {"status": JobStatus.FAILED, "error": str(exc)}
+    else:
+        outcome = {
+            "status": JobStatus.SUCCESS,
+            "checked_at": payload["checked_at"],
+            "summary": payload["summary"],
+            "samples": samples,
+        }
+    return _record_reachability_shard(run_id, index, **outcome)
 
 
 @shared_task
-def run_scheduled_reachability():
+def finalize_reachability_job(shard_results: list[dict], run_id: str):
+    run = JobRun.objects.select_related("job").get(id=run_id)
+    return _finalize_reachability_run(run, (run.result or {}).get("shards") or shard_results)
+
+
+@shared_task
+def fail_reachability_job(request, exc, traceback, run_id: str):
+    """
+    Chord errback: a shard was killed or raised outside its own error
+    handling, so the callback never ran. Shards without a recorded outcome
+    count as failed and the run is finalized from the rest.
+    """
+    logger.error("Reachability run %s lost a shard: %s", run_id, exc)
+    run = JobRun.objects.select_related("job").get(id=run_id)
+    shards = (run.result or {}).get("shards") or []
+    for shard in shards:
+        if shard.get("status") not in (JobStatus.SUCCESS, JobStatus.FAILED):
+            shard.update(status=JobStatus.FAILED, error="did not finish")
+    return _finalize_reachability_run(run, shards)
+
+
+def _finalize_reachability_run(run: JobRun, shards: list[dict]) -> dict:
+    completed = [shard for shard in shards if shard.get("status") == JobStatus.SUCCESS]
+    summary = {"total": 0, "reachable": 0, "unreachable": 0}
+    for shard in completed:
+        for key in summary:
+            summary[key] += shard["summary"].get(key, 0)
+    summary["not_checked"] = sum(shard["devices"] for shard in shards) - sum(
+        shard["devices"] for shard in completed
+    )
+
+    if completed:
+        JobResultService.finalize_success(
+            run,
+            {
+                "checked_at": max(shard["checked_at"] for shard in completed),
+                "summary": summary,
+                "samples": sum(shard["samples"] for shard in completed),
+                "shards": shards,
+            },
+        )
+    else:
+        JobResultService.finalize_failure(run, f"All {len(shards)} reachability shards failed")
+        run.result["shards"] = shards
+    run.finished_at = timezone.now()
+    run.save(update_fields=["result", "finished_at"])
+    return summary
+
+
+@shared_task
+def run_scheduled_reachability(device_ids=None):
+    """
+    Probe the tagged devices that are due (all of them when adaptive
+    scheduling is off), or exactly ``device_ids`` for a follow-up recheck.
+    """
     settings = get_system_settings()
 
     devices = Device.objects.filter(
         status=DeviceStatusChoices.STATUS_ACTIVE,
         tags__name="reachability_check_tag",
     ).distinct()
+    if device_ids is not None:
+        devices = devices.filter(id__in=device_ids)
+    else:
+        devices = ReachabilityScheduleService.due(
+            devices,
+            base=timedelta(minutes=settings.reachability_interval_minutes),
+        )
 
     if not devices.exists():
         return
@@ -123,5 +290,15 @@ def cleanup_reachability_history(days: int = 7):
         job_type=JobType.REACHABILITY,
     ).delete()
 
+    ReachabilityHistoryService.purge()
+
+
+@shared_task
+def rollup_reachability_history():
+    """Refresh hourly/daily availability rollups and pre-create tomorrow's partition."""
+    today = timezone.now().astimezone(dt_timezone.utc).date()
+    ReachabilityHistoryService.ensure_partitions([today, today + timedelta(days=1)])
+    return ReachabilityHistoryService.rollup()
+
 
 from .topology_collector import collect_topology_neighbors, cleanup_topology_neighbors  # noqa: E402,F401
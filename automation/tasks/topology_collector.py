@@ -7,8 +7,10 @@ from django.utils import timezone
 
 from dcim.choices import DevicePlatformChoices
 from dcim.models import Device, Interface
-from network.adapters.netmiko import NetmikoAdapter
+from dcim.services.hostname_utils import normalize_hostname, resolve_ip_hostnames
+from network.adapters.netmiko import NetmikoAdapter, is_invalid_output
 from network.adapters.topology import parse_cdp_neighbors, parse_lldp_neighbors
+from network.choices import CliCommandsChoices as cli
 from topology.models import TopologyNeighbor
 from topology.services.topology_service import TopologyService
 
@@ -69,50 +71,66 @@ def _resolve_local_interface(device: Device, raw_name: str):
     return None
 
 
-def _is_invalid_output(raw: str) -> bool:
-    if not raw:
-        return True
-    raw_lower = raw.lower()
-    return "% invalid" in raw_lower or "invalid input" in raw_lower
+def collect_neighbor_outputs(adapter) -> tuple[str, str]:
+    """
+    Run the CDP/LLDP neighbor commands over an already open adapter session.
+    Falls back to the non-detail variants when a platform rejects them.
+    """
+    cdp_raw = adapter.run_command_raw(cli.CDP_NEIGHBORS_DETAIL_CMD)["raw"] or ""
+    if is_invalid_output(cdp_raw):
+        cdp_raw = adapter.run_command_raw(cli.CDP_NEIGHBORS_CMD)["raw"] or ""
+    lldp_raw = adapter.run_command_raw(cli.LLDP_NEIGHBORS_DETAIL_CMD)["raw"] or ""
+    if is_invalid_output(lldp_raw):
+        lldp_raw = adapter.run_command_raw(cli.LLDP_NEIGHBORS_CMD)["raw"] or ""
+    return cdp_raw, lldp_raw
 
 
 def collect_neighbors_for_device(device: Device) -> bool:
     try:
         with NetmikoAdapter(device) as adapter:
-            cdp_raw = adapter.run_command_raw("show cdp neighbors detail")["raw"] or ""
-            if _is_invalid_output(cdp_raw):
-                cdp_raw = adapter.run_command_raw("show cdp neighbors")["raw"] or ""
-            lldp_raw = adapter.run_command_raw("show lldp neighbors detail")["raw"] or ""
-            if _is_invalid_output(lldp_raw):
-                lldp_raw = adapter.run_command_raw("show lldp neighbors")["raw"] or ""
-
-        cdp_available = not _is_invalid_output(cdp_raw)
-        lldp_available = not _is_invalid_output(lldp_raw)
-        seen_neighbor_ids = set()
+            cdp_raw, lldp_raw = collect_neighbor_outputs(adapter)
+    except Exception as exc:
+        logger.warning("Topology collection failed for %s: %s", device.name, exc)
+        return False
+    return apply_neighbor_outputs(device, cdp_raw, lldp_raw)
+
+
+def parse_neighbor_outputs(device: Device, cdp_raw: str, lldp_raw: str) -> dict:
+    """
+    Parse CDP/LLDP output (``None`` for a protocol the device rejected) and
+    resolve the neighbors that only advertise an address in one PTR batch.
+    Writes nothing, so callers run it before opening their transaction.
+    """
+    parsed = {
+        "cdp": None if is_invalid_output(cdp_raw) else parse_cdp_neighbors(cdp_raw),
+        "lldp": None if is_invalid_output(lldp_raw) else parse_lldp_neighbors(lldp_raw),
+    }
+    parsed["ptr_names"] = resolve_ip_hostnames(
+        (
+            normalize_hostname(entry["neighbor_name"], site=device.site)
+            for protocol in ("cdp", "lldp")
+            for entry in parsed[protocol] or ()
+        ),
+        site=device.site,
+    )
+    return parsed
 
-        if cdp_available:
-            for entry in parse_cdp_neighbors(cdp_raw):
-                local_interface = _resolve_local_interface(device, entry["local_interface"])
-                if not local_interface:
-                    logger.info(
-                        "Topology skip: %s missing local interface %s",
-                        device.name,
-                        entry["local_interface"],
-                    )
-                    continue
-                neighbor = TopologyService.upsert_neighbor(
-                    device=device,
-                    local_interface=local_interface,
-                    neighbor_name=entry["neighbor_name"],
-                    neighbor_interface=entry["neighbor_interface"],
-                    protocol=entry["protocol"],
-                    platform=entry["platform"],
-                    capabilities=entry["capabilities"],
-                )
-                seen_neighbor_ids.add(neighbor.id)
 
-        if lldp_available:
-            for entry in parse_lldp_neighbors(lldp_raw):
+def apply_neighbor_outputs(device: Device, cdp_raw: str, lldp_raw: str) -> bool:
+    try:
+        parsed = parse_neighbor_outputs(device, cdp_raw, lldp_raw)
+    except Exception as exc:
+        logger.warning("Topology collection failed for %s: %s", device.name, exc)
+        return False
+    return apply_parsed_neighbors(device, parsed)
+
+
+def apply_parsed_neighbors(device: Device, parsed: dict) -> bool:
+    try:
+        seen_neighbor_ids = set()
+
+        for protocol in ("cdp", "lldp"):
+            for entry in parsed[protocol] or ():
                 local_interface = _resolve_local_interface(device, entry["local_interface"])
                 if not local_interface:
                     logger.info(
@@ -129,14 +147,11 @@ def collect_neighbors_for_device(device: Device) -> bool:
                     protocol=entry["protocol"],
                     platform=entry["platform"],
                     capabilities=entry["capabilities"],
+                    ptr_names=parsed["ptr_names"],
                 )
                 seen_neighbor_ids.add(neighbor.id)
 
-        protocols_to_cleanup = set()
-        if cdp_available:
-            protocols_to_cleanup.add("cdp")
-        if lldp_available:
-            protocols_to_cleanup.add("lldp")
+        protocols_to_cleanup = {protocol for protocol in ("cdp", "lldp") if parsed[protocol] is not None}
         if protocols_to_cleanup:
             stale_qs = TopologyNeighbor.objects.filter(
                 device=device,
@@ -1,5 +1,8 @@
+import ipaddress
+
 import pytest
 
+from dcim.choices import DeviceStatusChoices
 from dcim.models import Device, Tag, Organization, Site, Area, Vendor, DeviceType, DeviceRole
 from accounts.admin_credentials import SSHCredential, SiteCredential
 
@@ -48,3 +51,37 @@ def user(db):
         ssh_password="password",
     )
 
+
+@pytest.fixture
+def make_fleet(db):
+    """
+    Factory for reachability fleets: ``make_fleet(count, prefix=..., first_ip=...)``
+    creates ``count`` active devices per site named ``<prefix><nn>`` with
+    consecutive management IPs, optionally tagged with ``tag``. Returns the
+    devices in creation order.
+    """
+
+    def make(count, *, prefix="reach", first_ip="10.0.0.1", sites=None, tag=None):
+        organization = Organization.objects.create(name=f"{prefix.title()}Org")
+        first = ipaddress.ip_address(first_ip)
+        devices = []
+        for site_name in sites or [prefix.title()]:
+            site = Site.objects.create(name=site_name, organization=organization)
+            area = Area.objects.create(name=site_name, site=site)
+            devices += Device.objects.bulk_create(
+                Device(
+                    name=f"{prefix}{index:02d}",
+                    management_ip=str(first + index),
+                    site=site,
+                    area=area,
+                    status=DeviceStatusChoices.STATUS_ACTIVE,
+                )
+                for index in range(len(devices), len(devices) + count)
+            )
+        if tag:
+            tag, _ = Tag.objects.get_or_create(name=tag)
+            for device in devices:
+                device.tags.add(tag)
+        return devices
+
+    return make
@@ -0,0 +1,116 @@
+"""
+Minimal snmpsim-style SNMP agent for tests.
+
+Answers GETs for a fixed ``{oid: value}`` map on 127.0.0.1 over v2c
+(community) and v3 (USM users), running pysnmp's own command responder
+on a background thread.
+"""
+import threading
+
+from automation.engine.snmp_engine import SYS_DESCR_OID, SYS_NAME_OID, SYS_UPTIME_OID
+
+
+DEFAULT_VALUES = {
+    SYS_DESCR_OID: "Cisco IOS Software, C9300 Software (CAT9K_IOSXE), Version 17.9.4",
+    SYS_NAME_OID: "sim-sw01.example.com",
+    SYS_UPTIME_OID: 8640000,  # one day in TimeTicks
+}
+
+
+class SnmpResponder:
+    def __init__(self, *, community="public", users=(), values=None, port_range=range(20161, 20261)):
+        """
+        ``users`` are ``(username, auth_protocol, auth_key, priv_protocol, priv_key)``
+        tuples using the protocol names of ``ReachabilityEngine._build_snmp_config``.
+        """
+        self.community = community
+        self.users = list(users)
+        self.values = dict(DEFAULT_VALUES if values is None else values)
+        self.port_range = port_range
+        self.port = None
+        self.requests = 0
+        self._engine = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, exc_tb):
+        self.stop()
+        return False
+
+    def start(self):
+        from pysnmp.carrier.asyncore.dgram import udp
+        from pysnmp.entity import config, engine
+        from pysnmp.entity.rfc3413 import cmdrsp, context
+        from pysnmp.hlapi import asyncore as hlapi
+        from pysnmp.proto.api import v2c
+        from pysnmp.smi import instrum
+
+        from automation.engine.snmp_engine import AUTH_PROTOCOLS, PRIV_PROTOCOLS, _protocol_key
+
+        snmp_engine = engine.SnmpEngine()
+        transport = None
+        # Stay below the ephemeral range: credential ports are smallints.
+        for port in self.port_range:
+            try:
+                transport = udp.UdpTransport().openServerMode(("127.0.0.1", port))
+            except Exception:
+                continue
+            self.port = port
+            break
+        if transport is None:
+            raise OSError("No free UDP port for the SNMP responder")
+        config.addTransport(snmp_engine, udp.domainName, transport)
+
+        config.addV1System(snmp_engine, "sim-area", self.community)
+        config.addVacmUser(snmp_engine, 1, "sim-area", "noAuthNoPriv", (1, 3, 6))
+        config.addVacmUser(snmp_engine, 2, "sim-area", "noAuthNoPriv", (1, 3, 6))
+        for username, auth_protocol, auth_key, priv_protocol, priv_key in self.users:
+            level = "authPriv" if priv_key else "authNoPriv" if auth_key else "noAuthNoPriv"
+            config.addV3User(
+                snmp_engine,
+                username,
+                getattr(hlapi, AUTH_PROTOCOLS[_protocol_key(auth_protocol)]) if auth_key else config.usmNoAuthProtocol,
+                auth_key,
+                getattr(hlapi, PRIV_PROTOCOLS[_protocol_key(priv_protocol)]) if priv_key else config.usmNoPrivProtocol,
+                priv_key,
+            )
+            config.addVacmUser(snmp_engine, 3, username, level, (1, 3, 6))
+
+        responder = self
+        values = {
+            oid: v2c.TimeTicks(value) if oid == SYS_UPTIME_OID else v2c.OctetString(value)
+            for oid, value in self.values.items()
+        }
+
+        class _FixedValues(instrum.AbstractMibInstrumController):
+            def readVars(self, varBinds, acInfo=(None, None)):
+                responder.requests += 1
+                return [(oid, values.get(str(oid), v2c.NoSuchObject())) for oid, _ in varBinds]
+
+        snmp_context = context.SnmpContext(snmp_engine)
+        snmp_context.unregisterContextName(v2c.OctetString(""))
+        snmp_context.registerContextName(v2c.OctetString(""), _FixedValues())
+        cmdrsp.GetCommandResponder(snmp_engine, snmp_context)
+
+        snmp_engine.transportDispatcher.jobStarted(1)
+        self._engine = snmp_engine
+        self._thread = threading.Thread(target=self._serve, name="snmp-responder", daemon=True)
+        self._thread.start()
+        return self
+
+    def _serve(self):
+        try:
+            self._engine.transportDispatcher.runDispatcher()
+        except Exception:
+            pass
+
+    def stop(self):
+        if self._engine is None:
+            return
+        self._engine.transportDispatcher.jobFinished(1)
+        self._thread.join(timeout=5)
+        self._engine.transportDispatcher.closeDispatcher()
+        self._engine = None
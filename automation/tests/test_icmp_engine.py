@@ -0,0 +1,48 @@
+import pytest
+
+from automation.engine.icmp_engine import IcmpPinger, checksum
+
+
+pytestmark = pytest.mark.skipif(
+    not IcmpPinger.available(), reason="no ICMP datagram or raw socket permission"
+)
+
+
+def test_ping_many_matches_loopback_replies_per_host():
+    pinger = IcmpPinger(timeout=0.5, count=3)
+
+    results = pinger.ping_many(["127.0.0.1", "127.0.0.2", "127.0.0.1", "2001:db8::1", "not-an-ip"])
+
+    assert list(results) == ["127.0.0.1", "127.0.0.2", "2001:db8::1", "not-an-ip"]
+    for host in ("127.0.0.1", "127.0.0.2"):
+        assert results[host].sent == 3
+        assert results[host].received == 3
+        assert results[host].loss == 0.0
+        assert len(results[host].rtts_ms) == 3
+        assert 0 <= results[host].rtt_min_ms <= results[host].rtt_avg_ms <= results[host].rtt_max_ms
+    assert results["2001:db8::1"].sent == 0
+    assert results["not-an-ip"].alive is False
+
+
+def test_ping_many_reuses_sequence_numbers_beyond_in_flight_window():
+    hosts = [f"127.0.{index // 250}.{index % 250 + 1}" for index in range(600)]
+
+    results = IcmpPinger(timeout=0.5, max_in_flight=64).ping_many(hosts)
+
+    assert all(result.alive for result in results.values())
+
+
+def test_unanswered_echoes_count_as_loss(monkeypatch):
+    monkeypatch.setattr(IcmpPinger, "_drain", staticmethod(lambda *args: None))
+
+    result = IcmpPinger(timeout=0.05, count=2).ping("127.0.0.1")
+
+    assert (result.sent, result.received, result.loss, result.rtt_avg_ms) == (2, 0, 1.0, None)
+
+
+def test_checksum_of_packet_including_checksum_is_zero():
+    packet = bytes.fromhex("0800") + b"\x00\x00" + bytes.fromhex("1234000148656c6c6f")
+    value = checksum(packet)
+    patched = packet[:2] + value.to_bytes(2, "big") + packet[4:]
+
+    assert checksum(patched) == 0
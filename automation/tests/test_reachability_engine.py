@@ -0,0 +1,116 @@
+import asyncio
+import socket
+
+import pytest
+
+from accounts.models import SSHCredential
+from automation.engine.icmp_engine import PingResult
+from automation.engine.reachability_engine import ReachabilityEngine
+from dcim.models import Device
+
+
+@pytest.fixture
+def fleet(make_fleet):
+    make_fleet(20, prefix="reach", first_ip="127.0.0.1")
+    return Device.objects.order_by("name")
+
+
+@pytest.fixture
+def listener():
+    # ssh_port is a smallint, so stay below the ephemeral port range.
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    for port in range(20022, 20122):
+        try:
+            sock.bind(("127.0.0.1", port))
+            break
+        except OSError:
+            continue
+    sock.listen(64)
+    yield sock.getsockname()[1]
+    sock.close()
+
+
+@pytest.mark.django_db
+def test_measure_runs_probes_concurrently_within_the_bound(fleet, monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    async def fake_ping(host, wait=1):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return host != "127.0.0.5"
+
+    # No ICMP socket: every ping falls back to the bounded ``ping`` command.
+    monkeypatch.setattr(ReachabilityEngine, "ping_many", lambda self, hosts: {})
+    monkeypatch.setattr(ReachabilityEngine, "async_ping", staticmethod(fake_ping))
+    engine = ReachabilityEngine(concurrency=8)
+
+    payload = engine.measure(devices=fleet, check_ping=True, check_snmp=False)
+
+    assert peak == 8
+    assert [r["hostname"] for r in payload["results"]] == [d.name for d in fleet]
+    assert payload["summary"] == {"total": 20, "reachable": 19, "unreachable": 1}
+    assert payload["results"][4] == {
+        "device_id": str(fleet[4].id),
+        "hostname": "reach04",
+        "management_ip": "127.0.0.5",
+        "statuses": {"ping": False},
+        "rtt_ms": None,
+    }
+
+
+@pytest.mark.django_db
+def test_measure_times_out_slow_probes_and_checks_tcp(fleet, listener, monkeypatch):
+    async def hanging_ping(host, wait=1):
+        await asyncio.sleep(10)
+        return True
+
+    monkeypatch.setattr(ReachabilityEngine, "ping_many", lambda self, hosts: {})
+    monkeypatch.setattr(ReachabilityEngine, "async_ping", staticmethod(hanging_ping))
+    device = fleet.get(name="reach00")
+    SSHCredential.objects.create(
+        site=device.site, name="reach-ssh", ssh_username="u", ssh_password="p", ssh_port=listener
+    )
+    engine = ReachabilityEngine(timeouts={"ping": 0.1})
+
+    payload = engine.measure(
+        devices=[device], check_ping=True, check_snmp=False, check_ssh=True, check_netconf=True
+    )
+
+    assert payload["results"][0]["statuses"] == {"ping": False, "ssh": True, "netconf": False}
+    assert payload["summary"] == {"total": 1, "reachable": 0, "unreachable": 1}
+
+
+@pytest.mark.django_db
+def test_measure_pings_ipv4_hosts_in_one_batch(fleet, monkeypatch):
+    batches = []
+
+    def fake_ping_many(self, hosts):
+        batches.append(list(hosts))
+        return {
+            host: PingResult(host=host, sent=1, received=int(host != "127.0.0.2"), rtts_ms=[0.25])
+            for host in hosts
+        }
+
+    async def unexpected_ping(host, wait=1):
+        raise AssertionError("ping command must not run for batched hosts")
+
+    monkeypatch.setattr(ReachabilityEngine, "ping_many", fake_ping_many)
+    monkeypatch.setattr(ReachabilityEngine, "async_ping", staticmethod(unexpected_ping))
+
+    payload = ReachabilityEngine().measure(devices=fleet, check_ping=True, check_snmp=False)
+
+    assert len(batches) == 1 and len(batches[0]) == 20
+    assert payload["results"][0]["rtt_ms"] == 0.25
+    assert payload["results"][1]["statuses"] == {"ping": False}
+    assert payload["summary"]["reachable"] == 19
+
+
+def test_measure_without_devices_returns_empty_summary():
+    payload = ReachabilityEngine().measure(devices=[])
+
+    assert payload["results"] == []
+    assert payload["summary"] == {"total": 0, "reachable": 0, "unreachable": 0}
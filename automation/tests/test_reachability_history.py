@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest.mock import patch
+
+import pytest
+
+from automation.application import JobService, ReachabilityHistoryService
+from automation.models import ReachabilityRollup, ReachabilitySample
+from automation.tasks import run_reachability_job
+
+
+NOW = datetime(2026, 3, 10, 11, 20, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture
+def device(make_fleet):
+    [device] = make_fleet(1, prefix="hist", first_ip="10.8.0.1")
+    return device
+
+
+def _payload(device, checked_at, *, ping=True, snmp=True, rtt_ms=1.5):
+    return {
+        "checked_at": checked_at.isoformat(),
+        "summary": {"total": 1, "reachable": int(ping and snmp), "unreachable": int(not (ping and snmp))},
+        "results": [
+            {
+                "device_id": str(device.id),
+                "hostname": device.name,
+                "statuses": {"ping": ping, "snmp": snmp},
+                "rtt_ms": rtt_ms if ping else None,
+            }
+        ],
+    }
+
+
+@pytest.mark.django_db
+def test_record_writes_one_bitmask_row_into_a_daily_partition(device):
+    assert ReachabilityHistoryService.record(_payload(device, NOW, snmp=False)) == 1
+
+    sample = ReachabilitySample.objects.get(device=device)
+    assert (sample.day, sample.checked, sample.reachable, sample.rtt_us) == (NOW.date(), 0b11, 0b01, 1500)
+    assert sample.up is False
+    assert NOW.date() in ReachabilityHistoryService.partitions()
+
+
+@pytest.mark.django_db
+def test_rollup_builds_hourly_and_daily_availability(device):
+    for minute, ping in ((0, True), (5, True), (10, False)):
+        ReachabilityHistoryService.record(_payload(device, NOW.replace(hour=10, minute=minute), ping=ping))
+    ReachabilityHistoryService.record(_payload(device, NOW.replace(minute=0), rtt_ms=3.5))
+
+    assert ReachabilityHistoryService.rollup(now=NOW) == {"hourly": 2, "daily": 1}
+    # Re-running only refreshes the same buckets.
+    ReachabilityHistoryService.rollup(now=NOW)
+
+    ten = ReachabilityRollup.objects.get(device=device, period="hour", bucket=NOW.replace(hour=10, minute=0))
+    assert (ten.samples, ten.up, ten.rtt_count, ten.rtt_max_us) == (3, 2, 2, 1500)
+    day = ReachabilityRollup.objects.get(device=device, period="day")
+    assert (day.samples, day.up) == (4, 3)
+    assert day.rtt_avg_ms == pytest.approx((1.5 + 1.5 + 3.5) / 3)
+    assert ReachabilityHistoryService.availability(device, now=NOW) == {
+        "last_24h": 75.0,
+        "last_7d": 75.0,
+        "last_30d": 75.0,
+    }
+
+
+@pytest.mark.django_db
+def test_purge_drops_expired_partitions_and_rollups(device, settings):
+    settings.REACHABILITY_SAMPLE_RETENTION_DAYS = 14
+    settings.REACHABILITY_HOURLY_ROLLUP_RETENTION_DAYS = 20
+    old = NOW - timedelta(days=30)
+    ReachabilityHistoryService.record(_payload(device, old))
+    ReachabilityHistoryService.rollup(now=old)
+    ReachabilityHistoryService.record(_payload(device, NOW))
+
+    result = ReachabilityHistoryService.purge(now=NOW)
+
+    assert result == {"partitions": 1, "rollups": 1}
+    assert ReachabilityHistoryService.partitions() == [NOW.date()]
+    assert list(ReachabilitySample.objects.values_list("day", flat=True)) == [NOW.date()]
+    assert ReachabilityRollup.objects.filter(period="day").count() == 1
+
+
+@pytest.mark.django_db
+def test_reachability_job_keeps_only_the_summary_on_the_run(device):
+    _, run = JobService.create_reachability_job(devices=[device], created_by=None)
+    payload = _payload(device, NOW)
+
+    with patch("automation.tasks.execute_reachability", return_value=payload):
+        run_reachability_job.run(str(run.id))
+
+    run.refresh_from_db()
+    assert run.result == {
+        "artifacts": {"checked_at": NOW.isoformat(), "summary": payload["summary"], "samples": 1}
+    }
+    assert ReachabilitySample.objects.filter(device=device).count() == 1
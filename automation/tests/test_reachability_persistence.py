@@ -0,0 +1,97 @@
+import uuid
+
+import pytest
+
+from automation.application import ReachabilityPersistenceService
+from dcim.models import DeviceRuntimeStatus
+
+
+@pytest.fixture
+def runtime_fleet(make_fleet):
+    return make_fleet(30, prefix="persist", first_ip="10.9.0.1")
+
+
+def _payload(devices, checked_at, *, down=()):
+    return {
+        "checked_at": checked_at,
+        "results": [
+            {
+                "device_id": str(device.id),
+                "statuses": {"ping": device.name not in down, "snmp": True},
+            }
+            for device in devices
+        ],
+    }
+
+
+@pytest.mark.django_db
+def test_persist_creates_changes_and_touches_in_constant_queries(runtime_fleet, django_assert_num_queries):
+    devices = runtime_fleet
+    DeviceRuntimeStatus.objects.create(device=devices[0], reachable_ping=True, reachable_snmp=True)
+
+    # select runtimes + select missing devices + bulk_create + touch unchanged
+    with django_assert_num_queries(4):
+        counts = ReachabilityPersistenceService.persist(
+            _payload(devices, "2026-01-01T10:00:00+00:00")
+        )
+    assert counts == {"created": 29, "changed": 0, "touched": 1}
+    assert DeviceRuntimeStatus.objects.filter(reachable_ping=True, reachable_snmp=True).count() == 30
+
+    # select runtimes + bulk_update changed + touch unchanged
+    with django_assert_num_queries(3):
+        counts = ReachabilityPersistenceService.persist(
+            _payload(devices, "2026-01-01T10:05:00+00:00", down={"persist03", "persist07"})
+        )
+    assert counts == {"created": 0, "changed": 2, "touched": 28}
+    down = DeviceRuntimeStatus.objects.get(device=devices[3])
+    assert (down.reachable_ping, down.reachable_snmp) == (False, True)
+    assert down.last_check.isoformat() == "2026-01-01T10:05:00+00:00"
+    assert DeviceRuntimeStatus.objects.get(device=devices[4]).last_check.minute == 5
+
+
+@pytest.mark.django_db
+def test_persist_can_skip_last_check_for_unchanged_rows(runtime_fleet, django_assert_num_queries):
+    devices = runtime_fleet[:3]
+    ReachabilityPersistenceService.persist(_payload(devices, "2026-01-01T10:00:00+00:00"))
+
+    with django_assert_num_queries(1):
+        counts = ReachabilityPersistenceService.persist(
+            _payload(devices, "2026-01-01T10:05:00+00:00"), touch_unchanged=False
+        )
+
+    assert counts == {"created": 0, "changed": 0, "touched": 0}
+    assert DeviceRuntimeStatus.objects.get(device=devices[0]).last_check.minute == 0
+
+
+@pytest.mark.django_db
+def test_persist_advances_a_counting_uptime_without_per_row_updates(runtime_fleet, django_assert_num_queries):
+    devices = runtime_fleet[:3]
+
+    def payload(checked_at, uptimes):
+        data = _payload(devices, checked_at)
+        for result, uptime in zip(data["results"], uptimes):
+            result["uptime_seconds"] = uptime
+        return data
+
+    ReachabilityPersistenceService.persist(payload("2026-01-01T10:00:00+00:00", [3600, 3600, 3600]))
+
+    # select runtimes + bulk_update the rebooted row + one grouped UPDATE for the rest
+    with django_assert_num_queries(3):
+        counts = ReachabilityPersistenceService.persist(
+            payload("2026-01-01T10:05:00+00:00", [3900, 3901, 60])
+        )
+
+    assert counts == {"created": 0, "changed": 0, "touched": 3}
+    uptimes = [DeviceRuntimeStatus.objects.get(device=device).uptime.total_seconds() for device in devices]
+    assert uptimes == [3900, 3900, 60]
+
+
+@pytest.mark.django_db
+def test_persist_ignores_results_for_deleted_devices(runtime_fleet):
+    payload = _payload(runtime_fleet[:1], None)
+    payload["results"].append({"device_id": str(uuid.uuid4()), "statuses": {"ping": True}})
+
+    counts = ReachabilityPersistenceService.persist(payload)
+
+    assert counts["created"] == 1
+    assert DeviceRuntimeStatus.objects.count() == 1
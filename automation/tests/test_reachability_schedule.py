@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+
+from automation.application import (
+    JobService,
+    ReachabilityPersistenceService,
+    ReachabilityScheduleService,
+)
+from automation.tasks import run_reachability_job, run_scheduled_reachability
+from dcim.models import Device, DeviceRuntimeStatus
+
+
+BASE = timedelta(minutes=10)
+NOW = datetime(2026, 5, 4, 12, 0, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture
+def fleet(make_fleet):
+    return make_fleet(4, prefix="sched", first_ip="10.7.0.1", tag="reachability_check_tag")
+
+
+def _payload(devices, checked_at, *, down=()):
+    return {
+        "checked_at": checked_at.isoformat(),
+        "results": [
+            {"device_id": str(device.id), "statuses": {"ping": device.name not in down, "snmp": True}}
+            for device in devices
+        ],
+    }
+
+
+def test_next_interval_backs_off_stable_devices_up_to_the_staleness_bound(settings):
+    settings.REACHABILITY_BACKOFF_CHECKS = 6
+    settings.REACHABILITY_MAX_STALENESS_MINUTES = 60
+
+    intervals = [
+        ReachabilityScheduleService.next_interval(checks, up=True, base=BASE)
+        for checks in (0, 5, 6, 12, 18, 500)
+    ]
+
+    assert intervals == [BASE, BASE, 2 * BASE, 4 * BASE, 6 * BASE, 6 * BASE]
+    assert ReachabilityScheduleService.next_interval(500, up=False, base=BASE) == BASE
+
+
+@pytest.mark.django_db
+def test_persist_advances_the_schedule_and_reports_changed_devices(fleet, settings, django_assert_num_queries):
+    settings.REACHABILITY_BACKOFF_CHECKS = 1
+    settings.REACHABILITY_RECHECK_SECONDS = 30
+    ReachabilityPersistenceService.persist(_payload(fleet, NOW), base_interval=BASE)
+    DeviceRuntimeStatus.objects.filter(device=fleet[0]).update(stable_checks=3)
+
+    later = NOW + BASE
+    # select runtimes + bulk_update the changed row + one UPDATE per interval (20m, 80m capped to 60m)
+    with django_assert_num_queries(4):
+        counts = ReachabilityPersistenceService.persist(
+            _payload(fleet, later, down={"sched02"}), base_interval=BASE
+        )
+
+    assert counts["recheck"] == [str(fleet[2].id)]
+    runtimes = {r.device_id: r for r in DeviceRuntimeStatus.objects.all()}
+    assert (runtimes[fleet[0].id].stable_checks, runtimes[fleet[0].id].next_check) == (4, later + timedelta(hours=1))
+    assert (runtimes[fleet[1].id].stable_checks, runtimes[fleet[1].id].next_check) == (1, later + 2 * BASE)
+    assert (runtimes[fleet[2].id].stable_checks, runtimes[fleet[2].id].next_check) == (
+        0,
+        later + timedelta(seconds=30),
+    )
+
+
+@pytest.mark.django_db
+def test_uptime_reset_restarts_the_backoff(fleet, settings):
+    settings.REACHABILITY_BACKOFF_CHECKS = 1
+    device = fleet[0]
+    payload = _payload([device], NOW)
+    payload["results"][0]["uptime_seconds"] = 86400
+    ReachabilityPersistenceService.persist(payload, base_interval=BASE)
+    DeviceRuntimeStatus.objects.filter(device=device).update(stable_checks=5)
+
+    payload = _payload([device], NOW + BASE)
+    payload["results"][0]["uptime_seconds"] = 120
+    counts = ReachabilityPersistenceService.persist(payload, base_interval=BASE)
+
+    runtime = DeviceRuntimeStatus.objects.get(device=device)
+    assert counts["recheck"] == []
+    assert (runtime.stable_checks, runtime.next_check) == (0, NOW + 2 * BASE)
+
+
+@pytest.mark.django_db
+def test_due_skips_devices_scheduled_later_but_bounds_staleness(fleet, settings):
+    settings.REACHABILITY_MAX_STALENESS_MINUTES = 60
+    new, due, later, stale = fleet
+    DeviceRuntimeStatus.objects.create(device=due, last_check=NOW - BASE, next_check=NOW + timedelta(minutes=2))
+    DeviceRuntimeStatus.objects.create(device=later, last_check=NOW - BASE, next_check=NOW + 3 * BASE)
+    DeviceRuntimeStatus.objects.create(
+        device=stale, last_check=NOW - timedelta(hours=2), next_check=NOW + timedelta(days=1)
+    )
+
+    selected = ReachabilityScheduleService.due(Device.objects.all(), base=BASE, now=NOW)
+    assert set(selected) == {new, due, stale}
+
+    settings.REACHABILITY_ADAPTIVE = False
+    assert ReachabilityScheduleService.due(Device.objects.all(), base=BASE, now=NOW).count() == 4
+
+
+@pytest.mark.django_db
+def test_scheduled_run_only_probes_due_devices(fleet):
+    DeviceRuntimeStatus.objects.create(
+        device=fleet[0], last_check=timezone.now(), next_check=timezone.now() + timedelta(days=1)
+    )
+
+    with patch("automation.tasks.ReachabilityService.start_reachability_job") as start:
+        run_scheduled_reachability()
+        assert set(start.call_args.kwargs["devices"]) == set(fleet[1:])
+
+        run_scheduled_reachability(device_ids=[str(fleet[0].id)])
+        assert list(start.call_args.kwargs["devices"]) == [fleet[0]]
+
+
+@pytest.mark.django_db
+def test_reachability_job_queues_a_recheck_for_changed_devices(fleet, settings):
+    settings.REACHABILITY_RECHECK_SECONDS = 45
+    ReachabilityPersistenceService.persist(_payload(fleet, NOW), base_interval=BASE)
+    _, run = JobService.create_reachability_job(devices=fleet, created_by=None)
+
+    with patch(
+        "automation.tasks.execute_reachability",
+        return_value={**_payload(fleet, NOW + BASE, down={"sched01"}), "summary": {}},
+    ), patch("automation.tasks.run_scheduled_reachability.apply_async") as apply_async:
+        run_reachability_job.run(str(run.id))
+
+    apply_async.assert_called_once_with(kwargs={"device_ids": [str(fleet[1].id)]}, countdown=45.0)
@@ -0,0 +1,140 @@
+from unittest.mock import patch
+
+import pytest
+from celery import current_app
+from celery.exceptions import TimeLimitExceeded
+
+from automation.application import JobService
+from automation.choices import JobStatus
+from automation.models import JobRun, ReachabilitySample
+from automation.tasks import (
+    _plan_reachability_shards,
+    _record_reachability_shard,
+    fail_reachability_job,
+    run_reachability_job,
+)
+from dcim.models import DeviceRuntimeStatus
+
+
+def test_plan_reachability_shards_caps_the_number_of_shards():
+    device_ids = [f"d{i}" for i in range(10)]
+
+    assert _plan_reachability_shards(device_ids, shard_size=4, max_shards=8) == [
+        device_ids[0:4],
+        device_ids[4:8],
+        device_ids[8:10],
+    ]
+    assert [len(shard) for shard in _plan_reachability_shards(device_ids, shard_size=2, max_shards=3)] == [4, 4, 2]
+    assert _plan_reachability_shards(device_ids, shard_size=0, max_shards=3) == [device_ids]
+    assert _plan_reachability_shards([], shard_size=4, max_shards=3) == []
+
+
+@pytest.fixture
+def fleet(make_fleet):
+    return make_fleet(3, prefix="shard", first_ip="10.6.0.1", sites=["North", "South"])
+
+
+def _fake_measure(failing_device):
+    def measure(devices, checks):
+        devices = list(devices)
+        if failing_device in devices:
+            raise TimeoutError("snmp timeout chain")
+        return {
+            "checked_at": "2026-02-01T08:00:00+00:00",
+            "summary": {"total": len(devices), "reachable": len(devices), "unreachable": 0},
+            "results": [
+                {"device_id": str(device.id), "statuses": {"ping": True, "snmp": True}}
+                for device in devices
+            ],
+        }
+
+    return measure
+
+
+@pytest.mark.django_db
+def test_large_runs_fan_out_into_shards_and_keep_partial_results(fleet, settings, monkeypatch):
+    monkeypatch.setattr(current_app.conf, "task_always_eager", True)
+    settings.REACHABILITY_SHARD_SIZE = 2
+    _, run = JobService.create_reachability_job(devices=fleet, created_by=None)
+    failing = sorted(fleet[:3], key=lambda device: str(device.id))[0]
+
+    with patch("automation.tasks.measure_devices", _fake_measure(failing)):
+        dispatch = run_reachability_job.apply(args=[str(run.id)]).get()
+
+    assert dispatch == {"run_id": str(run.id), "devices": 6, "shards": 3}
+    run = JobRun.objects.get(id=run.id)
+    assert run.status == JobStatus.SUCCESS
+    assert run.finished_at is not None
+    artifacts = run.result["artifacts"]
+    assert [shard["status"] for shard in artifacts["shards"]].count(JobStatus.FAILED) == 1
+    failed = next(shard for shard in artifacts["shards"] if shard["status"] == JobStatus.FAILED)
+    assert failed["error"] == "snmp timeout chain"
+    assert artifacts["summary"] == {
+        "total": 6 - failed["devices"],
+        "reachable": 6 - failed["devices"],
+        "unreachable": 0,
+        "not_checked": failed["devices"],
+    }
+    assert artifacts["samples"] == ReachabilitySample.objects.count() == 6 - failed["devices"]
+    assert not DeviceRuntimeStatus.objects.filter(device=failing).exists()
+
+
+@pytest.mark.django_db
+def test_run_fails_when_every_shard_fails(fleet, settings, monkeypatch):
+    monkeypatch.setattr(current_app.conf, "task_always_eager", True)
+    settings.REACHABILITY_SHARD_SIZE = 3
+    _, run = JobService.create_reachability_job(devices=fleet, created_by=None)
+
+    with patch("automation.tasks.measure_devices", side_effect=RuntimeError("boom")):
+        run_reachability_job.apply(args=[str(run.id)]).get()
+
+    run = JobRun.objects.get(id=run.id)
+    assert run.status == JobStatus.FAILED
+    assert run.result["error"] == "All 2 reachability shards failed"
+    assert [shard["status"] for shard in run.result["shards"]] == [JobStatus.FAILED, JobStatus.FAILED]
+
+
+@pytest.mark.django_db
+def test_lost_shards_fail_while_recorded_shards_still_finalize_the_run(fleet, settings):
+    settings.REACHABILITY_SHARD_SIZE = 2
+    _, run = JobService.create_reachability_job(devices=fleet, created_by=None)
+
+    with patch("automation.tasks.chord") as dispatch:
+        run_reachability_job.apply(args=[str(run.id)]).get()
+    errback = dispatch.return_value.call_args.args[0].options["link_error"][0]
+    assert errback["task"] == fail_reachability_job.name
+    assert JobRun.objects.get(id=run.id).status == JobStatus.RUNNING
+
+    _record_reachability_shard(
+        str(run.id),
+        0,
+        status=JobStatus.SUCCESS,
+        checked_at="2026-02-01T08:00:00+00:00",
+        summary={"total": 2, "reachable": 1, "unreachable": 1},
+        samples=2,
+    )
+    _record_reachability_shard(str(run.id), 1, status=JobStatus.RUNNING)
+    fail_reachability_job(None, TimeLimitExceeded(330), None, *errback["args"])
+
+    run = JobRun.objects.get(id=run.id)
+    assert run.status == JobStatus.SUCCESS
+    assert run.finished_at is not None
+    artifacts = run.result["artifacts"]
+    assert [shard["status"] for shard in artifacts["shards"]] == [JobStatus.SUCCESS, JobStatus.FAILED, JobStatus.FAILED]
+    assert artifacts["shards"][1]["error"] == "did not finish"
+    assert artifacts["summary"] == {"total": 2, "reachable": 1, "unreachable": 1, "not_checked": 4}
+
+
+@pytest.mark.django_db
+def test_failed_shard_dispatch_fails_the_run(fleet, settings):
+    settings.REACHABILITY_SHARD_SIZE = 2
+    _, run = JobService.create_reachability_job(devices=fleet, created_by=None)
+
+    with patch("automation.tasks.chord", side_effect=ConnectionError("broker down")):
+        with pytest.raises(ConnectionError):
+            run_reachability_job.apply(args=[str(run.id)]).get()
+
+    run = JobRun.objects.get(id=run.id)
+    assert run.status == JobStatus.FAILED
+    assert run.result["error"] == "broker down"
+    assert run.finished_at is not None
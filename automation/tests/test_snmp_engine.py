@@ -0,0 +1,100 @@
+import pytest
+
+pytest.importorskip("pysnmp.hlapi.asyncore")
+
+from accounts.models import SNMPCredential  # noqa: E402
+from automation.application import ReachabilityPersistenceService  # noqa: E402
+from automation.engine.reachability_engine import ReachabilityEngine  # noqa: E402
+from automation.engine.snmp_engine import SNMPEngine  # noqa: E402
+from automation.tests.snmp_responder import SnmpResponder  # noqa: E402
+from dcim.models import Area, Device, DeviceRuntimeStatus, Organization, Site  # noqa: E402
+
+
+@pytest.fixture
+def responder():
+    users = [
+        ("ops", "SHA", "authkey123", "AES", "privkey123"),
+        ("mon", "MD5", "monkey1234", None, None),
+    ]
+    with SnmpResponder(community="zas-ro", users=users) as agent:
+        yield agent
+
+
+def _v3(port, **overrides):
+    config = {
+        "version": "v3",
+        "port": port,
+        "security_level": "authPriv",
+        "username": "ops",
+        "auth_protocol": "SHA",
+        "auth_key": "authkey123",
+        "priv_protocol": "AES",
+        "priv_key": "privkey123",
+    }
+    config.update(overrides)
+    return config
+
+
+def test_get_system_many_shares_one_engine_and_fetches_all_oids(responder):
+    engine = SNMPEngine(timeout=0.5)
+    config = {"version": "v2c", "port": responder.port, "community": "zas-ro"}
+
+    results = engine.get_system_many({index: ("127.0.0.1", config) for index in range(50)})
+    engine.close()
+
+    assert len(results) == 50
+    assert all(info.ok for info in results.values())
+    assert results[0].sys_name == "sim-sw01.example.com"
+    assert results[0].sys_descr.startswith("Cisco IOS Software")
+    assert results[0].uptime_seconds == 86400
+    # sysUpTime, sysName and sysDescr travel in one PDU per host.
+    assert responder.requests == 50
+
+
+def test_v3_auth_priv_and_wrong_keys(responder):
+    engine = SNMPEngine(timeout=0.5)
+
+    results = engine.get_system_many(
+        {
+            "auth_priv": ("127.0.0.1", _v3(responder.port)),
+            "auth_no_priv": (
+                "127.0.0.1",
+                _v3(
+                    responder.port,
+                    security_level="authNoPriv",
+                    username="mon",
+                    auth_protocol="md5",
+                    auth_key="monkey1234",
+                ),
+            ),
+            "wrong_key": ("127.0.0.1", _v3(responder.port, auth_key="wrongkey123")),
+            "wrong_community": ("127.0.0.1", {"version": "v2c", "port": responder.port, "community": "nope"}),
+        }
+    )
+    engines = len(engine._engines)
+    engine.close()
+
+    assert results["auth_priv"].ok is True
+    assert results["auth_no_priv"].ok is True
+    assert results["wrong_key"].ok is False
+    assert results["wrong_community"].ok is False
+    # "ops" with a different key cannot share the first engine's USM entry.
+    assert engines == 2
+
+
+@pytest.mark.django_db
+def test_reachability_measure_refreshes_uptime_over_snmp(responder, monkeypatch):
+    organization = Organization.objects.create(name="SnmpOrg")
+    site = Site.objects.create(name="Snmp", organization=organization)
+    area = Area.objects.create(name="Snmp", site=site)
+    device = Device.objects.create(name="sim-sw01", management_ip="127.0.0.1", site=site, area=area)
+    SNMPCredential.objects.create(
+        site=site, name="snmp", snmp_version="v2c", snmp_port=responder.port, snmp_community="zas-ro"
+    )
+
+    payload = ReachabilityEngine().measure(devices=[device], check_ping=False, check_snmp=True)
+    ReachabilityPersistenceService.persist(payload)
+
+    assert payload["results"][0]["statuses"] == {"snmp": True}
+    assert payload["results"][0]["uptime_seconds"] == 86400
+    assert DeviceRuntimeStatus.objects.get(device=device).uptime.days == 1
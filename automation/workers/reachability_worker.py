@@ -2,7 +2,10 @@ from automation.engine.reachability_engine import ReachabilityEngine
 
 
 def execute_reachability(run, checks: dict) -> dict:
-    devices = run.devices.all()
+    return measure_devices(run.devices.all(), checks)
+
+
+def measure_devices(devices, checks: dict) -> dict:
     engine = ReachabilityEngine()
 
     return engine.measure(
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-17 06:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dcim', '0022_devicemodule_inventory_number'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deviceruntimestatus',
+            name='sync_fingerprints',
+            field=models.JSONField(blank=True, default=dict, help_text='Normalized output hash per CLI command from the last successful sync'),
+        ),
+    ]
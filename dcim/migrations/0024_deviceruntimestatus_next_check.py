@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-17 06:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dcim', '0023_deviceruntimestatus_sync_fingerprints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deviceruntimestatus',
+            name='next_check',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='When the adaptive reachability scheduler probes this device next', null=True),
+        ),
+        migrations.AddField(
+            model_name='deviceruntimestatus',
+            name='stable_checks',
+            field=models.PositiveIntegerField(default=0, help_text='Consecutive reachability checks without a state change'),
+        ),
+    ]
@@ -463,7 +463,22 @@ class DeviceRuntimeStatus(models.Model):
     reachable_ssh = models.BooleanField(default=False)
     reachable_netconf = models.BooleanField(default=False)
     last_check = models.DateTimeField(null=True, blank=True)
+    next_check = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="When the adaptive reachability scheduler probes this device next",
+    )
+    stable_checks = models.PositiveIntegerField(
+        default=0,
+        help_text="Consecutive reachability checks without a state change",
+    )
     uptime = models.DurationField(null=True, blank=True)
+    sync_fingerprints = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Normalized output hash per CLI command from the last successful sync",
+    )
 
     updated_at = models.DateTimeField(auto_now=True)
     class Meta:
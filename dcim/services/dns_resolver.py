@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import socket
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "zas:ptr:"
+MISS = object()
+
+
+class PtrCache:
+    """Thread-safe TTL cache of PTR answers; a ``None`` answer is a negative entry."""
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._entries: Dict[str, tuple[Optional[str], float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, ip: str):
+        with self._lock:
+            entry = self._entries.get(ip)
+            if entry is None:
+                return MISS
+            name, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[ip]
+                return MISS
+            return name
+
+    def set(self, ip: str, name: Optional[str], ttl: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if ip not in self._entries and len(self._entries) >= self.max_entries:
+                self._entries = {k: v for k, v in self._entries.items() if v[1] > now}
+                while len(self._entries) >= self.max_entries:
+                    # dicts keep insertion order: drop the oldest entry
+                    del self._entries[next(iter(self._entries))]
+            self._entries[ip] = (name, now + ttl)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class ReverseResolver:
+    """
+    Concurrent reverse (PTR) lookups with a per-lookup timeout and a TTL cache.
+
+    Names are cached ``DNS_CACHE_TTL`` seconds, misses and timeouts
+    ``DNS_NEGATIVE_CACHE_TTL`` seconds. The in-memory cache is shared by all
+    resolvers of the process; with ``DNS_CACHE_REDIS_URL`` answers are also
+    shared between workers. Lookups go through the system resolver on a
+    dedicated thread pool, so a slow DNS server costs at most ``timeout``
+    per lookup and never blocks the caller's other work.
+    """
+
+    cache = PtrCache()
+
+    def __init__(
+        self,
+        *,
+        timeout: float | None = None,
+        concurrency: int | None = None,
+        ttl: int | None = None,
+        negative_ttl: int | None = None,
+        redis_url: str | None = None,
+    ):
+        self.timeout = settings.DNS_TIMEOUT if timeout is None else timeout
+        self.concurrency = max(1, concurrency or settings.DNS_CONCURRENCY)
+        self.ttl = settings.DNS_CACHE_TTL if ttl is None else ttl
+        self.negative_ttl = settings.DNS_NEGATIVE_CACHE_TTL if negative_ttl is None else negative_ttl
+        self.redis_url = settings.DNS_CACHE_REDIS_URL if redis_url is None else redis_url
+        self._redis = None
+        self._pool = None
+        self._lock = threading.Lock()
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    # ---------- public API ----------
+
+    async def resolve(self, ip: str) -> Optional[str]:
+        return (await self.resolve_many([ip]))[ip]
+
+    async def resolve_many(self, ips: Iterable[str]) -> Dict[str, Optional[str]]:
+        ips = list(dict.fromkeys(ips))
+        results: Dict[str, Optional[str]] = {}
+        missing = []
+        for ip in ips:
+            name = self.cache.get(ip)
+            if name is MISS:
+                missing.append(ip)
+            else:
+                results[ip] = name
+        if not missing:
+            return results
+
+        for ip, (name, ttl) in self._shared_get(missing).items():
+            self.cache.set(ip, name, ttl)
+            results[ip] = name
+        missing = [ip for ip in missing if ip not in results]
+        if not missing:
+            return results
+
+        names = await asyncio.gather(*(self._lookup(ip) for ip in missing))
+        answers = {}
+        for ip, name in zip(missing, names):
+            ttl = self.ttl if name else self.negative_ttl
+            self.cache.set(ip, name, ttl)
+            answers[ip] = (name, ttl)
+            results[ip] = name
+        self._shared_set(answers)
+        return results
+
+    def resolve_many_sync(self, ips: Iterable[str]) -> Dict[str, Optional[str]]:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.resolve_many(ips))
+        # called from inside an event loop (e.g. an async collector): use a fresh one
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, self.resolve_many(ips)).result()
+
+    def lookup(self, ip: str) -> Optional[str]:
+        return self.resolve_many_sync([ip])[ip]
+
+    # ---------- lookups ----------
+
+    def _limits(self, loop) -> tuple[asyncio.Semaphore, ThreadPoolExecutor]:
+        """
+        One semaphore per event loop caps lookups in flight across concurrent
+        ``resolve`` calls. The pool has spare threads for lookups that
+        outlive their timeout, so queued lookups do not time out unstarted.
+        """
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.concurrency * 2, thread_name_prefix="ptr")
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.concurrency)
+            return semaphore, self._pool
+
+    async def _lookup(self, ip: str) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        semaphore, pool = self._limits(loop)
+        async with semaphore:
+            try:
+                name = await asyncio.wait_for(
+                    loop.run_in_executor(pool, _getnameinfo, ip),
+                    self.timeout,
+                )
+            except (asyncio.TimeoutError, OSError, ValueError):
+                return None
+            return name.lower().rstrip(".") or None
+
+    # ---------- shared cache ----------
+
+    def _client(self):
+        if not self.redis_url:
+            return None
+        if self._redis is None:
+            import redis
+
+            self._redis = redis.Redis.from_url(
+                self.redis_url,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5,
+            )
+        return self._redis
+
+    def _shared_get(self, ips: list[str]) -> Dict[str, tuple[Optional[str], int]]:
+        client = self._client()
+        if client is None:
+            return {}
+        try:
+            pipe = client.pipeline(transaction=False)
+            for ip in ips:
+                pipe.get(REDIS_KEY_PREFIX + ip)
+                pipe.ttl(REDIS_KEY_PREFIX + ip)
+            replies = pipe.execute()
+        except Exception as exc:
+            self._disable_shared(exc)
+            return {}
+        found = {}
+        for ip, value, ttl in zip(ips, replies[::2], replies[1::2]):
+            if value is not None and ttl and ttl > 0:
+                found[ip] = (value.decode() or None, ttl)
+        return found
+
+    def _shared_set(self, answers: Dict[str, tuple[Optional[str], int]]) -> None:
+        client = self._client()
+        if client is None or not answers:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for ip, (name, ttl) in answers.items():
+                pipe.set(REDIS_KEY_PREFIX + ip, name or "", ex=max(1, int(ttl)))
+            pipe.execute()
+        except Exception as exc:
+            self._disable_shared(exc)
+
+    def _disable_shared(self, exc: Exception) -> None:
+        logger.warning("Shared PTR cache unavailable, using the local cache only: %s", exc)
+        self.redis_url = ""
+        self._redis = None
+
+
+def _getnameinfo(ip: str) -> str:
+    return socket.getnameinfo((ip, 0), socket.NI_NAMEREQD)[0]
+
+
+_default_resolver: Optional[ReverseResolver] = None
+
+
+def get_resolver() -> ReverseResolver:
+    """Process-wide resolver built from settings."""
+    global _default_resolver
+    if _default_resolver is None:
+        _default_resolver = ReverseResolver()
+    return _default_resolver
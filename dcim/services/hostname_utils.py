@@ -1,5 +1,5 @@
 import ipaddress
-from typing import Optional
+from typing import Iterable, Optional
 
 from dcim.models import Site
 
@@ -49,3 +49,37 @@ def normalize_hostname(hostname: str | None, *, site: Optional[Site] = None) ->
             return f"{value}.{domain}"
 
     return value
+
+
+def resolve_ip_hostname(value: str | None, *, site: Optional[Site] = None) -> str:
+    """
+    Map an IP address to its normalized PTR name through the cached resolver.
+    Anything that is not an IP (or has no PTR record) is returned unchanged.
+    """
+    value = value or ""
+    return resolve_ip_hostnames([value], site=site).get(value, value)
+
+
+def resolve_ip_hostnames(values: Iterable[str], *, site: Optional[Site] = None) -> dict[str, str]:
+    """
+    Batch form of ``resolve_ip_hostname``: the IPs among ``values`` are looked
+    up concurrently in one ``resolve_many`` call. Returns ``{ip: name}`` for
+    the addresses that have a PTR record.
+    """
+    ips = []
+    for value in values:
+        try:
+            ipaddress.ip_address(value)
+        except ValueError:
+            continue
+        ips.append(value)
+    if not ips:
+        return {}
+
+    from dcim.services.dns_resolver import get_resolver
+
+    return {
+        ip: normalize_hostname(name, site=site)
+        for ip, name in get_resolver().resolve_many_sync(ips).items()
+        if name
+    }
@@ -0,0 +1,149 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from dcim.services import dns_resolver
+from dcim.services.dns_resolver import PtrCache, ReverseResolver
+from dcim.services.hostname_utils import resolve_ip_hostname
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    ReverseResolver.cache.clear()
+    yield
+    ReverseResolver.cache.clear()
+
+
+class FakeRedis:
+    """Just enough of a redis client for the resolver's pipelines."""
+
+    def __init__(self):
+        self.values = {}
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def get(self, key):
+        self.calls.append(lambda: self.client.values.get(key, (None, -2))[0])
+
+    def ttl(self, key):
+        self.calls.append(lambda: self.client.values.get(key, (None, -2))[1])
+
+    def set(self, key, value, ex):
+        self.calls.append(lambda: self.client.values.__setitem__(key, (value.encode(), ex)))
+
+    def execute(self):
+        return [call() for call in self.calls]
+
+
+def test_lookups_run_concurrently_and_time_out_individually():
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow_lookup(ip):
+        with lock:
+            in_flight.append(ip)
+            peak.append(len(in_flight))
+        try:
+            if ip == "192.0.2.9":
+                time.sleep(1)
+            else:
+                time.sleep(0.05)
+            return f"SW-{ip.rsplit('.', 1)[1]}.example.com."
+        finally:
+            with lock:
+                in_flight.remove(ip)
+
+    resolver = ReverseResolver(timeout=0.3, concurrency=4, redis_url="")
+    ips = [f"192.0.2.{i}" for i in range(1, 10)]
+
+    started = time.monotonic()
+    with patch.object(dns_resolver, "_getnameinfo", side_effect=slow_lookup):
+        names = resolver.resolve_many_sync(ips)
+    elapsed = time.monotonic() - started
+
+    assert names["192.0.2.1"] == "sw-1.example.com"
+    assert names["192.0.2.9"] is None
+    assert max(peak) == 4
+    assert elapsed < 0.9
+
+
+def test_answers_and_misses_are_cached_until_their_ttl_expires():
+    resolver = ReverseResolver(timeout=1, concurrency=2, ttl=60, negative_ttl=0.1, redis_url="")
+    answers = {"192.0.2.20": "core-sw01.example.com", "192.0.2.21": OSError("NXDOMAIN")}
+
+    with patch.object(dns_resolver, "_getnameinfo", side_effect=lambda ip: _answer(answers[ip])) as lookup:
+        assert resolver.resolve_many_sync(answers) == {"192.0.2.20": "core-sw01.example.com", "192.0.2.21": None}
+        assert ReverseResolver(redis_url="").lookup("192.0.2.20") == "core-sw01.example.com"
+        assert resolver.lookup("192.0.2.21") is None
+        assert lookup.call_count == 2
+
+        time.sleep(0.15)
+        assert resolver.lookup("192.0.2.21") is None
+        assert lookup.call_count == 3
+
+
+def _answer(value):
+    if isinstance(value, Exception):
+        raise value
+    return value
+
+
+def test_ptr_cache_evicts_oldest_entries_when_full():
+    cache = PtrCache(max_entries=2)
+    cache.set("192.0.2.1", "a", 60)
+    cache.set("192.0.2.2", "b", 60)
+    cache.set("192.0.2.3", "c", 60)
+
+    assert cache.get("192.0.2.1") is dns_resolver.MISS
+    assert (cache.get("192.0.2.2"), cache.get("192.0.2.3")) == ("b", "c")
+
+
+def test_shared_cache_serves_answers_resolved_by_another_worker():
+    client = FakeRedis()
+    first = ReverseResolver(timeout=1, ttl=60, negative_ttl=30, redis_url="redis://cache")
+    second = ReverseResolver(timeout=1, ttl=60, negative_ttl=30, redis_url="redis://cache")
+    first._redis = second._redis = client
+
+    with patch.object(dns_resolver, "_getnameinfo", side_effect=["edge-sw01.example.com", OSError()]):
+        first.resolve_many_sync(["192.0.2.30", "192.0.2.31"])
+    assert client.values["zas:ptr:192.0.2.30"] == (b"edge-sw01.example.com", 60)
+    assert client.values["zas:ptr:192.0.2.31"] == (b"", 30)
+
+    ReverseResolver.cache.clear()
+    with patch.object(dns_resolver, "_getnameinfo") as lookup:
+        assert second.resolve_many_sync(["192.0.2.30", "192.0.2.31"]) == {
+            "192.0.2.30": "edge-sw01.example.com",
+            "192.0.2.31": None,
+        }
+    lookup.assert_not_called()
+
+
+def test_unreachable_shared_cache_falls_back_to_local_lookups(caplog):
+    resolver = ReverseResolver(timeout=1, redis_url="redis://127.0.0.1:1/0")
+
+    with patch.object(dns_resolver, "_getnameinfo", return_value="dist-sw01.example.com"):
+        assert resolver.lookup("192.0.2.40") == "dist-sw01.example.com"
+
+    assert resolver.redis_url == ""
+    assert "Shared PTR cache unavailable" in caplog.text
+
+
+def test_resolve_ip_hostname_only_replaces_addresses_with_a_ptr_record():
+    answers = {"192.0.2.50": "Edge-SW01.example.com", "192.0.2.51": OSError()}
+
+    with patch.object(dns_resolver, "_getnameinfo", side_effect=lambda ip: _answer(answers[ip])) as lookup:
+        assert resolve_ip_hostname("192.0.2.50") == "edge-sw01.example.com"
+        assert resolve_ip_hostname("192.0.2.51") == "192.0.2.51"
+        assert resolve_ip_hostname("edge-sw02") == "edge-sw02"
+
+    assert lookup.call_count == 2
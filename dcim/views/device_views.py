@@ -24,6 +24,7 @@ from dcim.models import (
     Tag,
     Site,
 )
+from automation.application.reachability_history_service import ReachabilityHistoryService
 from automation.engine.diff_engine import generate_diff, generate_visual_diff
 from accounts.services.settings_service import get_reachability_checks, get_system_settings
 from dcim.services.configuration_persistence_service import ConfigurationPersistenceService
@@ -740,6 +741,7 @@ class DeviceDetailView(LoginRequiredMixin, DetailView):
         context["modules_count"] = len(modules)
         context["modules_preview"] = modules[:PREVIEW_LIMIT]
         context["reachability_checks"] = get_reachability_checks(get_system_settings())
+        context["availability"] = ReachabilityHistoryService.availability(device)
         latest_config = (
             DeviceConfiguration.objects.filter(device=device)
             .order_by("-collected_at")
@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+import asyncssh
+
+from network.adapters.netmiko import is_invalid_output
+
+
+logger = logging.getLogger(__name__)
+
+# Commands sent after login so the exec session never pauses on --More--.
+PAGING_OFF_COMMANDS = {
+    "cisco_ios": ("terminal length 0", "terminal width 511"),
+    "cisco_nxos": ("terminal length 0", "terminal width 511"),
+}
+PROMPT_PATTERN = re.compile(r"(?m)^([\w.\-@/:()]+[>#])\s*$")
+ANSI_ESCAPE_PATTERN = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+READ_CHUNK = 65536
+
+
+class AsyncSSHSession:
+    """
+    Interactive CLI session over asyncssh.
+
+    Mirrors ``NetmikoAdapter.run_command_raw`` for the platforms in
+    ``PAGING_OFF_COMMANDS``. Takes the dict from
+    ``ConnectionService.build_ssh_params`` so no ORM access happens here.
+    """
+
+    def __init__(self, params: dict, *, command_timeout: float = 60):
+        self.params = params
+        self.command_timeout = command_timeout
+        self.prompt: str | None = None
+        self._connection = None
+        self._process = None
+        self._buffer = ""
+
+    @staticmethod
+    def supports(params: dict) -> bool:
+        return params.get("device_type") in PAGING_OFF_COMMANDS
+
+    async def __aenter__(self):
+        device_type = self.params.get("device_type")
+        if not self.supports(self.params):
+            raise ValueError(
+                f"Async SSH collection does not support device type '{device_type}'."
+            )
+        timeout = self.params.get("timeout") or 30
+        self._connection = await asyncssh.connect(
+            self.params["host"],
+            port=self.params.get("port") or 22,
+            username=self.params.get("username"),
+            password=self.params.get("password"),
+            known_hosts=None,
+            connect_timeout=timeout,
+        )
+        try:
+            self._process = await self._connection.create_process(
+                term_type="vt100",
+                term_size=(511, 24),
+                encoding="utf-8",
+                errors="replace",
+            )
+            self.prompt = await self._detect_prompt(timeout)
+            for command in PAGING_OFF_COMMANDS[device_type]:
+                await self._send(command)
+        except BaseException:
+            self._connection.close()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, exc_tb):
+        if self._connection is not None:
+            self._connection.close()
+            try:
+                await self._connection.wait_closed()
+            except Exception:
+                pass
+
+    async def run_command_raw(self, command: str) -> dict:
+        """
+        Return {'raw': str, 'parsed': None, 'error': str|None}.
+
+        A timeout or a dropped session is raised instead: the unread output
+        would otherwise be taken for the next command's, so the session is
+        abandoned and the collection retried.
+        """
+        result = {"raw": "", "parsed": None, "error": None}
+        try:
+            result["raw"] = await self._send(command)
+        except (asyncio.TimeoutError, ConnectionError):
+            raise
+        except Exception as exc:
+            result["error"] = str(exc) or exc.__class__.__name__
+        return result
+
+    # -------------------------------------------------
+    # Internals
+    # -------------------------------------------------
+    async def _detect_prompt(self, timeout: float) -> str:
+        self._process.stdin.write("\n")
+        _, match = await asyncio.wait_for(self._read_until(PROMPT_PATTERN), timeout)
+        return match.group(1)
+
+    async def _send(self, command: str) -> str:
+        self._process.stdin.write(command + "\n")
+        prompt_pattern = re.compile(rf"(?m)^{re.escape(self.prompt)}\s*$")
+        output, _ = await asyncio.wait_for(
+            self._read_until(prompt_pattern), self.command_timeout
+        )
+        return self._clean_output(output, command)
+
+    async def _read_until(self, pattern: re.Pattern) -> tuple[str, re.Match]:
+        while True:
+            match = pattern.search(self._buffer)
+            if match:
+                output = self._buffer[: match.start()]
+                self._buffer = self._buffer[match.end():]
+                return output, match
+            chunk = await self._process.stdout.read(READ_CHUNK)
+            if not chunk:
+                raise ConnectionError("SSH session closed before prompt was seen.")
+            self._buffer += ANSI_ESCAPE_PATTERN.sub("", chunk.replace("\r", ""))
+
+    @staticmethod
+    def _clean_output(output: str, command: str) -> str:
+        lines = output.split("\n")
+        if lines and lines[0].strip() == command.strip():
+            lines = lines[1:]
+        return "\n".join(lines).strip("\n")
+
+
+async def run_collection_plan(session, plan: Iterable[tuple[str, ...]]) -> dict:
+    """Async counterpart of ``SyncService._run_collection_plan``."""
+    results = {}
+    for command, *fallbacks in plan:
+        result = await session.run_command_raw(command)
+        for fallback in fallbacks:
+            if not is_invalid_output(result.get("raw")):
+                break
+            result = await session.run_command_raw(fallback)
+        results[command] = result
+    return results
+
+
+@dataclass
+class CollectionRequest:
+    key: Any
+    params: dict
+    plan: list[tuple[str, ...]]
+
+
+@dataclass
+class CollectionResult:
+    key: Any
+    results: dict | None = None
+    error: Exception | None = None
+    applied: Any = field(default=None, repr=False)
+
+
+class AsyncCollectionEngine:
+    """
+    Collect CLI output from many devices concurrently, then hand each result
+    to a bounded pool of ``apply`` workers.
+
+    Up to ``max_sessions`` SSH sessions are in flight at once; collected
+    results wait in a queue of ``queue_size`` and are applied by
+    ``apply_workers`` threads, so database connections are only held by the
+    apply stage. MUST NOT write to DB itself.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_sessions: int = 200,
+        apply_workers: int = 4,
+        queue_size: int | None = None,
+        command_timeout: float = 60,
+        attempts: int = 2,
+        session_factory: Callable[..., AsyncSSHSession] = AsyncSSHSession,
+    ):
+        self.max_sessions = max(1, max_sessions)
+        self.apply_workers = max(1, apply_workers)
+        self.queue_size = queue_size or self.apply_workers * 2
+        self.command_timeout = command_timeout
+        self.attempts = max(1, attempts)
+        self.session_factory = session_factory
+
+    def run(
+        self,
+        requests: Iterable[CollectionRequest],
+        apply: Callable[[CollectionResult], Any],
+    ) -> list[CollectionResult]:
+        return asyncio.run(self.collect_and_apply(requests, apply))
+
+    async def collect_and_apply(
+        self,
+        requests: Iterable[CollectionRequest],
+        apply: Callable[[CollectionResult], Any],
+    ) -> list[CollectionResult]:
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_sessions)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        completed: list[CollectionResult] = []
+
+        async def _produce(request: CollectionRequest) -> None:
+            async with semaphore:
+                result = await self.collect(request)
+                # Keeps the slot while the apply stage is behind, so no new
+                # sessions open until there is room in the queue.
+                await queue.put(result)
+
+        async def _consume(executor: ThreadPoolExecutor) -> None:
+            while True:
+                result = await queue.get()
+                try:
+                    if result is None:
+                        return
+                    try:
+                        result.applied = await loop.run_in_executor(executor, apply, result)
+                    except Exception as exc:
+                        logger.warning("Apply failed for %s: %s", result.key, exc)
+                        result.error = result.error or exc
+                    completed.append(result)
+                finally:
+                    queue.task_done()
+
+        with ThreadPoolExecutor(
+            max_workers=self.apply_workers, thread_name_prefix="sync-apply"
+        ) as executor:
+            consumers = [
+                asyncio.create_task(_consume(executor)) for _ in range(self.apply_workers)
+            ]
+            try:
+                await asyncio.gather(*(_produce(request) for request in requests))
+            finally:
+                for _ in consumers:
+                    await queue.put(None)
+                await asyncio.gather(*consumers)
+        return completed
+
+    async def collect(self, request: CollectionRequest) -> CollectionResult:
+        last_exc = None
+        for attempt in range(self.attempts):
+            try:
+                async with self.session_factory(
+                    request.params, command_timeout=self.command_timeout
+                ) as session:
+                    results = await run_collection_plan(session, request.plan)
+                return CollectionResult(key=request.key, results=results)
+            except Exception as exc:
+                last_exc = exc
+                logger.warning(
+                    "Async SSH collection failed for %s (attempt %s/%s): %s",
+                    request.key,
+                    attempt + 1,
+                    self.attempts,
+                    exc,
+                )
+        return CollectionResult(key=request.key, error=last_exc)
@@ -5,6 +5,14 @@ from netmiko import ConnectHandler
 from automation.application.connection_service import ConnectionService
 
 
+def is_invalid_output(raw: str | None) -> bool:
+    """True when a command produced nothing or the device rejected it."""
+    if not raw:
+        return True
+    raw_lower = raw.lower()
+    return "% invalid" in raw_lower or "invalid input" in raw_lower
+
+
 class NetmikoAdapter(contextlib.AbstractContextManager):
     """Thin wrapper around Netmiko ConnectHandler with site credentials."""
 
@@ -0,0 +1,17 @@
+from .hostname_filters import HostnameFilterBenchmark
+from .replay import (
+    ReplayAdapter,
+    SyncReplayBenchmark,
+    Transcript,
+    load_transcript,
+    load_transcripts,
+)
+
+__all__ = [
+    "HostnameFilterBenchmark",
+    "ReplayAdapter",
+    "SyncReplayBenchmark",
+    "Transcript",
+    "load_transcript",
+    "load_transcripts",
+]
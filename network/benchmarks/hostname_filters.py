@@ -0,0 +1,91 @@
+import random
+import time
+from types import SimpleNamespace
+
+from network.services.discovery_filtering import HostnameFilterMatcher, hostname_passes_filters
+
+ROLES = ("core", "dist", "acc", "edge", "fw", "rtr", "wlc", "lab", "mgmt", "oob", "bcsw", "ap")
+SITES = ("fra", "ber", "muc", "ham", "cgn", "str", "dus", "lej", "nue", "han")
+DOMAINS = ("example.com", "corp.example.com", "lab.example.net", "")
+
+
+def synthetic_hostnames(count: int, *, seed: int = 0) -> list[str]:
+    """Hostnames shaped like ``<role><nn>-<site><building>-<floor>[.<domain>]``, some upper case."""
+    rng = random.Random(seed)
+    hostnames = []
+    for _ in range(count):
+        name = (
+            f"{rng.choice(ROLES)}{rng.randint(1, 99):02d}-{rng.choice(SITES)}"
+            f"{rng.randint(1, 400)}{rng.choice('abcd')}-{rng.randint(0, 12):02d}"
+        )
+        domain = rng.choice(DOMAINS)
+        if domain:
+            name = f"{name}.{domain}"
+        hostnames.append(name.upper() if rng.random() < 0.1 else name)
+    return hostnames
+
+
+def synthetic_filters(count: int, *, seed: int = 0) -> list[SimpleNamespace]:
+    """Filters with 1-3 positive and 0-2 negative comma-separated terms, like the site forms produce."""
+    rng = random.Random(seed + 1)
+
+    def positive() -> str:
+        kind = rng.random()
+        if kind < 0.4:
+            return f"{rng.choice(ROLES)}{rng.randint(1, 99):02d}"
+        if kind < 0.8:
+            return f"-{rng.choice(SITES)}{rng.randint(1, 400)}"
+        return rng.choice(ROLES + SITES)
+
+    negatives = ("lab", "oob", "-00", "test", ".net", "mgmt")
+    filters = []
+    for _ in range(count):
+        contains = [positive() for _ in range(rng.randint(1, 3))]
+        not_contains = rng.sample(negatives, rng.randint(0, 2))
+        filters.append(
+            SimpleNamespace(
+                hostname_contains=", ".join(contains),
+                hostname_not_contains=",".join(term.upper() for term in not_contains),
+            )
+        )
+    return filters
+
+
+class HostnameFilterBenchmark:
+    """
+    Time ``hostname_passes_filters`` against ``HostnameFilterMatcher`` on
+    synthetic hostnames and filters, and count any verdicts that differ.
+    """
+
+    def __init__(self, *, hostnames: int = 100_000, filters: int = 50, seed: int = 0):
+        self.hostnames = synthetic_hostnames(max(1, hostnames), seed=seed)
+        self.filters = synthetic_filters(max(1, filters), seed=seed)
+
+    def run(self, label: str | None = None) -> dict:
+        started = time.perf_counter()
+        expected = [hostname_passes_filters(hostname, self.filters) for hostname in self.hostnames]
+        reference_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        matcher = HostnameFilterMatcher(self.filters)
+        compile_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        verdicts = [matcher.passes(hostname) for hostname in self.hostnames]
+        compiled_seconds = time.perf_counter() - started
+
+        return {
+            "label": label,
+            "hostnames": len(self.hostnames),
+            "filters": len(self.filters),
+            "accepted": sum(verdicts),
+            "mismatches": sum(1 for a, b in zip(expected, verdicts) if a != b),
+            "reference": self._stage(reference_seconds),
+            "compiled": {**self._stage(compiled_seconds), "compile_seconds": round(compile_seconds, 6)},
+            "speedup": round(reference_seconds / compiled_seconds, 1) if compiled_seconds else None,
+        }
+
+    def _stage(self, seconds: float) -> dict:
+        return {
+            "seconds": round(seconds, 4),
+            "hostnames_per_sec": round(len(self.hostnames) / seconds) if seconds else None,
+        }
@@ -0,0 +1,350 @@
+import ipaddress
+import logging
+import platform as host_platform
+import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import django
+from django.db import connection
+from django.utils import timezone
+
+from dcim.models import Area, Device, DeviceType, Organization, Site, Vendor
+from network.services.sync_service import SyncService
+from services.validation_service import normalize_serial_number
+
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_DIR = Path(__file__).resolve().parent / "transcripts"
+PROC_STATUS = Path("/proc/self/status")
+PROC_CLEAR_REFS = Path("/proc/self/clear_refs")
+BENCHMARK_ORGANIZATION = "Sync Benchmark"
+BENCHMARK_NETWORK = ipaddress.ip_network("198.18.0.0/15")
+HEADER_PATTERN = re.compile(r"^!\s*(?P<key>[\w-]+)\s*:\s*(?P<value>.*)$")
+PROMPT_PATTERN = re.compile(r"^(?P<host>[\w.\-]+)#(?P<command>.*)$")
+SERIAL_PATTERNS = (
+    re.compile(r"(?P<prefix>\bSN:\s*)(?P<serial>[^\s,]+)"),
+    re.compile(r"(?P<prefix>serial number is\s+)(?P<serial>\S+)", re.IGNORECASE),
+    re.compile(r"(?P<prefix>Serial Number\s*:\s*)(?P<serial>\S+)"),
+    re.compile(r"(?P<prefix>Processor board ID\s+)(?P<serial>\S+)", re.IGNORECASE),
+)
+REJECTED_OUTPUT = "% Invalid input detected at '^' marker."
+
+
+@dataclass
+class Transcript:
+    """Recorded CLI session of one device: ``{command: raw output}``."""
+
+    name: str
+    hostname: str
+    platform: str
+    model: str
+    outputs: dict[str, str]
+    description: str = ""
+
+
+def load_transcript(path: Path) -> Transcript:
+    """
+    Parse a transcript file.
+
+    The format is a terminal log: optional ``! key: value`` header lines
+    (``platform`` and ``model`` are required), then ``<host>#<command>``
+    prompt lines each followed by the command output. A bare ``<host>#``
+    ends the last command.
+    """
+    path = Path(path)
+    header = {}
+    outputs = {}
+    hostname = None
+    command = None
+    buffer: list[str] = []
+
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if hostname is None:
+            header_match = HEADER_PATTERN.match(line)
+            if header_match:
+                header[header_match["key"]] = header_match["value"].strip()
+                continue
+            prompt_match = PROMPT_PATTERN.match(line)
+            if not prompt_match:
+                continue
+            hostname = prompt_match["host"]
+            command = prompt_match["command"].strip() or None
+            continue
+        if line.startswith(f"{hostname}#"):
+            if command:
+                outputs[command] = "\n".join(buffer)
+            command = line[len(hostname) + 1:].strip() or None
+            buffer = []
+            continue
+        buffer.append(line)
+    if command:
+        outputs[command] = "\n".join(buffer)
+
+    missing = {"platform", "model"} - header.keys()
+    if hostname is None or missing:
+        raise ValueError(
+            f"Transcript {path.name} needs a prompt line and header(s): {', '.join(sorted(missing))}"
+        )
+    return Transcript(
+        name=path.stem,
+        hostname=hostname,
+        platform=header["platform"],
+        model=header["model"],
+        description=header.get("description", ""),
+        outputs=outputs,
+    )
+
+
+def load_transcripts(directory: Path = TRANSCRIPT_DIR, names=None) -> list[Transcript]:
+    paths = sorted(Path(directory).glob("*.txt"))
+    if names:
+        wanted = set(names)
+        paths = [path for path in paths if path.stem in wanted]
+        unknown = wanted - {path.stem for path in paths}
+        if unknown:
+            raise ValueError(f"Unknown transcript(s): {', '.join(sorted(unknown))}")
+    return [load_transcript(path) for path in paths]
+
+
+def personalize_output(raw: str, index: int) -> str:
+    """Prefix every valid serial so synthetic devices never share hardware."""
+
+    def _replace(match):
+        serial = match["serial"]
+        if not normalize_serial_number(serial):
+            return match.group(0)
+        return f"{match['prefix']}R{index:05d}{serial}"
+
+    for pattern in SERIAL_PATTERNS:
+        raw = pattern.sub(_replace, raw)
+    return raw
+
+
+class ReplayAdapter:
+    """Stands in for NetmikoAdapter and answers from recorded transcripts."""
+
+    def __init__(self, outputs_by_device: dict, device, *, allow_autodetect: bool = False):
+        self.outputs = outputs_by_device.get(device.pk, {})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, exc_tb):
+        return False
+
+    def run_command_raw(self, command: str) -> dict:
+        return {"raw": self.outputs.get(command, REJECTED_OUTPUT), "parsed": None, "error": None}
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the kernel's RSS high-water mark (Linux only) so the next read
+    covers just what runs after it. ``ru_maxrss`` can't be reset and would
+    report the peak of every earlier stage.
+    """
+    try:
+        PROC_CLEAR_REFS.write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+def read_peak_rss_kb() -> int | None:
+    try:
+        status = PROC_STATUS.read_text()
+    except OSError:
+        return None
+    for line in status.splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1])
+    return None
+
+
+@dataclass
+class StageMetrics:
+    devices: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+    queries: int = 0
+    sql_seconds: float = 0.0
+    peak_rss_kb: int | None = None
+    sync_phases: dict = field(default_factory=lambda: defaultdict(float))
+    profiles: dict = field(default_factory=lambda: defaultdict(lambda: {"devices": 0, "seconds": 0.0}))
+
+    def as_dict(self) -> dict:
+        return {
+            "devices": self.devices,
+            "failed": self.failed,
+            "seconds": round(self.seconds, 4),
+            "devices_per_sec": round(self.devices / self.seconds, 2) if self.seconds else None,
+            "queries": self.queries,
+            "queries_per_device": round(self.queries / self.devices, 1) if self.devices else None,
+            "sql_seconds": round(self.sql_seconds, 4),
+            "peak_rss_kb": self.peak_rss_kb,
+            "sync_phases": {key: round(value, 4) for key, value in self.sync_phases.items()},
+            "profiles": {
+                name: {
+                    "devices": data["devices"],
+                    "devices_per_sec": (
+                        round(data["devices"] / data["seconds"], 2) if data["seconds"] else None
+                    ),
+                }
+                for name, data in self.profiles.items()
+            },
+        }
+
+
+class SyncReplayBenchmark:
+    """
+    Run ``SyncService.sync_device`` over synthetic devices replayed from
+    transcripts and report throughput, SQL and memory per stage.
+
+    Stages are the first sync (everything created), an unchanged re-sync
+    (fingerprint skips) and a forced re-sync. The synthetic organization is
+    removed afterwards unless ``keep`` is set.
+    """
+
+    STAGES = (
+        ("initial_sync", False),
+        ("resync", False),
+        ("forced_resync", True),
+    )
+
+    def __init__(self, transcripts: list[Transcript], *, devices_per_transcript: int = 10, keep: bool = False):
+        self.transcripts = transcripts
+        self.devices_per_transcript = max(1, devices_per_transcript)
+        self.keep = keep
+        self.site = None
+        self.fleet: list[tuple[Device, Transcript]] = []
+        self.outputs_by_device: dict = {}
+        self._created_device_types: list[DeviceType] = []
+
+    # -------------------------------------------------
+    # Fleet
+    # -------------------------------------------------
+    def build_fleet(self) -> None:
+        if Organization.objects.filter(name=BENCHMARK_ORGANIZATION).exists():
+            raise ValueError(
+                f"Organization '{BENCHMARK_ORGANIZATION}' already exists; remove it before benchmarking."
+            )
+        organization = Organization.objects.create(name=BENCHMARK_ORGANIZATION)
+        self.site = Site.objects.create(name="Replay", organization=organization)
+        area = Area.objects.create(name="Replay", site=self.site)
+        vendor, _ = Vendor.objects.get_or_create(name="Cisco")
+        used_ips = set(
+            Device.objects.filter(management_ip__startswith="198.1").values_list("management_ip", flat=True)
+        )
+        addresses = (str(ip) for ip in BENCHMARK_NETWORK.hosts() if str(ip) not in used_ips)
+
+        devices = []
+        for transcript in self.transcripts:
+            device_type, created = DeviceType.objects.get_or_create(
+                model=transcript.model,
+                vendor=vendor,
+                defaults={"platform": transcript.platform},
+            )
+            if created:
+                self._created_device_types.append(device_type)
+            for index in range(self.devices_per_transcript):
+                device = Device(
+                    name=f"{transcript.hostname}-bench{index:05d}",
+                    management_ip=next(addresses),
+                    site=self.site,
+                    area=area,
+                    device_type=device_type,
+                    status="active",
+                )
+                devices.append((device, transcript))
+                self.outputs_by_device[device.pk] = {
+                    command: personalize_output(raw, len(devices))
+                    for command, raw in transcript.outputs.items()
+                }
+        Device.objects.bulk_create([device for device, _ in devices])
+        self.fleet = devices
+
+    def cleanup(self) -> None:
+        if self.keep or self.site is None:
+            return
+        organization = self.site.organization
+        Device.objects.filter(site=self.site).delete()
+        Area.objects.filter(site=self.site).delete()
+        self.site.delete()
+        organization.delete()
+        DeviceType.objects.filter(pk__in=[dt.pk for dt in self._created_device_types]).delete()
+
+    # -------------------------------------------------
+    # Measurement
+    # -------------------------------------------------
+    @contextmanager
+    def measure(self, metrics: StageMetrics):
+        def _wrapper(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                metrics.queries += 1
+                metrics.sql_seconds += time.perf_counter() - started
+
+        tracked = reset_peak_rss()
+        started = time.perf_counter()
+        with connection.execute_wrapper(_wrapper):
+            yield metrics
+        metrics.seconds = time.perf_counter() - started
+        metrics.peak_rss_kb = read_peak_rss_kb() if tracked else None
+
+    def _adapter_factory(self, device, *, allow_autodetect=False):
+        return ReplayAdapter(self.outputs_by_device, device, allow_autodetect=allow_autodetect)
+
+    def run_stage(self, *, force: bool) -> StageMetrics:
+        metrics = StageMetrics()
+        with self.measure(metrics):
+            for device, transcript in self.fleet:
+                started = time.perf_counter()
+                service = SyncService(site=self.site, adapter_factory=self._adapter_factory)
+                result = service.sync_device(device, force=force)
+                metrics.devices += 1
+                if not result.get("success"):
+                    metrics.failed += 1
+                    logger.warning("Replay sync failed for %s: %s", device, result.get("error"))
+                for phase, seconds in (result.get("timings") or {}).items():
+                    metrics.sync_phases[phase] += seconds
+                profile = metrics.profiles[transcript.name]
+                profile["devices"] += 1
+                profile["seconds"] += time.perf_counter() - started
+        return metrics
+
+    def run(self, *, label: str | None = None) -> dict:
+        report = {
+            "label": label,
+            "started_at": timezone.now().isoformat(),
+            "python": host_platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "devices_per_transcript": self.devices_per_transcript,
+            "transcripts": {
+                transcript.name: {
+                    "platform": transcript.platform,
+                    "model": transcript.model,
+                    "commands": len(transcript.outputs),
+                    "description": transcript.description,
+                }
+                for transcript in self.transcripts
+            },
+            "stages": {},
+        }
+        setup = StageMetrics()
+        with self.measure(setup):
+            self.build_fleet()
+        setup.devices = len(self.fleet)
+        report["stages"]["fleet_setup"] = setup.as_dict()
+        try:
+            for stage, force in self.STAGES:
+                report["stages"][stage] = self.run_stage(force=force).as_dict()
+        finally:
+            self.cleanup()
+        return report
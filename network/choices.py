@@ -15,6 +15,10 @@ class CliCommandsChoices(ChoiceSet):
     PORTCHANNEL_SUMMARY_NXOS_CMD = "show port-channel summary"
     RUNNING_CONFIG_CMD = "show running-config"
     STACK_SWITCH_CMD = "show switch"
+    CDP_NEIGHBORS_DETAIL_CMD = "show cdp neighbors detail"
+    CDP_NEIGHBORS_CMD = "show cdp neighbors"
+    LLDP_NEIGHBORS_DETAIL_CMD = "show lldp neighbors detail"
+    LLDP_NEIGHBORS_CMD = "show lldp neighbors"
 
     CHOICES = (
         (VERSION_CMD, _("Version Command")),
@@ -27,4 +31,8 @@ class CliCommandsChoices(ChoiceSet):
         (PORTCHANNEL_SUMMARY_NXOS_CMD, _("Port-Channel Summary Command (NX-OS)")),
         (RUNNING_CONFIG_CMD, _("Running Configuration Command")),
         (STACK_SWITCH_CMD, _("Stack Members Command (IOS/IOS-XE)")),
+        (CDP_NEIGHBORS_DETAIL_CMD, _("CDP Neighbors Detail Command")),
+        (CDP_NEIGHBORS_CMD, _("CDP Neighbors Command")),
+        (LLDP_NEIGHBORS_DETAIL_CMD, _("LLDP Neighbors Detail Command")),
+        (LLDP_NEIGHBORS_CMD, _("LLDP Neighbors Command")),
     )
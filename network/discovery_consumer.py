@@ -0,0 +1,26 @@
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from network.services.discovery_progress import discovery_scan_group
+
+
+class DiscoveryScanConsumer(AsyncJsonWebsocketConsumer):
+    """Relays the ``discovery.progress`` events of one scan job to the browser."""
+
+    group = None
+
+    async def connect(self):
+        user = self.scope.get("user")
+        if not user or not user.is_authenticated or self.channel_layer is None:
+            await self.close()
+            return
+
+        self.group = discovery_scan_group(self.scope["url_route"]["kwargs"]["job_id"])
+        await self.channel_layer.group_add(self.group, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        if self.group:
+            await self.channel_layer.group_discard(self.group, self.channel_name)
+
+    async def discovery_progress(self, event):
+        await self.send_json({key: value for key, value in event.items() if key != "type"})
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .discovery_consumer import DiscoveryScanConsumer
+
+websocket_urlpatterns = [
+    path("ws/discovery/scan/<uuid:job_id>/", DiscoveryScanConsumer.as_asgi()),
+]
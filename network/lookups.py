@@ -0,0 +1,20 @@
+from django.db import NotSupportedError
+from django.db.models import GenericIPAddressField, Lookup
+
+
+@GenericIPAddressField.register_lookup
+class NetContainedOrEqual(Lookup):
+    """
+    ``ip_address__net_contained_or_equal="10.0.0.0/24"``: the address lies
+    in the given network (PostgreSQL ``inet <<=``).
+    """
+
+    lookup_name = "net_contained_or_equal"
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        raise NotSupportedError(f"{self.lookup_name} requires PostgreSQL")
+
+    def as_postgresql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        return f"{lhs} <<= %s::inet", [*lhs_params, str(self.rhs)]
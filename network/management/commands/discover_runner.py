@@ -24,6 +24,11 @@ class Command(BaseCommand):
             "--cidr",
             help="Scan a single CIDR for the given site (overrides configured ranges)",
         )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Delta-scan ranges whose full sweep is not due (skip fresh devices, back off dead hosts)",
+        )
 
     def handle(self, *args, **options):
         site_id = options.get("site_id")
@@ -44,15 +49,17 @@ class Command(BaseCommand):
             self.style.NOTICE(f"Starting discovery for site: {site}")
         )
 
-        service = NetworkDiscoveryService(site=site)
-        
+        service = NetworkDiscoveryService(site=site, incremental=options.get("incremental", False))
+
         stats = service.run(cidr_override=cidr)
 
         self.stdout.write(
             self.style.SUCCESS(
                 "Discovery finished:\n"
                 f"  Ranges scanned : {stats['ranges']}\n"
-                f"  Alive found    : {stats['alive']}\n"
+                f"  Probes skipped : {stats.get('skipped', 0)}\n"
+                f"  Alive found    : {stats['alive']}"
+                f" ({stats.get('first_seen', 0)} first seen, {stats.get('refreshed', 0)} refreshed)\n"
                 f"  Exact matches  : {stats.get('exact', 0)}\n"
                 f"  Mismatches     : {stats.get('mismatch', 0)}\n"
                 f"  New devices  : {stats.get('new', 0)}"
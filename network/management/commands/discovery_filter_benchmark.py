@@ -0,0 +1,51 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from network.benchmarks import HostnameFilterBenchmark
+
+
+class Command(BaseCommand):
+    help = "Benchmark discovery hostname filtering: per-host filter evaluation vs the compiled matcher"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hostnames",
+            type=int,
+            default=100_000,
+            help="Synthetic hostnames to filter (default: 100000)",
+        )
+        parser.add_argument(
+            "--filters",
+            type=int,
+            default=50,
+            help="Synthetic discovery filters (default: 50)",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for hostnames and filters")
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+        parser.add_argument("--label", help="Free-text label stored in the report (e.g. git revision)")
+
+    def handle(self, *args, **options):
+        benchmark = HostnameFilterBenchmark(
+            hostnames=options["hostnames"],
+            filters=options["filters"],
+            seed=options["seed"],
+        )
+        report = benchmark.run(label=options.get("label"))
+
+        for stage in ("reference", "compiled"):
+            metrics = report[stage]
+            self.stderr.write(
+                f"{stage:<10} {report['hostnames']:>8} hostnames  {metrics['seconds']:>8.3f}s  "
+                f"{metrics['hostnames_per_sec'] or 0:>10} hostnames/s"
+            )
+        self.stderr.write(f"speedup    {report['speedup']}x, {report['mismatches']} mismatching verdicts")
+
+        payload = json.dumps(report, indent=2)
+        output = options.get("output")
+        if output:
+            Path(output).write_text(payload + "\n", encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"Report written to {output}"))
+        else:
+            self.stdout.write(payload)
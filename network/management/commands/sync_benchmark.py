@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from network.benchmarks import SyncReplayBenchmark, load_transcripts
+from network.benchmarks.replay import TRANSCRIPT_DIR
+
+
+class Command(BaseCommand):
+    help = "Benchmark SyncService by replaying recorded device transcripts against synthetic devices"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--devices",
+            type=int,
+            default=10,
+            help="Synthetic devices per transcript (default: 10)",
+        )
+        parser.add_argument(
+            "--transcript",
+            action="append",
+            help="Transcript name without extension (can be used multiple times; default: all)",
+        )
+        parser.add_argument(
+            "--transcript-dir",
+            default=str(TRANSCRIPT_DIR),
+            help="Directory containing *.txt transcripts",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+        parser.add_argument("--label", help="Free-text label stored in the report (e.g. git revision)")
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the synthetic organization, site and devices after the run",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            transcripts = load_transcripts(Path(options["transcript_dir"]), options.get("transcript"))
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        if not transcripts:
+            raise CommandError(f"No transcripts found in {options['transcript_dir']}.")
+
+        benchmark = SyncReplayBenchmark(
+            transcripts,
+            devices_per_transcript=options["devices"],
+            keep=options.get("keep", False),
+        )
+        self.stderr.write(
+            f"Replaying {', '.join(t.name for t in transcripts)} "
+            f"x {benchmark.devices_per_transcript} devices"
+        )
+        try:
+            report = benchmark.run(label=options.get("label"))
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        for stage, metrics in report["stages"].items():
+            self.stderr.write(
+                f"{stage:<14} {metrics['devices']:>5} devices  {metrics['seconds']:>8.2f}s  "
+                f"{metrics['devices_per_sec'] or 0:>8.2f} dev/s  {metrics['queries']:>7} queries  "
+                f"{metrics['sql_seconds']:>7.2f}s SQL  {metrics['peak_rss_kb'] or '-':>8} KB RSS"
+            )
+
+        payload = json.dumps(report, indent=2)
+        output = options.get("output")
+        if output:
+            Path(output).write_text(payload + "\n", encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"Report written to {output}"))
+        else:
+            self.stdout.write(payload)
@@ -1,12 +1,16 @@
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.db import close_old_connections
 from django.utils import timezone
 
+from automation.application.connection_service import ConnectionService
 from dcim.models import Device
 from dcim.models.site import Organization, Site
-from network.services.sync_service import SyncService
+from network.adapters.async_ssh import AsyncCollectionEngine, AsyncSSHSession, CollectionRequest
+from network.services.sync_metrics import SyncMetricsSummary
+from network.services.sync_service import SYNC_EXCLUDE_TAG, SyncService
 
 
 class Command(BaseCommand):
@@ -32,14 +36,44 @@ class Command(BaseCommand):
             action="store_true",
             help="Collect running-config during sync",
         )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-apply every stage even if command output is unchanged since the last sync",
+        )
         parser.add_argument(
             "--threads",
             type=int,
             default=10,
             help="Number of parallel threads (default: 10)",
         )
+        parser.add_argument(
+            "--async-sessions",
+            type=int,
+            default=0,
+            help=(
+                "Collect over asyncssh with up to N concurrent sessions (IOS/IOS-XE/NX-OS); "
+                "--threads then bounds the database apply workers"
+            ),
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=5,
+            help="Rows in the slowest devices / slowest stages summary (default: 5, 0 disables)",
+        )
+        parser.add_argument(
+            "--metrics-json",
+            help="Write per-device and per-stage timing/query metrics to this JSON file",
+        )
+        parser.add_argument(
+            "--pushgateway",
+            default=settings.SYNC_METRICS_PUSHGATEWAY,
+            help="Push per-stage metrics to this Prometheus Pushgateway (default: SYNC_METRICS_PUSHGATEWAY)",
+        )
 
     def handle(self, *args, **options):
+        self.metrics = SyncMetricsSummary()
         device_name = options.get("device")
 
         if device_name:
@@ -52,13 +86,19 @@ class Command(BaseCommand):
             service = SyncService(site=device.site)
             self.stdout.write(self.style.NOTICE(f"Starting sync for device: {device.name} ({device.site})"))
             include_config = options.get("with_config", False)
-            result = service.sync_device(device, include_config=include_config)
+            result = service.sync_device(
+                device,
+                include_config=include_config,
+                force=options.get("force", False),
+            )
+            self.metrics.add(device.name, result)
             if result.get("skipped"):
                 self.stdout.write(self.style.WARNING(f"[SKIP] {device.name}: {result.get('error')}"))
             elif result.get("success"):
                 self.stdout.write(self.style.SUCCESS(f"[OK] {device.name}"))
             else:
                 self.stdout.write(self.style.ERROR(f"[FAIL] {device.name}: {result.get('error')}"))
+            self._report_metrics(options)
             return
 
         site = self._resolve_site(options)
@@ -72,19 +112,81 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.NOTICE(f"Starting sync for site: {site} ({qs.count()} devices)"))
 
-        success = 0
-        failed = 0
-        skipped = 0
         include_config = options.get("with_config", False)
+        force = options.get("force", False)
         devices = list(qs)
         threads = options.get("threads") or 1
         if threads < 1:
             threads = 1
 
+        async_sessions = options.get("async_sessions") or 0
+        if async_sessions > 0 and devices:
+            success, failed, skipped = self._sync_async(
+                devices,
+                sessions=async_sessions,
+                apply_workers=threads,
+                include_config=include_config,
+                force=force,
+            )
+        else:
+            success, failed, skipped = self._sync_threaded(
+                devices,
+                threads=threads,
+                include_config=include_config,
+                force=force,
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Sync finished at "
+                f"{timezone.now():%Y-%m-%d %H:%M}. "
+                f"Success: {success}, Failed: {failed}, Skipped: {skipped}"
+            )
+        )
+        self._report_metrics(options)
+
+    # -------------------------------------------------
+    # Helpers
+    # -------------------------------------------------
+    def _report_metrics(self, options):
+        top = options.get("top") or 0
+        if top > 0 and self.metrics.devices:
+            self.stdout.write(self.style.NOTICE("Slowest devices (collect + parse + write):"))
+            for name, entry in self.metrics.slowest_devices(top):
+                stages = entry["stages"]
+                breakdown = ", ".join(
+                    f"{stage} {stages[stage]['seconds']:.2f}s"
+                    for stage in SyncMetricsSummary.TOTAL_STAGES
+                    if stage in stages
+                )
+                self.stdout.write(f"  {name:<40} {entry['seconds']:>8.2f}s  ({breakdown})")
+            self.stdout.write(self.style.NOTICE("Slowest stages (summed over devices):"))
+            for name, total in self.metrics.slowest_stages(top * 2):
+                self.stdout.write(
+                    f"  {name:<40} {total['seconds']:>8.2f}s  {total['queries']:>7} queries  "
+                    f"{total['devices']:>5} devices"
+                )
+        metrics_json = options.get("metrics_json")
+        if metrics_json:
+            self.metrics.write_json(metrics_json)
+            self.stdout.write(self.style.SUCCESS(f"Sync metrics written to {metrics_json}"))
+        gateway = options.get("pushgateway")
+        if gateway and self.metrics.devices:
+            try:
+                if self.metrics.push_to_prometheus(gateway):
+                    self.stdout.write(self.style.SUCCESS(f"Sync metrics pushed to {gateway}"))
+            except Exception as exc:
+                self.stdout.write(self.style.WARNING(f"Sync metrics push failed: {exc}"))
+
+    def _sync_threaded(self, devices, *, threads, include_config, force):
+        success = failed = skipped = 0
+        if not devices:
+            return success, failed, skipped
         if threads == 1 or len(devices) <= 1:
-            service = SyncService(site=site)
+            service = SyncService(site=devices[0].site)
             for device in devices:
-                result = service.sync_device(device, include_config=include_config)
+                result = service.sync_device(device, include_config=include_config, force=force)
+                self.metrics.add(device.name, result)
                 if result.get("skipped"):
                     skipped += 1
                     self.stdout.write(self.style.WARNING(f"[SKIP] {device.name}: {result.get('error')}"))
@@ -99,7 +201,11 @@ class Command(BaseCommand):
                 close_old_connections()
                 try:
                     service = SyncService(site=target_device.site)
-                    return service.sync_device(target_device, include_config=include_config)
+                    return service.sync_device(
+                        target_device,
+                        include_config=include_config,
+                        force=force,
+                    )
                 finally:
                     close_old_connections()
 
@@ -115,6 +221,7 @@ class Command(BaseCommand):
                         failed += 1
                         self.stdout.write(self.style.ERROR(f"[FAIL] {device.name}: {exc}"))
                         continue
+                    self.metrics.add(device.name, result)
                     if result.get("skipped"):
                         skipped += 1
                         self.stdout.write(self.style.WARNING(f"[SKIP] {device.name}: {result.get('error')}"))
@@ -124,18 +231,88 @@ class Command(BaseCommand):
                     else:
                         failed += 1
                         self.stdout.write(self.style.ERROR(f"[FAIL] {device.name}: {result.get('error')}"))
+        return success, failed, skipped
+
+    def _sync_async(self, devices, *, sessions, apply_workers, include_config, force):
+        success = failed = skipped = 0
+        service = SyncService(site=devices[0].site)
+        excluded = set(
+            Device.objects.filter(
+                id__in=[device.id for device in devices],
+                tags__name__iexact=SYNC_EXCLUDE_TAG,
+            ).values_list("id", flat=True)
+        )
+        by_id = {}
+        requests = []
+        netmiko_devices = []
+        for device in devices:
+            if device.id in excluded:
+                skipped += 1
+                self.stdout.write(
+                    self.style.WARNING(f"[SKIP] {device.name}: Device has tag '{SYNC_EXCLUDE_TAG}'.")
+                )
+                continue
+            try:
+                params = ConnectionService.build_ssh_params(device)
+            except Exception as exc:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"[FAIL] {device.name}: {exc}"))
+                continue
+            if not AsyncSSHSession.supports(params):
+                netmiko_devices.append(device)
+                continue
+            by_id[device.id] = device
+            requests.append(
+                CollectionRequest(
+                    key=device.id,
+                    params=params,
+                    plan=service.build_collection_plan(device, include_config=include_config),
+                )
+            )
+
+        def _apply_worker(collected):
+            close_old_connections()
+            try:
+                return service.apply_collected(
+                    by_id[collected.key],
+                    collected.results,
+                    error=collected.error,
+                    include_config=include_config,
+                    force=force,
+                )
+            finally:
+                close_old_connections()
 
         self.stdout.write(
-            self.style.SUCCESS(
-                "Sync finished at "
-                f"{timezone.now():%Y-%m-%d %H:%M}. "
-                f"Success: {success}, Failed: {failed}, Skipped: {skipped}"
+            self.style.NOTICE(
+                f"Using up to {sessions} async SSH sessions and {apply_workers} apply threads"
             )
         )
+        engine = AsyncCollectionEngine(max_sessions=sessions, apply_workers=apply_workers)
+        for collected in engine.run(requests, _apply_worker):
+            device = by_id[collected.key]
+            result = collected.applied or {"success": False, "error": collected.error}
+            self.metrics.add(device.name, result)
+            if result.get("success"):
+                success += 1
+                self.stdout.write(self.style.SUCCESS(f"[OK] {device.name}"))
+            else:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"[FAIL] {device.name}: {result.get('error')}"))
+
+        if netmiko_devices:
+            # platforms asyncssh can't drive (EOS, ASA, APIC, autodetect) keep the Netmiko path
+            netmiko_success, netmiko_failed, netmiko_skipped = self._sync_threaded(
+                netmiko_devices,
+                threads=apply_workers,
+                include_config=include_config,
+                force=force,
+            )
+            success += netmiko_success
+            failed += netmiko_failed
+            skipped += netmiko_skipped
+        return success, failed, skipped
 
-    # -------------------------------------------------
-    # Helpers
-    # -------------------------------------------------
     def _resolve_site(self, options):
         site_id = options.get("site_id")
         site_name = options.get("site")
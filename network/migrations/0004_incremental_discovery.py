@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-17 07:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("network", "0003_discovery_scan_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="discoverycandidate",
+            name="missed_probes",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="discoverycandidate",
+            name="next_probe",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="discoveryrange",
+            name="last_full_scan",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="discoveryscanjob",
+            name="incremental",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="discoveryscanjob",
+            name="skipped_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
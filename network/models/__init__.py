@@ -1,3 +1,5 @@
+from network import lookups  # noqa: F401  registers ip_address__net_contained_or_equal
+
 from .discovery import (
     AutoAssignJob,
     AutoAssignJobItem,
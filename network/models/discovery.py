@@ -27,6 +27,9 @@ class DiscoveryRange(models.Model):
     )
     scan_port = models.PositiveIntegerField(default=22)
 
+    # incremental discovery: when every host of the range was last probed
+    last_full_scan = models.DateTimeField(null=True, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -92,6 +95,11 @@ class DiscoveryCandidate(models.Model):
 
     last_seen = models.DateTimeField()
 
+    # incremental discovery: consecutive probes without an answer, next probe
+    # of a dead address (None = probe on every scan)
+    missed_probes = models.PositiveIntegerField(default=0)
+    next_probe = models.DateTimeField(null=True, blank=True)
+
     classified = models.BooleanField(default=False)
     accepted = models.BooleanField(null=True)  # None = not reviewed
 
@@ -226,12 +234,14 @@ class DiscoveryScanJob(models.Model):
     )
     scan_port = models.PositiveIntegerField(default=22)
     scan_params = models.JSONField(default=dict, blank=True)
+    incremental = models.BooleanField(default=False)
     total_ranges = models.PositiveIntegerField(default=0)
     processed_ranges = models.PositiveIntegerField(default=0)
     alive_count = models.PositiveIntegerField(default=0)
     exact_count = models.PositiveIntegerField(default=0)
     mismatch_count = models.PositiveIntegerField(default=0)
     new_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
     status = models.CharField(
         max_length=16,
         choices=Status.choices,
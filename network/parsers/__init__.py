@@ -0,0 +1,7 @@
+from .textfsm_registry import ACI_PLATFORM, TextFSMTemplateRegistry, template_registry
+
+__all__ = [
+    "ACI_PLATFORM",
+    "TextFSMTemplateRegistry",
+    "template_registry",
+]
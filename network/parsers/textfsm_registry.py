@@ -0,0 +1,142 @@
+import copy
+import logging
+import threading
+from pathlib import Path
+
+import textfsm
+
+from dcim.choices import DevicePlatformChoices
+from network.choices import CliCommandsChoices as cli
+
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "textfsm"
+
+# ACI leaf/spine switches report NX-OS as platform but need their own templates
+# for a few commands; everything else falls back to the NX-OS templates.
+ACI_PLATFORM = "aci"
+
+IOS_TEMPLATES = {
+    cli.VERSION_CMD: "cisco_ios_show_version.textfsm",
+    cli.INVENTORY_CMD: "cisco_ios_show_inventory.textfsm",
+    cli.IF_STATUS_CMD: "cisco_ios_show_interface_status.textfsm",
+    cli.IF_DESC_CMD: "cisco_ios_show_interface_description.textfsm",
+    cli.IF_IP_BRIEF_CMD: "cisco_ios_show_ip_interface_brief.textfsm",
+    cli.PORTCHANNEL_SUMMARY_ISO_CMD: "cisco_ios_show_etherchannel_summary.textfsm",
+}
+
+NXOS_TEMPLATES = {
+    cli.VERSION_CMD: "cisco_nxos_show_version.textfsm",
+    cli.INVENTORY_CMD: "cisco_nxos_show_inventory.textfsm",
+    cli.IF_STATUS_CMD: "cisco_nxos_show_interface_status.textfsm",
+    cli.IF_DESC_CMD: "cisco_nxos_show_interface_description.textfsm",
+    cli.IF_IP_BRIEF_CMD: "cisco_nxos_show_ip_interface_brief.textfsm",
+    cli.PORTCHANNEL_SUMMARY_NXOS_CMD: "cisco_nxos_show_port-channel_summary.textfsm",
+    cli.IF_TRANSCEIVER_CMD: "cisco_nxos_show_interface_transceiver.textfsm",
+}
+
+ACI_TEMPLATES = {
+    cli.VERSION_CMD: "cisco_nxos_aci_show_version.textfsm",
+    cli.IF_STATUS_CMD: "cisco_aci_show_interface_status.textfsm",
+    cli.IF_IP_BRIEF_CMD: "cisco_aci_show_ip_interface_brief.textfsm",
+}
+
+PLATFORM_FALLBACKS = {
+    ACI_PLATFORM: DevicePlatformChoices.NX_OS,
+}
+
+
+class TextFSMTemplateRegistry:
+    """
+    Process-wide cache of compiled TextFSM templates.
+
+    Templates are compiled once (lazily or via ``prewarm``) and every parse
+    runs on a lightweight clone, so the cache is safe to share between threads.
+    """
+
+    def __init__(self, template_dir: Path = TEMPLATE_DIR):
+        self.template_dir = Path(template_dir)
+        self._templates: dict[tuple[str, str], str] = {}
+        self._compiled: dict[str, textfsm.TextFSM] = {}
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------
+    # Lookup
+    # -------------------------------------------------
+    def register(self, platform: str, templates: dict[str, str]) -> None:
+        for command, template_name in templates.items():
+            self._templates[(platform, command)] = template_name
+
+    def template_for(self, platform: str | None, command: str) -> str | None:
+        while platform:
+            template_name = self._templates.get((platform, command))
+            if template_name:
+                return template_name
+            platform = PLATFORM_FALLBACKS.get(platform)
+        return None
+
+    # -------------------------------------------------
+    # Compilation
+    # -------------------------------------------------
+    def get(self, template_name: str) -> textfsm.TextFSM:
+        """Return a fresh FSM for ``template_name`` backed by the cached compile."""
+        compiled = self._compiled.get(template_name)
+        if compiled is None:
+            with self._lock:
+                compiled = self._compiled.get(template_name)
+                if compiled is None:
+                    compiled = self._compile(template_name)
+                    self._compiled[template_name] = compiled
+        return self._clone(compiled)
+
+    def prewarm(self) -> int:
+        """Compile every registered template; returns the number compiled."""
+        for template_name in set(self._templates.values()):
+            try:
+                self.get(template_name)
+            except Exception as exc:
+                logger.warning("TextFSM template %s failed to compile: %s", template_name, exc)
+        return len(self._compiled)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._compiled.clear()
+
+    def _compile(self, template_name: str) -> textfsm.TextFSM:
+        with open(self.template_dir / template_name, "r", encoding="utf-8") as handle:
+            return textfsm.TextFSM(handle)
+
+    @staticmethod
+    def _clone(compiled: textfsm.TextFSM) -> textfsm.TextFSM:
+        # States and rules are immutable once compiled and can be shared; only
+        # the values (and their options) carry per-parse state.
+        fsm = copy.copy(compiled)
+        fsm.values = copy.deepcopy(compiled.values, {id(compiled): fsm})
+        fsm.Reset()
+        return fsm
+
+    # -------------------------------------------------
+    # Parsing
+    # -------------------------------------------------
+    def parse(self, template_name: str, raw: str) -> list[dict] | None:
+        """Parse ``raw`` into a list of dicts with lower-cased headers."""
+        fsm = self.get(template_name)
+        rows = fsm.ParseText(raw)
+        if not rows:
+            return None
+        headers = [header.lower() for header in fsm.header]
+        return [dict(zip(headers, row)) for row in rows]
+
+    def parse_command(self, platform: str | None, command: str, raw: str) -> list[dict] | None:
+        template_name = self.template_for(platform, command)
+        if not template_name:
+            return None
+        return self.parse(template_name, raw)
+
+
+template_registry = TextFSMTemplateRegistry()
+template_registry.register(DevicePlatformChoices.IOS, IOS_TEMPLATES)
+template_registry.register(DevicePlatformChoices.IOS_XE, IOS_TEMPLATES)
+template_registry.register(DevicePlatformChoices.NX_OS, NXOS_TEMPLATES)
+template_registry.register(ACI_PLATFORM, ACI_TEMPLATES)
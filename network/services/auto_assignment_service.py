@@ -2,10 +2,7 @@ import logging
 import random
 import re
 from decimal import Decimal
-from pathlib import Path
 
-import textfsm
-from django.conf import settings
 from django.db import transaction
 
 from netmiko import ConnectHandler
@@ -26,7 +23,9 @@ from dcim.models import (
     Tag,
     Vendor,
 )
+from network.choices import CliCommandsChoices as cli
 from network.models.discovery import DiscoveryCandidate
+from network.parsers import ACI_PLATFORM, template_registry
 from network.services.sync_service import SyncService
 
 
@@ -241,37 +240,20 @@ class AutoAssignmentService:
             )
         return credential
 
+    def _parser_platform(self, device_type: str) -> str:
+        if self._is_aci:
+            return ACI_PLATFORM
+        if device_type == "cisco_nxos":
+            return DevicePlatformChoices.NX_OS
+        return DevicePlatformChoices.IOS
+
     def _parse_show_version(self, raw: str, device_type: str) -> list[dict] | None:
         if not raw:
             return None
-        if self._is_aci:
-            template_path = (
-                Path(settings.BASE_DIR)
-                / "network"
-                / "parsers"
-                / "textfsm"
-                / "cisco_nxos_aci_show_version.textfsm"
-            )
-        elif device_type == 'cisco_nxos':
-            template_path = (
-                Path(settings.BASE_DIR)
-                / "network"
-                / "parsers"
-                / "textfsm"
-            / "cisco_nxos_show_version.textfsm"
-        )
-        else:  # cisco_ios
-            template_path = (
-                Path(settings.BASE_DIR)
-                / "network"
-                / "parsers"
-                / "textfsm"
-                / "cisco_ios_show_version.textfsm"
-            )
         try:
-            with open(template_path, "r", encoding="utf-8") as handle:
-                fsm = textfsm.TextFSM(handle)
-                results = fsm.ParseText(raw)
+            return template_registry.parse_command(
+                self._parser_platform(device_type), cli.VERSION_CMD, raw
+            )
         except Exception as exc:
             logger.warning(
                 "Could not parse NX-OS show version for %s: %s",
@@ -280,29 +262,16 @@ class AutoAssignmentService:
             )
             return None
 
-        if not results:
-            return None
-        headers = [header.lower() for header in fsm.header]
-        return [dict(zip(headers, row)) for row in results]
-
     def _parse_show_inventory(self, raw: str, device_type: str) -> list[dict] | None:
         if not raw:
             return None
-        if device_type == "cisco_nxos":
-            template_name = "cisco_nxos_show_inventory.textfsm"
-        else:
-            template_name = "cisco_ios_show_inventory.textfsm"
-        template_path = (
-            Path(settings.BASE_DIR)
-            / "network"
-            / "parsers"
-            / "textfsm"
-            / template_name
+        platform = (
+            DevicePlatformChoices.NX_OS
+            if device_type == "cisco_nxos"
+            else DevicePlatformChoices.IOS
         )
         try:
-            with open(template_path, "r", encoding="utf-8") as handle:
-                fsm = textfsm.TextFSM(handle)
-                results = fsm.ParseText(raw)
+            return template_registry.parse_command(platform, cli.INVENTORY_CMD, raw)
         except Exception as exc:
             logger.warning(
                 "Could not parse show inventory for %s: %s",
@@ -311,11 +280,6 @@ class AutoAssignmentService:
             )
             return None
 
-        if not results:
-            return None
-        headers = [header.lower() for header in fsm.header]
-        return [dict(zip(headers, row)) for row in results]
-
     def _resolve_username(self, credential: SSHCredential) -> str:
         username = credential.ssh_username
         hostname = (self.candidate.hostname or "").lower()
@@ -1,5 +1,10 @@
 import ipaddress
+from collections import defaultdict
+from dataclasses import dataclass, field
 from types import SimpleNamespace
+from typing import Callable
+
+from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
 from django.db.models import Q
@@ -10,11 +15,40 @@ from network.models.discovery import (
     DiscoveryCandidate,
     DiscoveryFilter,
 )
+from network.services.discovery_progress import DiscoveryProgress
 from network.services.discovery_scanner import DiscoveryScanner
-from network.services.discovery_filtering import hostname_passes_filters
+from network.services.discovery_schedule import DiscoveryScheduleService
+from network.services.discovery_filtering import HostnameFilterMatcher
 from dcim.services.hostname_utils import normalize_hostname
 
 
+CANDIDATE_SCAN_FIELDS = [
+    "hostname",
+    "alive",
+    "reachable_ping",
+    "reachable_ssh",
+    "last_seen",
+    "missed_probes",
+    "next_probe",
+]
+
+
+@dataclass
+class _RangeScan:
+    """Scan state of one range; ``targets`` is the delta host list, None on a full sweep."""
+
+    dr: object
+    network: object
+    hosts: object
+    total: int
+    targets: list[str] | None = None
+    probed: int = 0
+    alive: int = 0
+    batch: list = field(default_factory=list)
+    replied: set[str] = field(default_factory=set)
+    finished: bool = False
+
+
 class NetworkDiscoveryService:
     """
     Nightly discovery workflow.
@@ -23,15 +57,26 @@ class NetworkDiscoveryService:
     - exact match  -> update runtime status only
     - mismatch     -> mark candidate as mismatch
     - new device   -> create discovery candidate only
+
+    With ``incremental`` set, ranges whose full sweep is not due are only
+    delta-scanned (see ``DiscoveryScheduleService``); ``skipped`` counts
+    the host probes saved. Only incremental runs back off candidates that
+    stopped answering.
     """
 
-    def __init__(self, *, site: Site):
+    def __init__(self, *, site: Site, incremental: bool = False):
         self.site = site
+        self.incremental = incremental
         self.scanner = DiscoveryScanner()
+        self.batch_size = max(1, settings.DISCOVERY_WRITE_BATCH_SIZE)
         self.now = timezone.now()
+        self.first_seen = 0
+        self.refreshed = 0
+        self.skipped = 0
         self.filters = list(
             DiscoveryFilter.objects.filter(site=self.site, enabled=True)
         )
+        self.hostname_filter = HostnameFilterMatcher(self.filters)
 
     # -------------------------------------------------
     # Public API
@@ -40,9 +85,7 @@ class NetworkDiscoveryService:
     def run(self, cidr_override: str | None = None) -> dict:
         ranges = self._get_ranges(cidr_override)
 
-        alive = 0
-        for dr in ranges:
-            alive += self._scan_range(dr)
+        alive = self.scan_ranges(ranges)
 
         updated_candidates = DiscoveryCandidate.objects.filter(
             site=self.site,
@@ -57,12 +100,13 @@ class NetworkDiscoveryService:
             "exact": exact,
             "mismatch": mismatch,
             "new": new,
+            "first_seen": self.first_seen,
+            "refreshed": self.refreshed,
+            "skipped": self.skipped,
         }
 
     def run_for_ranges(self, ranges) -> dict:
-        alive = 0
-        for dr in ranges:
-            alive += self._scan_range(dr)
+        alive = self.scan_ranges(ranges)
 
         updated_candidates = DiscoveryCandidate.objects.filter(
             site=self.site,
@@ -76,6 +120,9 @@ class NetworkDiscoveryService:
             "exact": exact,
             "mismatch": mismatch,
             "new": new,
+            "first_seen": self.first_seen,
+            "refreshed": self.refreshed,
+            "skipped": self.skipped,
         }
 
     # -------------------------------------------------
@@ -100,50 +147,185 @@ class NetworkDiscoveryService:
     # Stage 1: scan + store candidates
     # -------------------------------------------------
 
-    @transaction.atomic
-    def _scan_range(self, dr) -> int:
-        try:
-            ips = [
-                str(ip)
-                for ip in ipaddress.ip_network(dr.cidr, strict=False).hosts()
-            ]
-        except ValueError:
-            return 0
-
-        if dr.scan_method == "icmp":
-            results = self.scanner.scan_icmp(ips)
-        else:
-            results = self.scanner.scan_tcp(ips, dr.scan_port)
-
-        alive = 0
-
-        for r in results:
-            if not r.alive:
-                continue
-
-            raw_hostname = r.hostname or ""
-            normalized_hostname = normalize_hostname(raw_hostname, site=self.site)
-            if not (
-                hostname_passes_filters(raw_hostname, self.filters)
-                or hostname_passes_filters(normalized_hostname, self.filters)
-            ):
+    def scan_ranges(
+        self,
+        ranges,
+        *,
+        on_batch: Callable[[int], None] | None = None,
+        on_range: Callable[[object], None] | None = None,
+        progress: DiscoveryProgress | None = None,
+    ) -> int:
+        """
+        Stream ``ranges`` concurrently and return the number of alive hosts.
+
+        TCP ranges share one connect stream and its ``DISCOVERY_TCP_CONCURRENCY``
+        budget, ``DISCOVERY_RANGE_CONCURRENCY`` ranges at a time; ICMP ranges
+        are pinged one after another. Hosts are generated lazily and the alive
+        hosts of each range are written every ``DISCOVERY_WRITE_BATCH_SIZE``
+        hosts in their own short transaction. ``on_batch`` receives the number
+        of alive hosts of each written batch, ``on_range`` every range as it
+        finishes.
+        """
+        ranges = list(ranges)
+        scans = []
+        for dr in ranges:
+            scan = self._plan_range(dr)
+            if scan is None:
+                if on_range:
+                    on_range(dr)
                 continue
+            scans.append(scan)
+        if progress:
+            progress.start(
+                ranges=len(ranges),
+                hosts=sum(scan.total for scan in scans),
+                done=len(ranges) - len(scans),
+            )
 
-            alive += 1
+        tcp = [scan for scan in scans if scan.dr.scan_method != "icmp"]
+        if tcp:
+            for scan, r in self.scanner.stream_tcp_ranges((scan, scan.hosts, scan.dr.scan_port) for scan in tcp):
+                self._consume(scan, r, on_batch, progress)
+                if scan.probed >= scan.total:
+                    self._finish_range(scan, on_batch, on_range, progress)
+        for scan in scans:
+            if scan.dr.scan_method == "icmp":
+                for r in self.scanner.stream_icmp(scan.hosts):
+                    self._consume(scan, r, on_batch, progress)
+            if not scan.finished:
+                self._finish_range(scan, on_batch, on_range, progress)
+
+        return sum(scan.alive for scan in scans)
+
+    def _scan_range(self, dr, *, on_batch: Callable[[int], None] | None = None) -> int:
+        return self.scan_ranges([dr], on_batch=on_batch)
+
+    def _plan_range(self, dr) -> _RangeScan | None:
+        try:
+            network = ipaddress.ip_network(dr.cidr, strict=False)
+        except ValueError:
+            return None
+
+        host_count = DiscoveryScheduleService.host_count(network)
+        if not self.incremental or DiscoveryScheduleService.full_sweep_due(dr, self.now):
+            return _RangeScan(dr, network, hosts=(str(ip) for ip in network.hosts()), total=host_count)
+
+        targets = DiscoveryScheduleService.delta_targets(self.site, network, self.now)
+        self.skipped += host_count - len(targets)
+        return _RangeScan(dr, network, hosts=iter(targets), total=len(targets), targets=targets)
+
+    def _consume(self, scan: _RangeScan, r, on_batch, progress) -> None:
+        scan.probed += 1
+        if progress:
+            progress.probed()
+        if not r.alive:
+            return
+        scan.replied.add(r.ip)
+
+        raw_hostname = r.hostname or ""
+        normalized_hostname = normalize_hostname(raw_hostname, site=self.site)
+        if not (
+            self.hostname_filter.passes(raw_hostname)
+            or (normalized_hostname != raw_hostname and self.hostname_filter.passes(normalized_hostname))
+        ):
+            return
+
+        scan.batch.append((r, normalized_hostname))
+        if len(scan.batch) >= self.batch_size:
+            self._flush_candidates(scan, on_batch, progress)
+
+    def _finish_range(self, scan: _RangeScan, on_batch, on_range, progress) -> None:
+        if scan.batch:
+            self._flush_candidates(scan, on_batch, progress)
+        if self.incremental:
+            # manual scans don't back off hosts; only scheduled sweeps and delta scans do
+            self._record_misses(scan)
+        if scan.targets is None and isinstance(scan.dr, DiscoveryRange):
+            DiscoveryRange.objects.filter(pk=scan.dr.pk).update(last_full_scan=self.now)
+        scan.finished = True
+        if on_range:
+            on_range(scan.dr)
+        if progress:
+            progress.range_done()
+
+    def _flush_candidates(self, scan: _RangeScan, on_batch, progress) -> None:
+        stored = self._store_candidates(scan.batch)
+        scan.batch = []
+        scan.alive += stored
+        if progress:
+            progress.found(stored)
+        if on_batch:
+            on_batch(stored)
 
-            DiscoveryCandidate.objects.update_or_create(
+    @transaction.atomic
+    def _store_candidates(self, batch) -> int:
+        candidates = {
+            r.ip: DiscoveryCandidate(
                 site=self.site,
                 ip_address=r.ip,
-                defaults={
-                    "hostname": normalized_hostname,
-                    "alive": True,
-                    "reachable_ping": r.method == "icmp",
-                    "reachable_ssh": r.method == "tcp",
-                    "last_seen": self.now,
-                },
+                hostname=normalized_hostname,
+                alive=True,
+                reachable_ping=r.method == "icmp",
+                reachable_ssh=r.method == "tcp",
+                last_seen=self.now,
+                missed_probes=0,
+                next_probe=None,
+            )
+            for r, normalized_hostname in batch
+        }
+        first_seen, refreshed = self._upsert_candidates(list(candidates.values()))
+        self.first_seen += first_seen
+        self.refreshed += refreshed
+        return len(candidates)
+
+    def _upsert_candidates(self, candidates: list[DiscoveryCandidate]) -> tuple[int, int]:
+        """
+        Insert or refresh candidates on the (site, ip_address) unique key in
+        one statement per ``DISCOVERY_WRITE_BATCH_SIZE`` rows. Review state
+        (``classified`` / ``accepted``) of known hosts is left alone. Returns
+        ``(first_seen, refreshed)``.
+        """
+        known = set(
+            DiscoveryCandidate.objects.filter(
+                site=self.site,
+                ip_address__in=[c.ip_address for c in candidates],
+            ).values_list("ip_address", flat=True)
+        )
+        DiscoveryCandidate.objects.bulk_create(
+            candidates,
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=["site", "ip_address"],
+            update_fields=CANDIDATE_SCAN_FIELDS,
+        )
+        refreshed = sum(1 for c in candidates if c.ip_address in known)
+        return len(candidates) - refreshed, refreshed
+
+    def _record_misses(self, scan: _RangeScan) -> None:
+        """
+        Back off the known candidates of the range that were probed (all of
+        them on a full sweep) but did not answer: one UPDATE per miss count.
+        Hosts that answered but were dropped by a hostname filter are no misses.
+        """
+        candidates = DiscoveryCandidate.objects.filter(site=self.site, last_seen__lt=self.now)
+        if scan.targets is not None:
+            if not scan.targets:
+                return
+            candidates = candidates.filter(ip_address__in=scan.targets)
+        else:
+            candidates = candidates.filter(ip_address__net_contained_or_equal=str(scan.network))
+
+        missed = defaultdict(list)
+        for pk, ip, missed_probes in candidates.values_list("pk", "ip_address", "missed_probes"):
+            if ip not in scan.replied:
+                missed[missed_probes + 1].append(pk)
+
+        for missed_probes, pks in missed.items():
+            DiscoveryCandidate.objects.filter(pk__in=pks).update(
+                alive=False,
+                missed_probes=missed_probes,
+                next_probe=self.now + DiscoveryScheduleService.dead_interval(missed_probes),
             )
-
-        return alive
 
     # -------------------------------------------------
     # Stage 2: classification (NO topology mutation)
@@ -151,65 +333,91 @@ class NetworkDiscoveryService:
 
     @transaction.atomic
     def _classify(self, candidates=None) -> tuple[int, int, int]:
-        exact = mismatch = new = 0
-
+        """
+        Classify candidates against the site's devices in memory: the device
+        IP and lowercase-name maps are loaded once, then every outcome is
+        written with one grouped UPDATE (plus bulk writes of the runtime
+        status of exact matches).
+        """
         if candidates is None:
             candidates = DiscoveryCandidate.objects.filter(
                 site=self.site,
                 classified=False,
             )
 
-        for c in candidates:
-            hostname = (c.hostname or "").lower()
-
-            device_by_ip = Device.objects.filter(
-                site=self.site,
-                management_ip=c.ip_address,
-            ).first()
-
-            device_by_name = Device.objects.filter(
-                site=self.site,
-                name__iexact=hostname,
-            ).first()
+        device_by_ip = {}
+        device_by_name = {}
+        for device_id, management_ip, name in Device.objects.filter(site=self.site).values_list(
+            "id", "management_ip", "name"
+        ):
+            if management_ip:
+                device_by_ip.setdefault(management_ip, device_id)
+            device_by_name.setdefault((name or "").lower(), device_id)
+
+        exact, mismatch, new = [], [], []
+        matches = {}
+        for c in candidates.only("id", "ip_address", "hostname", "reachable_ping", "reachable_ssh", "last_seen"):
+            by_ip = device_by_ip.get(c.ip_address)
+            by_name = device_by_name.get((c.hostname or "").lower())
 
             # -------------------------------
             # Case A: exact match
             # -------------------------------
-            if device_by_ip and device_by_name and device_by_ip.id == device_by_name.id:
-                self._update_runtime_status(device_by_ip, c)
-                c.classified = True
-                c.accepted = True
-                c.save(update_fields=["classified", "accepted"])
-                exact += 1
-                continue
+            if by_ip and by_ip == by_name:
+                exact.append(c.pk)
+                matches.setdefault(by_ip, []).append(c)
 
             # -------------------------------
             # Case B: mismatch
             # -------------------------------
-            if device_by_ip or device_by_name:
-                c.classified = True
-                c.accepted = False  # mismatch
-                c.save(update_fields=["classified", "accepted"])
-                mismatch += 1
-                continue
+            elif by_ip or by_name:
+                mismatch.append(c.pk)
 
             # -------------------------------
-            # Case C: new device
+            # Case C: new device (unclassified until manual/auto assignment)
             # -------------------------------
-            c.classified = False  # keep as unclassified until manual/auto assignment
-            c.accepted = None  # pending review
-            c.save(update_fields=["classified", "accepted"])
-            new += 1
+            else:
+                new.append(c.pk)
+
+        for pks, classified, accepted in (
+            (exact, True, True),
+            (mismatch, True, False),
+            (new, False, None),
+        ):
+            if pks:
+                DiscoveryCandidate.objects.filter(pk__in=pks).update(classified=classified, accepted=accepted)
+        self._update_runtime_statuses(matches)
 
-        return exact, mismatch, new
+        return len(exact), len(mismatch), len(new)
 
     # -------------------------------------------------
     # Helpers
     # -------------------------------------------------
 
-    def _update_runtime_status(self, device: Device, candidate: DiscoveryCandidate):
-        status, _ = DeviceRuntimeStatus.objects.get_or_create(device=device)
-        status.reachable_ping |= candidate.reachable_ping
-        status.reachable_ssh |= candidate.reachable_ssh
-        status.last_check = candidate.last_seen
-        status.save()
+    def _update_runtime_statuses(self, matches: dict) -> None:
+        """OR the discovered reachability into the runtime status of each matched device."""
+        if not matches:
+            return
+        runtimes = {
+            runtime.device_id: runtime
+            for runtime in DeviceRuntimeStatus.objects.filter(device_id__in=matches)
+        }
+        created = []
+        for device_id, found in matches.items():
+            runtime = runtimes.get(device_id)
+            if runtime is None:
+                runtime = DeviceRuntimeStatus(device_id=device_id)
+                created.append(runtime)
+            for c in found:
+                runtime.reachable_ping |= c.reachable_ping
+                runtime.reachable_ssh |= c.reachable_ssh
+                runtime.last_check = c.last_seen
+            runtime.updated_at = self.now
+
+        if created:
+            DeviceRuntimeStatus.objects.bulk_create(created, ignore_conflicts=True)
+        if runtimes:
+            DeviceRuntimeStatus.objects.bulk_update(
+                list(runtimes.values()),
+                ["reachable_ping", "reachable_ssh", "last_check", "updated_at"],
+            )
@@ -1,3 +1,6 @@
+import re
+
+
 def _split_terms(value: str) -> list[str]:
     return [
         term.strip().lower()
@@ -35,3 +38,90 @@ def hostname_passes_filters(hostname: str, filters) -> bool:
     if not (hostname or "").strip():
         return False
     return any(hostname_matches_filter(hostname, flt) for flt in filters)
+
+
+def _trie_pattern(terms) -> str:
+    """
+    Regex matching the longest of ``terms`` at a position: the terms are
+    merged into a prefix trie, so each position is tested against the set of
+    first characters only once, and the greedy optional group after a term
+    that is a prefix of longer ones tries the longer ones first.
+    """
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def pattern(node: dict) -> str:
+        branches = [re.escape(char) + pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return pattern(trie)
+
+
+class HostnameFilterMatcher:
+    """
+    ``hostname_passes_filters`` for a fixed filter set, compiled once.
+
+    Every term of every filter goes into one trie-shaped regex: a lookahead
+    finds the longest term starting at each position of the hostname, and
+    each term stands for all terms it contains, so one scan yields the full
+    set of terms present. Filters are then checked as
+    bitmasks, with the verdict cached per set of present terms.
+    """
+
+    CACHE_SIZE = 4096
+
+    def __init__(self, filters):
+        filters = list(filters or [])
+        self.enabled = bool(filters)
+        terms: dict[str, int] = {}
+
+        def mask(value: str) -> int:
+            bits = 0
+            for term in _split_terms(value):
+                bits |= 1 << terms.setdefault(term, len(terms))
+            return bits
+
+        # (forbidden, required); required None = no positive terms
+        self._rules = [
+            (
+                mask(flt.hostname_not_contains) if flt.hostname_not_contains else 0,
+                mask(flt.hostname_contains) if flt.hostname_contains else None,
+            )
+            for flt in filters
+        ]
+        self._implied = {
+            term: sum(1 << bit for other, bit in terms.items() if other in term)
+            for term in terms
+        }
+        self._pattern = re.compile(f"(?=({_trie_pattern(terms)}))") if terms else None
+        self._verdicts: dict[int, bool] = {}
+
+    def passes(self, hostname: str) -> bool:
+        if not self.enabled:
+            return True
+        if not (hostname or "").strip():
+            return False
+
+        present = 0
+        if self._pattern is not None:
+            implied = self._implied
+            for match in self._pattern.finditer(hostname.lower()):
+                present |= implied[match.group(1)]
+
+        verdict = self._verdicts.get(present)
+        if verdict is None:
+            verdict = any(
+                not present & forbidden and (required is None or present & required)
+                for forbidden, required in self._rules
+            )
+            if len(self._verdicts) >= self.CACHE_SIZE:
+                self._verdicts.clear()
+            self._verdicts[present] = verdict
+        return verdict
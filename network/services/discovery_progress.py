@@ -0,0 +1,108 @@
+import logging
+import time
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def discovery_scan_group(job_id) -> str:
+    return f"discovery_scan_{job_id}"
+
+
+class DiscoveryProgress:
+    """
+    Live progress of a discovery scan job, pushed as ``discovery.progress``
+    events to the job's channel layer group: hosts probed and alive, ranges
+    done and an ETA. Events are throttled to one per
+    ``DISCOVERY_PROGRESS_INTERVAL`` seconds, plus one per finished range and
+    a final one. Without a working channel layer pushes are dropped; the job
+    row still records progress for polling clients.
+    """
+
+    def __init__(self, job_id, *, interval: float | None = None):
+        self.job_id = str(job_id)
+        self.group = discovery_scan_group(job_id)
+        self.interval = settings.DISCOVERY_PROGRESS_INTERVAL if interval is None else interval
+        self.ranges_total = 0
+        self.ranges_done = 0
+        self.hosts_total = 0
+        self.hosts_probed = 0
+        self.alive = 0
+        self.started = time.monotonic()
+        self._last_push = 0.0
+        self._layer = None
+        self._enabled = True
+
+    # ---------- counters ----------
+
+    def start(self, *, ranges: int, hosts: int, done: int = 0) -> None:
+        self.ranges_total = ranges
+        self.ranges_done = done
+        self.hosts_total = hosts
+        self.started = time.monotonic()
+        self.push()
+
+    def probed(self, count: int = 1) -> None:
+        self.hosts_probed += count
+        if time.monotonic() - self._last_push >= self.interval:
+            self.push()
+
+    def found(self, count: int) -> None:
+        self.alive += count
+
+    def range_done(self) -> None:
+        self.ranges_done += 1
+        self.push()
+
+    def finish(self, status: str, **fields) -> None:
+        self.push(status=status, eta_seconds=0, **fields)
+
+    def eta_seconds(self) -> int | None:
+        if not self.hosts_probed:
+            return None
+        remaining = max(0, self.hosts_total - self.hosts_probed)
+        elapsed = time.monotonic() - self.started
+        return round(elapsed / self.hosts_probed * remaining)
+
+    # ---------- channel layer ----------
+
+    def event(self, status: str = "running", **fields) -> dict:
+        return {
+            "type": "discovery.progress",
+            "job_id": self.job_id,
+            "status": status,
+            "ranges_total": self.ranges_total,
+            "ranges_done": self.ranges_done,
+            "hosts_total": self.hosts_total,
+            "hosts_probed": self.hosts_probed,
+            "alive": self.alive,
+            "eta_seconds": self.eta_seconds(),
+            **fields,
+        }
+
+    def push(self, **fields) -> None:
+        self._last_push = time.monotonic()
+        layer = self._channel_layer()
+        if layer is None:
+            return
+        try:
+            async_to_sync(layer.group_send)(self.group, self.event(**fields))
+        except Exception as exc:
+            self._disable(exc)
+
+    def _channel_layer(self):
+        if self._enabled and self._layer is None:
+            try:
+                self._layer = get_channel_layer()
+            except Exception as exc:
+                self._disable(exc)
+            else:
+                self._enabled = self._layer is not None
+        return self._layer if self._enabled else None
+
+    def _disable(self, exc: Exception) -> None:
+        logger.warning("Discovery progress push disabled for job %s: %s", self.job_id, exc)
+        self._enabled = False
@@ -1,11 +1,25 @@
+import asyncio
 import os
 import platform
 import socket
 import subprocess
 import threading
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Iterable, List, Dict
+from itertools import islice
+from queue import Full, Queue
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List
+
+from django.conf import settings
+
+from automation.engine.icmp_engine import IcmpPinger
+from automation.engine.reachability_engine import ReachabilityEngine
+from dcim.services.dns_resolver import ReverseResolver, get_resolver
+
+# File descriptors kept free for the DB connection, logging, DNS, ...
+FD_HEADROOM = 64
+_DONE = object()
 
 
 @dataclass(frozen=True)
@@ -24,12 +38,18 @@ class DiscoveryScanner:
         connect_timeout: int = 1,
         ping_count: int = 2,
         max_workers: int | None = None,
+        tcp_concurrency: int | None = None,
+        tcp_rate: int | None = None,
+        resolver: ReverseResolver | None = None,
     ):
         self.connect_timeout = connect_timeout
         self.ping_count = ping_count
         self.ping_timeout = max(1, ping_count * 2)
         self.is_windows = platform.system().lower() == "windows"
         self.max_workers = max_workers or max(8, (os.cpu_count() or 1) * 8)
+        self.tcp_concurrency = max(1, tcp_concurrency or settings.DISCOVERY_TCP_CONCURRENCY)
+        self.tcp_rate = settings.DISCOVERY_TCP_RATE if tcp_rate is None else tcp_rate
+        self.resolver = resolver or get_resolver()
 
     # ---------- low-level checks ----------
 
@@ -48,62 +68,248 @@ class DiscoveryScanner:
         except subprocess.TimeoutExpired:
             return False
 
-    def _tcp_check(self, ip: str, port: int) -> bool:
+    def _ping_batch(self, ips: List[str]) -> Dict[str, bool]:
+        """
+        Ping every IP from one in-process ICMP socket. Falls back to the
+        ``ping`` command for addresses the socket cannot handle (IPv6, or no
+        ICMP socket permission).
+        """
+        alive: Dict[str, bool] = {}
         try:
-            with socket.create_connection((ip, port), timeout=self.connect_timeout):
-                return True
+            pinger = IcmpPinger(timeout=self.connect_timeout, count=self.ping_count)
+            for ip, result in pinger.ping_many(ips).items():
+                if result.sent:
+                    alive[ip] = result.alive
         except OSError:
+            pass
+
+        remaining = [ip for ip in ips if ip not in alive]
+        if remaining:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                alive.update(zip(remaining, pool.map(self._ping, remaining)))
+        return alive
+
+    async def _tcp_connect(self, ip: str, port: int) -> bool:
+        try:
+            return await asyncio.wait_for(
+                ReachabilityEngine.async_tcp_check(ip, port),
+                self.connect_timeout,
+            )
+        except (OSError, asyncio.TimeoutError):
             return False
 
-    def _resolve_dns(self, ip: str) -> str | None:
+    async def _connect_stream(self, ips: Iterable[str], port: int) -> AsyncIterator[tuple[str, bool]]:
+        async for (_, ip, _), alive in self._connect_targets((None, ip, port) for ip in ips):
+            yield ip, alive
+
+    async def _connect_targets(
+        self, targets: Iterable[tuple[Any, str, int]]
+    ) -> AsyncIterator[tuple[tuple[Any, str, int], bool]]:
+        """
+        Yield ``((key, ip, port), alive)`` as connects complete. ``targets`` is
+        consumed lazily; at most ``tcp_concurrency`` connects are in flight
+        and, with a ``tcp_rate``, at most that many are started per second.
+        """
+        limit = self._connect_limit()
+        interval = 1 / self.tcp_rate if self.tcp_rate else 0
+        loop = asyncio.get_running_loop()
+        next_start = loop.time()
+        pending: Dict[asyncio.Task, tuple[Any, str, int]] = {}
+        remaining = iter(targets)
+        exhausted = False
+
+        while pending or not exhausted:
+            while not exhausted and len(pending) < limit:
+                target = next(remaining, None)
+                if target is None:
+                    exhausted = True
+                    break
+                _, ip, port = target
+                if interval:
+                    delay = next_start - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    next_start = max(next_start, loop.time()) + interval
+                pending[asyncio.ensure_future(self._tcp_connect(ip, port))] = target
+            if not pending:
+                break
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield pending.pop(task), task.result()
+
+    async def _connect_many(self, ips: Iterable[str], port: int) -> Dict[str, bool]:
+        return {ip: alive async for ip, alive in self._connect_stream(ips, port)}
+
+    def _connect_limit(self) -> int:
+        """Cap in-flight connects by the open-file limit, raising the soft limit when allowed."""
+        try:
+            import resource
+        except ImportError:  # Windows
+            return self.tcp_concurrency
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        wanted = self.tcp_concurrency + FD_HEADROOM
+        if soft == resource.RLIM_INFINITY or soft >= wanted:
+            return self.tcp_concurrency
+        target = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
         try:
-            return socket.getnameinfo((ip, 0), socket.NI_NAMEREQD)[0].lower()
-        except Exception:
-            return None
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+            soft = target
+        except (ValueError, OSError):
+            pass
+        return max(1, min(self.tcp_concurrency, soft - FD_HEADROOM))
+
+    def _resolve_many(self, ips: List[str]) -> Dict[str, str | None]:
+        if not ips:
+            return {}
+        return self.resolver.resolve_many_sync(ips)
 
     # ---------- public API ----------
 
     def scan_icmp(self, ips: Iterable[str]) -> List[ScanResult]:
-        results: List[ScanResult] = []
-        lock = threading.Lock()
-
-        def worker(ip: str):
-            alive = self._ping(ip)
-            hostname = self._resolve_dns(ip) if alive else None
-            with lock:
-                results.append(
-                    ScanResult(
-                        ip=ip,
-                        alive=alive,
-                        hostname=hostname,
-                        method="icmp",
-                    )
-                )
-
-        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
-            pool.map(worker, ips)
-
-        return results
+        ips = list(ips)
+        alive = self._ping_batch(ips)
+        hostnames = self._resolve_many([ip for ip in ips if alive.get(ip)])
+
+        return [
+            ScanResult(
+                ip=ip,
+                alive=bool(alive.get(ip)),
+                hostname=hostnames.get(ip),
+                method="icmp",
+            )
+            for ip in ips
+        ]
 
     def scan_tcp(self, ips: Iterable[str], port: int) -> List[ScanResult]:
-        results: List[ScanResult] = []
-        lock = threading.Lock()
-
-        def worker(ip: str):
-            alive = self._tcp_check(ip, port)
-            hostname = self._resolve_dns(ip) if alive else None
-            with lock:
-                results.append(
-                    ScanResult(
-                        ip=ip,
-                        alive=alive,
-                        hostname=hostname,
-                        method="tcp",
-                        port=port,
-                    )
-                )
-
-        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
-            pool.map(worker, ips)
-
-        return results
+        """
+        Connect-scan ``ips`` on one event loop, then reverse-resolve the alive
+        hosts as a separate stage. Results keep the order of ``ips``.
+        """
+        ips = list(ips)
+        alive = asyncio.run(self._connect_many(ips, port))
+        hostnames = self._resolve_many([ip for ip in ips if alive.get(ip)])
+
+        return [
+            ScanResult(
+                ip=ip,
+                alive=bool(alive.get(ip)),
+                hostname=hostnames.get(ip),
+                method="tcp",
+                port=port,
+            )
+            for ip in ips
+        ]
+
+    # ---------- streaming API ----------
+
+    def stream_icmp(self, ips: Iterable[str], *, chunk_size: int | None = None) -> Iterator[ScanResult]:
+        """``scan_icmp`` over ``ips`` consumed lazily, ``chunk_size`` hosts at a time."""
+        chunk_size = max(1, chunk_size or settings.DISCOVERY_ICMP_CHUNK_SIZE)
+        remaining = iter(ips)
+        while chunk := list(islice(remaining, chunk_size)):
+            yield from self.scan_icmp(chunk)
+
+    def stream_tcp(self, ips: Iterable[str], port: int) -> Iterator[ScanResult]:
+        """
+        ``scan_tcp`` as a pipeline: connects and the PTR lookups of alive hosts
+        run together on an event loop in a background thread, and results are
+        yielded as they complete (not in input order).
+        """
+        for _, result in self._stream_targets((None, ip, port) for ip in ips):
+            yield result
+
+    def stream_tcp_ranges(
+        self,
+        ranges: Iterable[tuple[Any, Iterable[str], int]],
+        *,
+        concurrency: int | None = None,
+    ) -> Iterator[tuple[Any, ScanResult]]:
+        """
+        ``stream_tcp`` over several ``(key, ips, port)`` ranges at once. Up to
+        ``concurrency`` ranges are interleaved host by host into one connect
+        stream, so they progress in parallel while sharing the single
+        ``tcp_concurrency`` budget; a finished range makes room for the next.
+        Yields ``(key, result)``.
+        """
+        concurrency = max(1, concurrency or settings.DISCOVERY_RANGE_CONCURRENCY)
+        targets = _interleave((_tagged(key, ips, port) for key, ips, port in ranges), active=concurrency)
+        return self._stream_targets(targets)
+
+    def _stream_targets(self, targets: Iterable[tuple[Any, str, int]]) -> Iterator[tuple[Any, ScanResult]]:
+        """
+        Shared pipeline of the TCP streams. The bounded hand-off queue keeps
+        memory flat whatever the number of hosts and stalls the loop while
+        the consumer is busy.
+        """
+        connected: Queue = Queue(maxsize=self.tcp_concurrency)
+        stop = threading.Event()
+        errors: list = []
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    connected.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    continue
+            return False
+
+        async def resolve(key, ip: str, port: int) -> tuple[Any, ScanResult]:
+            hostname = await self.resolver.resolve(ip)
+            return key, ScanResult(ip=ip, alive=True, hostname=hostname, method="tcp", port=port)
+
+        async def scan_all():
+            lookups = set()
+            async for (key, ip, port), alive in self._connect_targets(targets):
+                if alive:
+                    lookups.add(asyncio.ensure_future(resolve(key, ip, port)))
+                elif not put((key, ScanResult(ip=ip, alive=False, method="tcp", port=port))):
+                    return
+                done = {task for task in lookups if task.done()}
+                lookups -= done
+                for task in done:
+                    if not put(task.result()):
+                        return
+            for lookup in asyncio.as_completed(lookups):
+                if not put(await lookup):
+                    return
+
+        def produce():
+            try:
+                asyncio.run(scan_all())
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                put(_DONE)
+
+        producer = threading.Thread(target=produce, name="discovery-connect", daemon=True)
+        producer.start()
+        try:
+            while (item := connected.get()) is not _DONE:
+                yield item
+            if errors:
+                raise errors[0]
+        finally:
+            stop.set()
+            producer.join()
+
+
+def _tagged(key, ips: Iterable[str], port: int) -> Iterator[tuple[Any, str, int]]:
+    for ip in ips:
+        yield key, ip, port
+
+
+def _interleave(iterables: Iterable[Iterable], *, active: int) -> Iterator:
+    """Round-robin over at most ``active`` of ``iterables`` at a time, starting the next as one runs out."""
+    waiting = iter(iterables)
+    running = deque(iter(it) for it in islice(waiting, active))
+    while running:
+        it = running.popleft()
+        item = next(it, _DONE)
+        if item is _DONE:
+            following = next(waiting, None)
+            if following is not None:
+                running.appendleft(iter(following))
+            continue
+        yield item
+        running.append(it)
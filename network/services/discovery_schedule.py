@@ -0,0 +1,73 @@
+import ipaddress
+from datetime import datetime, timedelta
+
+from django.conf import settings
+
+from dcim.choices import DeviceStatusChoices
+from dcim.models import Device, Site
+from network.models.discovery import DiscoveryCandidate, DiscoveryRange
+
+
+class DiscoveryScheduleService:
+    """
+    Incremental ("delta") discovery planning.
+
+    Between full sweeps, which run once per ``DISCOVERY_FULL_SWEEP_HOURS``
+    per range, an incremental scan only probes known candidates that are
+    due. Addresses of active devices checked within
+    ``DISCOVERY_DEVICE_FRESH_MINUTES`` are skipped. A candidate that stops
+    answering is re-probed after ``DISCOVERY_DEAD_BACKOFF_HOURS``, and the
+    interval doubles with every further miss up to the full sweep
+    interval. Addresses that never answered wait for the next full sweep.
+    """
+
+    @staticmethod
+    def full_sweep_interval() -> timedelta:
+        return timedelta(hours=settings.DISCOVERY_FULL_SWEEP_HOURS)
+
+    @staticmethod
+    def full_sweep_due(dr, now: datetime) -> bool:
+        if not isinstance(dr, DiscoveryRange) or dr.last_full_scan is None:
+            return True
+        return dr.last_full_scan <= now - DiscoveryScheduleService.full_sweep_interval()
+
+    @staticmethod
+    def dead_interval(missed_probes: int) -> timedelta:
+        cap = DiscoveryScheduleService.full_sweep_interval()
+        interval = timedelta(hours=settings.DISCOVERY_DEAD_BACKOFF_HOURS)
+        for _ in range(max(0, missed_probes - 1)):
+            interval *= 2
+            if interval >= cap:
+                return cap
+        return min(interval, cap)
+
+    @staticmethod
+    def fresh_device_ips(site: Site, now: datetime) -> set[str]:
+        fresh = now - timedelta(minutes=settings.DISCOVERY_DEVICE_FRESH_MINUTES)
+        return set(
+            Device.objects.filter(
+                site=site,
+                status=DeviceStatusChoices.STATUS_ACTIVE,
+                management_ip__isnull=False,
+                runtime__last_check__gte=fresh,
+            ).values_list("management_ip", flat=True)
+        )
+
+    @staticmethod
+    def delta_targets(site: Site, network, now: datetime) -> list[str]:
+        """Candidate IPs of ``network`` due for a probe, minus freshly checked devices."""
+        skip = DiscoveryScheduleService.fresh_device_ips(site, now)
+        due = DiscoveryCandidate.objects.filter(site=site).exclude(next_probe__gt=now)
+        targets = [
+            ip
+            for ip in due.values_list("ip_address", flat=True)
+            if ip not in skip and ipaddress.ip_address(ip) in network
+        ]
+        return sorted(targets, key=ipaddress.ip_address)
+
+    @staticmethod
+    def host_count(network) -> int:
+        """Number of addresses ``network.hosts()`` yields, without iterating it."""
+        if network.num_addresses <= 2:
+            return network.num_addresses
+        return network.num_addresses - (2 if network.version == 4 else 1)
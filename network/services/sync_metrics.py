@@ -0,0 +1,144 @@
+import json
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.db import connection
+
+try:
+    from prometheus_client import CollectorRegistry, Gauge, push_to_gateway
+except ImportError:  # pragma: no cover - optional dependency
+    CollectorRegistry = Gauge = push_to_gateway = None  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+
+class SyncStageTimer:
+    """
+    Wall time and query count per named sync stage.
+
+    Stages may nest (``write`` wraps every ``apply:*`` stage) and repeat
+    (retries add up), so totals are not meant to be summed across stages.
+    """
+
+    def __init__(self):
+        self.stages: dict[str, dict] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        entry = self.stages.setdefault(name, {"seconds": 0.0, "queries": 0})
+
+        def _count(execute, sql, params, many, context):
+            entry["queries"] += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(_count):
+                yield entry
+        finally:
+            entry["seconds"] += time.perf_counter() - started
+
+    def seconds(self, name: str) -> float:
+        return self.stages.get(name, {}).get("seconds", 0.0)
+
+    def as_dict(self) -> dict:
+        return {
+            name: {"seconds": round(entry["seconds"], 6), "queries": entry["queries"]}
+            for name, entry in self.stages.items()
+        }
+
+
+class SyncMetricsSummary:
+    """Aggregate ``sync_device`` payloads into per-device and per-stage totals."""
+
+    TOTAL_STAGES = ("collect", "parse", "write")
+
+    def __init__(self):
+        self.devices: dict[str, dict] = {}
+        self.stage_totals = defaultdict(lambda: {"seconds": 0.0, "queries": 0, "devices": 0})
+
+    def add(self, device_name: str, payload: dict) -> None:
+        stages = payload.get("stages") or {}
+        if not stages:
+            return
+        self.devices[device_name] = {
+            "seconds": sum(stages.get(name, {}).get("seconds", 0.0) for name in self.TOTAL_STAGES),
+            "stages": stages,
+        }
+        for name, entry in stages.items():
+            total = self.stage_totals[name]
+            total["seconds"] += entry["seconds"]
+            total["queries"] += entry["queries"]
+            total["devices"] += 1
+
+    def add_stage_totals(self, stages: dict) -> None:
+        """Merge ``as_dict()["stages"]`` of another summary (e.g. a sync chunk)."""
+        for name, entry in (stages or {}).items():
+            total = self.stage_totals[name]
+            total["seconds"] += entry["seconds"]
+            total["queries"] += entry["queries"]
+            total["devices"] += entry["devices"]
+
+    def slowest_devices(self, limit: int = 5) -> list[tuple[str, dict]]:
+        return sorted(self.devices.items(), key=lambda item: item[1]["seconds"], reverse=True)[:limit]
+
+    def slowest_stages(self, limit: int = 10) -> list[tuple[str, dict]]:
+        return sorted(
+            (
+                (name, total)
+                for name, total in self.stage_totals.items()
+                if name not in self.TOTAL_STAGES
+            ),
+            key=lambda item: item[1]["seconds"],
+            reverse=True,
+        )[:limit]
+
+    def as_dict(self) -> dict:
+        return {
+            "devices": self.devices,
+            "stages": {
+                name: {
+                    "seconds": round(total["seconds"], 6),
+                    "queries": total["queries"],
+                    "devices": total["devices"],
+                }
+                for name, total in self.stage_totals.items()
+            },
+        }
+
+    def write_json(self, path: str) -> None:
+        Path(path).write_text(json.dumps(self.as_dict(), indent=2) + "\n", encoding="utf-8")
+
+    def push_to_prometheus(self, gateway: str, *, job: str = "zas_sync", grouping_key=None) -> bool:
+        """Push per-stage totals to a Prometheus Pushgateway; returns False if unavailable."""
+        if push_to_gateway is None:
+            logger.warning("prometheus_client is not installed. Skipping sync metrics push.")
+            return False
+        registry = CollectorRegistry()
+        seconds = Gauge(
+            "zas_sync_stage_seconds",
+            "Wall time spent per sync stage, summed over devices.",
+            ["stage"],
+            registry=registry,
+        )
+        queries = Gauge(
+            "zas_sync_stage_queries",
+            "SQL queries issued per sync stage, summed over devices.",
+            ["stage"],
+            registry=registry,
+        )
+        devices = Gauge(
+            "zas_sync_devices",
+            "Devices with stage metrics in the last sync run.",
+            registry=registry,
+        )
+        for name, total in self.stage_totals.items():
+            seconds.labels(stage=name).set(total["seconds"])
+            queries.labels(stage=name).set(total["queries"])
+        devices.set(max((total["devices"] for total in self.stage_totals.values()), default=0))
+        push_to_gateway(gateway, job=job, registry=registry, grouping_key=grouping_key or {})
+        return True
@@ -2,14 +2,13 @@ import hashlib
 import logging
 import re
 import ipaddress
-from pathlib import Path
-
-import textfsm
-from django.conf import settings
+from collections import defaultdict
+from contextlib import ExitStack
 from datetime import timedelta
 
 from django.db import transaction
 from django.db.models import Q
+from django.db.models.functions import Upper
 from django.utils import timezone
 
 from asset.models import InventoryItem
@@ -30,19 +29,39 @@ from dcim.choices import (
     InterfaceKindChoices,
     InterfaceModeChoices,
 )
-from network.adapters.netmiko import NetmikoAdapter
+from network.adapters.netmiko import NetmikoAdapter, is_invalid_output
 from network.choices import CliCommandsChoices as cli
+from network.parsers import ACI_PLATFORM, template_registry
+from network.services.sync_metrics import SyncStageTimer
 from services.validation_service import normalize_serial_number
 
 
 logger = logging.getLogger(__name__)
 SYNC_EXCLUDE_TAG = "no_sync"
 
+# Commands whose output drives a skippable apply stage.
+FINGERPRINTED_COMMANDS = frozenset(
+    {
+        cli.INVENTORY_CMD,
+        cli.IF_STATUS_CMD,
+        cli.IF_DESC_CMD,
+        cli.IF_IP_BRIEF_CMD,
+        cli.IF_TRANSCEIVER_CMD,
+        cli.PORTCHANNEL_SUMMARY_ISO_CMD,
+        cli.PORTCHANNEL_SUMMARY_NXOS_CMD,
+        cli.STACK_SWITCH_CMD,
+    }
+)
+# Exec timestamp banners that change on every run without meaning anything.
+VOLATILE_LINE_PREFIXES = ("Load for ", "Time source is ")
+
 
 class SyncService:
 
-    def __init__(self, *, site):
+    def __init__(self, *, site, adapter_factory=None):
         self.now = timezone.now()
+        # Defaults to NetmikoAdapter; replay benchmarks inject recorded sessions.
+        self.adapter_factory = adapter_factory
         self.VERSION_CMD = cli.VERSION_CMD
         self.INVENTORY_CMD = cli.INVENTORY_CMD
         self.IF_STATUS_CMD = cli.IF_STATUS_CMD
@@ -51,6 +70,8 @@ class SyncService:
         self.IF_TRANSCEIVER_CMD = cli.IF_TRANSCEIVER_CMD
         self.RUNNING_CONFIG_CMD = cli.RUNNING_CONFIG_CMD
         self.STACK_SWITCH_CMD = cli.STACK_SWITCH_CMD
+        self.CDP_NEIGHBORS_CMD = cli.CDP_NEIGHBORS_DETAIL_CMD
+        self.LLDP_NEIGHBORS_CMD = cli.LLDP_NEIGHBORS_DETAIL_CMD
 
     # =================================================
     # PUBLIC API
@@ -61,7 +82,16 @@ class SyncService:
         *,
         include_config: bool = False,
         return_results: bool = False,
+        force: bool = False,
     ) -> dict:
+        """
+        Collect and apply CLI state for ``device``.
+
+        Runs in two phases: SSH collection happens with no transaction open,
+        then ``apply_collected`` parses and writes in one short transaction.
+        Stages whose command output hashes match the last successful sync are
+        skipped unless ``force`` is set; version, config and topology always run.
+        """
         if self._is_sync_excluded(device):
             return {
                 "device": device,
@@ -69,99 +99,248 @@ class SyncService:
                 "skipped": True,
                 "error": f"Device has tag '{SYNC_EXCLUDE_TAG}'.",
             }
-        with transaction.atomic():
-            runtime, _ = DeviceRuntimeStatus.objects.get_or_create(device=device)
-            runtime.last_check = self.now
-
-            is_nxos = bool(
-                device.device_type
-                and device.device_type.platform == DevicePlatformChoices.NX_OS
-            )
-            is_ios_stack = bool(
-                device.device_type
-                and device.device_type.platform
-                in (DevicePlatformChoices.IOS, DevicePlatformChoices.IOS_XE)
-            )
-
-            portchannel_cmd = (
-                cli.PORTCHANNEL_SUMMARY_NXOS_CMD
-                if is_nxos
-                else cli.PORTCHANNEL_SUMMARY_ISO_CMD
-            )
-
-            hostname_lower = (device.name or "").lower()
-            is_aci_leaf_spine = "leaf" in hostname_lower or "spine" in hostname_lower
-
-            try:
+        timer = SyncStageTimer()
+        try:
+            with timer.stage("collect"):
                 results = self._collect_results_with_retry(
                     device=device,
                     include_config=include_config,
-                    is_ios_stack=is_ios_stack,
-                    is_nxos=is_nxos,
-                    is_aci_leaf_spine=is_aci_leaf_spine,
-                    portchannel_cmd=portchannel_cmd,
+                    timer=timer,
                 )
-            except Exception as exc:
+        except Exception as exc:
+            return self.apply_collected(
+                device,
+                error=exc,
+                include_config=include_config,
+                timer=timer,
+            )
+        return self.apply_collected(
+            device,
+            results,
+            include_config=include_config,
+            return_results=return_results,
+            force=force,
+            timer=timer,
+        )
+
+    def apply_collected(
+        self,
+        device: Device,
+        results: dict | None = None,
+        *,
+        error: Exception | None = None,
+        include_config: bool = False,
+        return_results: bool = False,
+        force: bool = False,
+        timer: SyncStageTimer | None = None,
+    ) -> dict:
+        """
+        Apply output collected for ``build_collection_plan(device)``.
+
+        Used by ``sync_device`` and by collectors that gather output outside
+        this service (``AsyncCollectionEngine``); ``error`` records a failed
+        collection instead. Parsing happens before the write transaction is
+        opened. ``timings`` in the payload sums up collect/parse/write and
+        ``stages`` breaks them down (connect, each command, each apply step,
+        topology) into seconds and query counts.
+        """
+        timer = timer or SyncStageTimer()
+        flags = self._device_flags(device)
+        portchannel_cmd = flags["portchannel_cmd"]
+
+        if error is not None:
+            with timer.stage("write"), transaction.atomic():
+                runtime, _ = DeviceRuntimeStatus.objects.get_or_create(device=device)
+                runtime.last_check = self.now
                 runtime.reachable_ssh = False
                 runtime.save(update_fields=["reachable_ssh", "last_check"])
                 if include_config:
-                    self._record_config(device, success=False, error_message=str(exc))
-                return {"device": device, "success": False, "error": str(exc)}
+                    self._record_config(device, success=False, error_message=str(error))
+            return {
+                "device": device,
+                "success": False,
+                "error": str(error),
+                "stages": timer.as_dict(),
+            }
 
+        stages = {
+            "inventory": (self.INVENTORY_CMD,),
+            "transceivers": (self.IF_TRANSCEIVER_CMD,),
+            "interfaces": (
+                self.IF_STATUS_CMD,
+                self.IF_DESC_CMD,
+                self.IF_IP_BRIEF_CMD,
+                portchannel_cmd,
+            ),
+            "stack": (self.STACK_SWITCH_CMD,),
+        }
+        with timer.stage("parse"):
+            previous = (
+                DeviceRuntimeStatus.objects.filter(device=device)
+                .values_list("sync_fingerprints", flat=True)
+                .first()
+            ) or {}
+            fingerprints = self._fingerprint_results(results)
+            unchanged = set() if force else {
+                command
+                for command, digest in fingerprints.items()
+                if previous.get(command) == digest
+            }
+            skipped_stages = [
+                stage
+                for stage, commands in stages.items()
+                if all(command in unchanged for command in commands)
+            ]
+            # device type detection reads the inventory on every run
+            skip_parse = {
+                command
+                for stage in skipped_stages
+                for command in stages[stage]
+            } - {self.INVENTORY_CMD}
+            self._parse_results(device, results, skip=skip_parse)
+            # PTR lookups of IP-named neighbors must not run inside the write transaction
+            neighbors = self._parse_topology_neighbors(device, results)
+
+        with timer.stage("write"), transaction.atomic():
+            runtime, _ = DeviceRuntimeStatus.objects.get_or_create(device=device)
+            runtime.last_check = self.now
             # Mark device as reachable
             runtime.reachable_ssh = True
             runtime.save(update_fields=["reachable_ssh", "last_check"])
-            # Apply retrieved data
-            self._apply_version(device, runtime, results[self.VERSION_CMD])
-            self._apply_inventory(device, results[self.INVENTORY_CMD])
-            self._update_device_type(
-                device=device,
-                version_result=results[self.VERSION_CMD],
-                inventory_result=results[self.INVENTORY_CMD],
-            )
-            if is_nxos and self.IF_TRANSCEIVER_CMD in results:
-                self._apply_transceivers(device, results[self.IF_TRANSCEIVER_CMD])
 
-            self._apply_interfaces(
-                device=device,
-                status_result=results[self.IF_STATUS_CMD],
-                desc_result=results[self.IF_DESC_CMD],
-                ip_result=results[self.IF_IP_BRIEF_CMD],
-                po_result=results[portchannel_cmd],
-            )
+            # Apply retrieved data
+            with timer.stage("apply:version"):
+                self._apply_version(device, runtime, results[self.VERSION_CMD])
+            if "inventory" not in skipped_stages:
+                with timer.stage("apply:inventory"):
+                    self._apply_inventory(device, results[self.INVENTORY_CMD])
+            # show version is not fingerprinted, so a model change must not wait for the inventory
+            with timer.stage("apply:device_type"):
+                self._update_device_type(
+                    device=device,
+                    version_result=results[self.VERSION_CMD],
+                    inventory_result=results[self.INVENTORY_CMD],
+                )
+            if (
+                flags["is_nxos"]
+                and self.IF_TRANSCEIVER_CMD in results
+                and "transceivers" not in skipped_stages
+            ):
+                with timer.stage("apply:transceivers"):
+                    self._apply_transceivers(device, results[self.IF_TRANSCEIVER_CMD])
+
+            if "interfaces" not in skipped_stages:
+                with timer.stage("apply:interfaces"):
+                    self._apply_interfaces(
+                        device=device,
+                        status_result=results[self.IF_STATUS_CMD],
+                        desc_result=results[self.IF_DESC_CMD],
+                        ip_result=results[self.IF_IP_BRIEF_CMD],
+                        po_result=results[portchannel_cmd],
+                    )
 
             if include_config:
                 cfg = results.get(self.RUNNING_CONFIG_CMD, {})
-                self._record_config(
-                    device=device,
-                    success=not cfg.get("error"),
-                    error_message=cfg.get("error"),
-                    config_text=cfg.get("raw", "") if not cfg.get("error") else "",
-                )
+                with timer.stage("apply:config"):
+                    self._record_config(
+                        device=device,
+                        success=not cfg.get("error"),
+                        error_message=cfg.get("error"),
+                        config_text=cfg.get("raw", "") if not cfg.get("error") else "",
+                    )
 
-            if is_ios_stack and self.STACK_SWITCH_CMD in results:
-                self._apply_stack_members(device, results[self.STACK_SWITCH_CMD])
+            if (
+                flags["is_ios_stack"]
+                and self.STACK_SWITCH_CMD in results
+                and "stack" not in skipped_stages
+            ):
+                with timer.stage("apply:stack"):
+                    self._apply_stack_members(device, results[self.STACK_SWITCH_CMD])
+
+            if neighbors is not None:
+                with timer.stage("topology"):
+                    self._apply_topology_neighbors(device, neighbors)
+
+            runtime.sync_fingerprints = fingerprints
+            runtime.save(update_fields=["sync_fingerprints"])
+        logger.debug(
+            "Sync write phase for %s took %.3fs (parse %.3fs)",
+            device,
+            timer.seconds("write"),
+            timer.seconds("parse"),
+        )
 
-            self._collect_topology_neighbors(device)
+        payload = {
+            "device": device,
+            "success": True,
+            "skipped_stages": skipped_stages,
+            "timings": {
+                name: timer.seconds(name)
+                for name in ("collect", "parse", "write")
+                if name in timer.stages
+            },
+            "stages": timer.as_dict(),
+        }
+        if return_results:
+            payload["results"] = results
+        return payload
 
-            payload = {"device": device, "success": True}
-            if return_results:
-                payload["results"] = results
-            return payload
+    def build_collection_plan(
+        self,
+        device: Device,
+        *,
+        include_config: bool = False,
+    ) -> list[tuple[str, ...]]:
+        """
+        Ordered commands collected over the single sync session.
+
+        Each entry is a command followed by fallbacks tried when the device
+        rejects it; the output is stored under the first command.
+        """
+        flags = self._device_flags(device)
+        plan = [
+            (self.VERSION_CMD,),
+            (self.INVENTORY_CMD,),
+            (self.IF_STATUS_CMD,),
+            (self.IF_DESC_CMD,),
+            (self.IF_IP_BRIEF_CMD,),
+            (flags["portchannel_cmd"],),
+        ]
+        if flags["is_ios_stack"]:
+            plan.append((self.STACK_SWITCH_CMD,))
+        if flags["is_nxos"]:
+            plan.append((self.IF_TRANSCEIVER_CMD,))
+        if include_config:
+            plan.append((self.RUNNING_CONFIG_CMD,))
+        # CDP/LLDP ride on the same session; topology parses them after apply.
+        plan.append((self.CDP_NEIGHBORS_CMD, cli.CDP_NEIGHBORS_CMD))
+        plan.append((self.LLDP_NEIGHBORS_CMD, cli.LLDP_NEIGHBORS_CMD))
+        return plan
 
     @staticmethod
     def _is_sync_excluded(device: Device) -> bool:
         return device.tags.filter(name__iexact=SYNC_EXCLUDE_TAG).exists()
 
+    @staticmethod
+    def _device_flags(device: Device) -> dict:
+        platform = device.device_type.platform if device.device_type else None
+        is_nxos = platform == DevicePlatformChoices.NX_OS
+        return {
+            "is_nxos": is_nxos,
+            "is_ios_stack": platform in (DevicePlatformChoices.IOS, DevicePlatformChoices.IOS_XE),
+            "portchannel_cmd": (
+                cli.PORTCHANNEL_SUMMARY_NXOS_CMD
+                if is_nxos
+                else cli.PORTCHANNEL_SUMMARY_ISO_CMD
+            ),
+        }
+
     def _collect_results_with_retry(
         self,
         *,
         device: Device,
         include_config: bool,
-        is_ios_stack: bool,
-        is_nxos: bool,
-        is_aci_leaf_spine: bool,
-        portchannel_cmd: str,
+        timer: SyncStageTimer | None = None,
     ) -> dict:
         last_exc = None
         for attempt in range(2):
@@ -169,10 +348,7 @@ class SyncService:
                 return self._collect_results(
                     device=device,
                     include_config=include_config,
-                    is_ios_stack=is_ios_stack,
-                    is_nxos=is_nxos,
-                    is_aci_leaf_spine=is_aci_leaf_spine,
-                    portchannel_cmd=portchannel_cmd,
+                    timer=timer,
                 )
             except Exception as exc:
                 last_exc = exc
@@ -189,58 +365,152 @@ class SyncService:
         *,
         device: Device,
         include_config: bool,
-        is_ios_stack: bool,
-        is_nxos: bool,
-        is_aci_leaf_spine: bool,
-        portchannel_cmd: str,
+        timer: SyncStageTimer | None = None,
     ) -> dict:
-        with NetmikoAdapter(device, allow_autodetect=False) as ssh:
-            results = {
-                self.VERSION_CMD: ssh.run_command_raw(self.VERSION_CMD),
-                self.INVENTORY_CMD: ssh.run_command_raw(self.INVENTORY_CMD),
-            }
-            results.update(
-                {
-                    self.IF_STATUS_CMD: ssh.run_command_raw(self.IF_STATUS_CMD),
-                    self.IF_DESC_CMD: ssh.run_command_raw(self.IF_DESC_CMD),
-                    self.IF_IP_BRIEF_CMD: ssh.run_command_raw(self.IF_IP_BRIEF_CMD),
-                    portchannel_cmd: ssh.run_command_raw(portchannel_cmd),
-                }
-            )
-            if is_ios_stack:
-                results[self.STACK_SWITCH_CMD] = ssh.run_command_raw(self.STACK_SWITCH_CMD)
-            if is_nxos:
-                results[self.IF_TRANSCEIVER_CMD] = ssh.run_command_raw(self.IF_TRANSCEIVER_CMD)
-            if include_config:
-                results[self.RUNNING_CONFIG_CMD] = ssh.run_command_raw(self.RUNNING_CONFIG_CMD)
-        self._parse_results(device, results)
+        timer = timer or SyncStageTimer()
+        plan = self.build_collection_plan(device, include_config=include_config)
+        adapter_factory = self.adapter_factory or NetmikoAdapter
+        with ExitStack() as session:
+            with timer.stage("connect"):
+                ssh = session.enter_context(adapter_factory(device, allow_autodetect=False))
+            return self._run_collection_plan(ssh, plan, timer=timer)
+
+    @staticmethod
+    def _run_collection_plan(
+        ssh,
+        plan: list[tuple[str, ...]],
+        *,
+        timer: SyncStageTimer | None = None,
+    ) -> dict:
+        timer = timer or SyncStageTimer()
+        results = {}
+        for command, *fallbacks in plan:
+            with timer.stage(f"command:{command}"):
+                result = ssh.run_command_raw(command)
+            for fallback in fallbacks:
+                if not is_invalid_output(result.get("raw")):
+                    break
+                with timer.stage(f"command:{fallback}"):
+                    result = ssh.run_command_raw(fallback)
+            results[command] = result
         return results
 
-    def _collect_topology_neighbors(self, device: Device) -> None:
+    def _parse_topology_neighbors(self, device: Device, results: dict) -> dict | None:
         try:
-            from automation.tasks.topology_collector import collect_neighbors_for_device
-            collect_neighbors_for_device(device)
+            from automation.tasks.topology_collector import parse_neighbor_outputs
+            return parse_neighbor_outputs(
+                device,
+                results.get(self.CDP_NEIGHBORS_CMD, {}).get("raw") or "",
+                results.get(self.LLDP_NEIGHBORS_CMD, {}).get("raw") or "",
+            )
         except Exception as exc:
             logger.warning("Topology collection failed for %s: %s", device.name, exc)
+            return None
+
+    def _apply_topology_neighbors(self, device: Device, neighbors: dict) -> None:
+        from automation.tasks.topology_collector import apply_parsed_neighbors
+        apply_parsed_neighbors(device, neighbors)
 
     # =================================================
     # VERSION / INVENTORY / CONFIG
     # =================================================
-    def _remove_storage_duplicates(self, serial_value: str) -> None:
-        deleted, _ = InventoryItem.objects.filter(serial_number__iexact=serial_value).delete()
-        if deleted:
-            logger.info(
-                "Removed %s duplicate storage inventory record(s) for serial %s",
-                deleted,
-                serial_value,
+    def _reconcile_modules(
+        self,
+        device: Device,
+        desired: list[dict],
+        *,
+        match_serial: bool,
+        is_stale=None,
+    ) -> None:
+        """
+        Bulk-upsert ``desired`` modules ({"name", "serial_number", "description"}).
+
+        Serials are compared upper-cased. Storage inventory items and modules
+        elsewhere that carry one of the serials are removed with one lookup per
+        table. Modules are matched on name (plus serial when ``match_serial``).
+        Unmatched rows of ``device`` for which ``is_stale(row)`` holds are
+        deleted together with the conflicts.
+        """
+        names_by_serial = defaultdict(set)
+        for module in desired:
+            if module["serial_number"]:
+                names_by_serial[module["serial_number"].upper()].add(module["name"])
+        serial_keys = list(names_by_serial)
+
+        if serial_keys:
+            deleted, _ = (
+                InventoryItem.objects.annotate(serial_key=Upper("serial_number"))
+                .filter(serial_key__in=serial_keys)
+                .delete()
             )
+            if deleted:
+                logger.info(
+                    "Removed %s duplicate storage inventory record(s) for %s",
+                    deleted,
+                    device,
+                )
 
-    def _reconcile_module_serial(self, device: Device, name: str, serial_value: str) -> bool:
-        self._remove_storage_duplicates(serial_value)
-        DeviceModule.objects.filter(serial_number__iexact=serial_value).exclude(
-            Q(device=device) & Q(name=name)
-        ).delete()
-        return True
+        lookup = Q(device=device)
+        if serial_keys:
+            lookup |= Q(serial_key__in=serial_keys)
+        rows = DeviceModule.objects.annotate(serial_key=Upper("serial_number")).filter(lookup)
+
+        def _identity(name, serial_number):
+            return (name, (serial_number or "").upper()) if match_serial else name
+
+        delete_ids = []
+        matched = {}
+        for row in rows:
+            owners = names_by_serial.get(row.serial_key or "")
+            if owners and not (row.device_id == device.id and row.name in owners):
+                delete_ids.append(row.pk)
+                continue
+            if row.device_id != device.id:
+                continue
+            identity = _identity(row.name, row.serial_number)
+            if identity in matched:
+                delete_ids.append(row.pk)
+            else:
+                matched[identity] = row
+
+        desired_ids = set()
+        to_create = []
+        to_update = []
+        for module in desired:
+            identity = _identity(module["name"], module["serial_number"])
+            desired_ids.add(identity)
+            row = matched.get(identity)
+            if row is None:
+                to_create.append(
+                    DeviceModule(
+                        device=device,
+                        name=module["name"],
+                        serial_number=module["serial_number"],
+                        description=module["description"],
+                    )
+                )
+            elif (
+                row.serial_number != module["serial_number"]
+                or row.description != module["description"]
+                or row.vendor_id is not None
+            ):
+                row.serial_number = module["serial_number"]
+                row.description = module["description"]
+                row.vendor = None
+                to_update.append(row)
+
+        if is_stale:
+            delete_ids.extend(
+                row.pk
+                for identity, row in matched.items()
+                if identity not in desired_ids and is_stale(row)
+            )
+        if delete_ids:
+            DeviceModule.objects.filter(pk__in=delete_ids).delete()
+        if to_create:
+            DeviceModule.objects.bulk_create(to_create)
+        if to_update:
+            DeviceModule.objects.bulk_update(to_update, ["serial_number", "description", "vendor"])
 
     def _apply_version(self, device: Device, runtime: DeviceRuntimeStatus, result: dict):
         parsed = result.get("parsed")
@@ -306,7 +576,6 @@ class SyncService:
                 score -= 2
             return score, len(name)
 
-        seen_keys = set()
         no_serial_names = set()
         serial_entries = {}
         for entry in parsed:
@@ -329,40 +598,21 @@ class SyncService:
                     "priority": priority,
                 }
 
-        for _, entry in serial_entries.items():
-            name = entry["name"]
-            descr = entry["descr"]
-            serial_value = entry["serial"]
-            if not self._reconcile_module_serial(device, name, serial_value):
-                continue
-            DeviceModule.objects.update_or_create(
-                device=device,
-                name=name,
-                serial_number=serial_value,
-                defaults={
-                    "description": descr,
-                    "vendor": None,
-                },
-            )
-            seen_keys.add((name, serial_value))
-
-        if seen_keys:
-            keep_q = Q()
-            for name, serial_value in seen_keys:
-                keep_q |= Q(name=name, serial_number=serial_value)
-            DeviceModule.objects.filter(device=device).filter(
-                Q(serial_number__isnull=False) & ~Q(serial_number="")
-            ).exclude(
-                name__startswith="Transceiver "
-            ).exclude(
-                keep_q
-            ).delete()
-
-        if no_serial_names:
-            DeviceModule.objects.filter(
-                device=device,
-                name__in=no_serial_names,
-            ).filter(Q(serial_number__isnull=True) | Q(serial_number="")).delete()
+        desired = [
+            {
+                "name": entry["name"],
+                "serial_number": entry["serial"],
+                "description": entry["descr"],
+            }
+            for entry in serial_entries.values()
+        ]
+
+        def _is_stale(row: DeviceModule) -> bool:
+            if not row.serial_number:
+                return row.name in no_serial_names
+            return bool(desired) and not row.name.startswith("Transceiver ")
+
+        self._reconcile_modules(device, desired, match_serial=True, is_stale=_is_stale)
 
     def _update_device_type(self, *, device: Device, version_result: dict, inventory_result: dict) -> None:
         model = self._model_from_inventory(inventory_result.get("parsed"), device.serial_number)
@@ -444,37 +694,51 @@ class SyncService:
 
     def _apply_transceivers(self, device: Device, result: dict):
         entries = self._parse_transceiver_entries(result)
-        seen_names = set()
+        desired = {}
         for entry in entries:
             name = entry.get("name")
             if not name:
                 continue
-            serial_value = normalize_serial_number(entry.get("serial"))
-            if serial_value and not self._reconcile_module_serial(device, name, serial_value):
+            desired[name] = {
+                "name": name,
+                "serial_number": normalize_serial_number(entry.get("serial")),
+                "description": entry.get("description"),
+            }
+        self._reconcile_modules(
+            device,
+            list(desired.values()),
+            match_serial=False,
+            is_stale=(lambda row: row.name.startswith("Transceiver ")) if desired else None,
+        )
+
+    def _fingerprint_results(self, results: dict) -> dict[str, str]:
+        """Hash the raw output of every command whose apply stage can be skipped."""
+        fingerprints = {}
+        for command, result in results.items():
+            if command not in FINGERPRINTED_COMMANDS or not isinstance(result, dict):
                 continue
-            seen_names.add(name)
-            DeviceModule.objects.update_or_create(
-                device=device,
-                name=name,
-                defaults={
-                    "description": entry.get("description"),
-                    "serial_number": serial_value,
-                    "vendor": None,
-                },
-            )
-        if seen_names:
-            DeviceModule.objects.filter(
-                device=device,
-                name__startswith="Transceiver ",
-            ).exclude(name__in=seen_names).delete()
+            if result.get("error") or not result.get("raw"):
+                continue
+            fingerprints[command] = self._fingerprint_output(result["raw"])
+        return fingerprints
+
+    @staticmethod
+    def _fingerprint_output(raw: str) -> str:
+        lines = []
+        for line in raw.splitlines():
+            line = line.rstrip()
+            if not line or line.lstrip().startswith(VOLATILE_LINE_PREFIXES):
+                continue
+            lines.append(line)
+        return hashlib.sha256("\n".join(lines).encode()).hexdigest()
 
     def _is_aci_leaf_spine(self, device: Device) -> bool:
         hostname = (device.name or "").lower()
         return "leaf" in hostname or "spine" in hostname
 
-    def _parse_results(self, device: Device, results: dict) -> None:
+    def _parse_results(self, device: Device, results: dict, *, skip=()) -> None:
         for command, result in results.items():
-            if not isinstance(result, dict):
+            if command in skip or not isinstance(result, dict):
                 continue
             raw = result.get("raw") or ""
             if not raw:
@@ -486,53 +750,22 @@ class SyncService:
             if parsed:
                 result["parsed"] = parsed
 
-    def _template_for_command(self, device: Device, command: str) -> str | None:
+    def _parser_platform(self, device: Device) -> str | None:
         platform = device.device_type.platform if device.device_type else None
-        if platform in (DevicePlatformChoices.IOS, DevicePlatformChoices.IOS_XE):
-            templates = {
-                self.VERSION_CMD: "cisco_ios_show_version.textfsm",
-                self.INVENTORY_CMD: "cisco_ios_show_inventory.textfsm",
-                self.IF_STATUS_CMD: "cisco_ios_show_interface_status.textfsm",
-                self.IF_DESC_CMD: "cisco_ios_show_interface_description.textfsm",
-                self.IF_IP_BRIEF_CMD: "cisco_ios_show_ip_interface_brief.textfsm",
-                cli.PORTCHANNEL_SUMMARY_ISO_CMD: "cisco_ios_show_etherchannel_summary.textfsm",
-            }
-            return templates.get(command)
-        if platform == DevicePlatformChoices.NX_OS:
-            if self._is_aci_leaf_spine(device) and command == self.VERSION_CMD:
-                return None
-            templates = {
-                self.VERSION_CMD: "cisco_nxos_show_version.textfsm",
-                self.INVENTORY_CMD: "cisco_nxos_show_inventory.textfsm",
-                self.IF_STATUS_CMD: (
-                    "cisco_aci_show_interface_status.textfsm"
-                    if self._is_aci_leaf_spine(device)
-                    else "cisco_nxos_show_interface_status.textfsm"
-                ),
-                self.IF_DESC_CMD: "cisco_nxos_show_interface_description.textfsm",
-                self.IF_IP_BRIEF_CMD: (
-                    "cisco_aci_show_ip_interface_brief.textfsm"
-                    if self._is_aci_leaf_spine(device)
-                    else "cisco_nxos_show_ip_interface_brief.textfsm"
-                ),
-                cli.PORTCHANNEL_SUMMARY_NXOS_CMD: "cisco_nxos_show_port-channel_summary.textfsm",
-                self.IF_TRANSCEIVER_CMD: "cisco_nxos_show_interface_transceiver.textfsm",
-            }
-            return templates.get(command)
-        return None
+        if platform == DevicePlatformChoices.NX_OS and self._is_aci_leaf_spine(device):
+            return ACI_PLATFORM
+        return platform
+
+    def _template_for_command(self, device: Device, command: str) -> str | None:
+        platform = self._parser_platform(device)
+        if platform == ACI_PLATFORM and command == self.VERSION_CMD:
+            # ACI show version is parsed in _apply_version instead.
+            return None
+        return template_registry.template_for(platform, command)
 
     def _parse_with_textfsm(self, raw: str, template_name: str, *, device: Device) -> list[dict] | None:
-        template_path = (
-            Path(settings.BASE_DIR)
-            / "network"
-            / "parsers"
-            / "textfsm"
-            / template_name
-        )
         try:
-            with open(template_path, "r", encoding="utf-8") as handle:
-                fsm = textfsm.TextFSM(handle)
-                results = fsm.ParseText(raw)
+            return template_registry.parse(template_name, raw)
         except Exception as exc:
             logger.warning(
                 "TextFSM parse failed for %s (%s): %s",
@@ -542,32 +775,13 @@ class SyncService:
             )
             return None
 
-        if not results:
-            return None
-        headers = [header.lower() for header in fsm.header]
-        return [dict(zip(headers, row)) for row in results]
-
     def _parse_aci_show_version(self, raw: str) -> list[dict] | None:
-        template_path = (
-            Path(settings.BASE_DIR)
-            / "network"
-            / "parsers"
-            / "textfsm"
-            / "cisco_nxos_aci_show_version.textfsm"
-        )
         try:
-            with open(template_path, "r", encoding="utf-8") as handle:
-                fsm = textfsm.TextFSM(handle)
-                results = fsm.ParseText(raw)
+            return template_registry.parse_command(ACI_PLATFORM, self.VERSION_CMD, raw)
         except Exception as exc:
             logger.warning("ACI show version parse failed: %s", exc)
             return None
 
-        if not results:
-            return None
-        headers = [header.lower() for header in fsm.header]
-        return [dict(zip(headers, row)) for row in results]
-
     def _parse_transceiver_entries(self, result: dict) -> list[dict]:
         parsed = result.get("parsed")
         if parsed:
@@ -1002,7 +1216,7 @@ class SyncService:
                 if member:
                     lag_map[member] = po
 
-                
+
         seen_names = (
             set(status_map)
             | set(desc_map)
@@ -1010,73 +1224,50 @@ class SyncService:
             | set(lag_map)
             | set(lag_map.values())
         )
-        if seen_names:
-            Interface.objects.filter(device=device).exclude(name__in=seen_names).delete()
-
-        # ---- create all interfaces ----
-        all_names = seen_names
-        iface_objs = {
-            name: Interface.objects.get_or_create(device=device, name=name)[0]
-            for name in all_names
-        }
+        if not seen_names:
+            return
 
-        # ---- kind ----
-        for name, iface in iface_objs.items():
-            iface.kind = self._infer_kind(name)
-            iface.save(update_fields=["kind"])
+        # ---- desired field state per interface ----
+        desired = {}
+        for name in seen_names:
+            fields = {"kind": self._infer_kind(name)}
 
-        # ---- mode ----
-        for name, iface in iface_objs.items():
+            # ---- mode ----
             vlan = status_map.get(name, {}).get("vlan")
-            if iface.kind in {
+            if fields["kind"] in {
                 InterfaceKindChoices.SVI,
                 InterfaceKindChoices.LOOPBACK,
                 InterfaceKindChoices.TUNNEL,
             }:
-                iface.mode = InterfaceModeChoices.L3
+                fields["mode"] = InterfaceModeChoices.L3
             elif vlan:
-                iface.mode = InterfaceModeChoices.L2
+                fields["mode"] = InterfaceModeChoices.L2
             elif name in ip_map:
-                iface.mode = InterfaceModeChoices.L3
-            iface.save(update_fields=["mode"])
-
-        # ---- lag binding ----
-        for member_name, po_name in lag_map.items():
-            member = iface_objs.get(member_name)
-            po = iface_objs.get(po_name)
-            if member and po:
-                member.lag = po
-                member.lag_mode = "active"
-                member.save(update_fields=["lag", "lag_mode"])
-
-        # ---- status / description ----
-        for name, iface in iface_objs.items():
-            update_fields = []
+                fields["mode"] = InterfaceModeChoices.L3
+
+            # ---- lag binding ----
+            if name in lag_map:
+                fields["lag"] = lag_map[name]
+                fields["lag_mode"] = "active"
+
+            # ---- status / description ----
             if name in desc_map:
-                iface.description = desc_map.get(name, "") or ""
-                update_fields.append("description")
+                fields["description"] = desc_map.get(name, "") or ""
 
+            mapped_status = None
             if name in status_map:
                 ifc = status_map[name]
                 mapped_status = self._map_status(ifc.get("status"))
-                iface.status = mapped_status
-                iface.speed = ifc.get("speed")
-                iface.speed_mode = ifc.get("speed_mode")
-                iface.duplex = ifc.get("duplex")
-                iface.vlan_raw = ifc.get("vlan_raw")
-                iface.is_trunk = "trunk" in (ifc.get("vlan") or "")
-                update_fields.extend(
-                    [
-                        "status",
-                        "speed",
-                        "speed_mode",
-                        "duplex",
-                        "vlan_raw",
-                        "is_trunk",
-                    ]
+                fields.update(
+                    {
+                        "status": mapped_status,
+                        "speed": ifc.get("speed"),
+                        "speed_mode": ifc.get("speed_mode"),
+                        "duplex": ifc.get("duplex"),
+                        "vlan_raw": ifc.get("vlan_raw"),
+                        "is_trunk": "trunk" in (ifc.get("vlan") or ""),
+                    }
                 )
-            else:
-                mapped_status = None
 
             ip_data = ip_seen.get(name)
             if (
@@ -1091,24 +1282,63 @@ class SyncService:
                     ip_data.get("proto"),
                 )
                 if ip_status:
-                    iface.status = ip_status
-                    if "status" not in update_fields:
-                        update_fields.append("status")
+                    fields["status"] = ip_status
+
+            # ---- TEMP: IP on interface (pre-IPAM) ----
+            if name in ip_seen:
+                ip_value = ip_data.get("ip")
+                if ip_value and str(ip_value).lower() != "unassigned":
+                    fields["ip_address"] = ip_value
+                else:
+                    fields["ip_address"] = None
+
+            desired[name] = fields
+
+        self._reconcile_interfaces(device, desired)
+
+    def _reconcile_interfaces(self, device: Device, desired: dict[str, dict]) -> None:
+        """
+        Bring the device's interfaces in line with ``desired`` using set-based writes.
+
+        ``desired`` maps interface name -> {field: value}; fields that are absent
+        are left untouched. ``lag`` values are interface names and are resolved to
+        the matching row. Existing rows are loaded once and diffed in memory, so
+        unchanged interfaces produce no writes at all.
+        """
+        existing = {
+            iface.name: iface
+            for iface in Interface.objects.filter(device=device)
+        }
 
-            if update_fields:
-                iface.save(update_fields=update_fields)
+        stale_ids = [iface.pk for name, iface in existing.items() if name not in desired]
+        if stale_ids:
+            Interface.objects.filter(pk__in=stale_ids).delete()
 
-        # ---- TEMP: IP on interface (pre-IPAM) ----
-        for name, ip_data in ip_seen.items():
-            iface = iface_objs.get(name)
-            if iface is None:
-                continue
-            ip_value = ip_data.get("ip")
-            if ip_value and str(ip_value).lower() != "unassigned":
-                iface.ip_address = ip_value
-            else:
-                iface.ip_address = None
-            iface.save(update_fields=["ip_address"])
+        created = {
+            name: Interface(device=device, name=name)
+            for name in desired
+            if name not in existing
+        }
+        rows = {**existing, **created}
+
+        changed_by_columns = defaultdict(list)
+        for name, fields in desired.items():
+            iface = rows[name]
+            changed = []
+            for field, value in fields.items():
+                if field == "lag":
+                    value = rows[value].pk
+                attname = Interface._meta.get_field(field).attname
+                if getattr(iface, attname) != value:
+                    setattr(iface, attname, value)
+                    changed.append(field)
+            if changed and name not in created:
+                changed_by_columns[tuple(sorted(changed))].append(iface)
+
+        if created:
+            Interface.objects.bulk_create(created.values())
+        for columns, ifaces in changed_by_columns.items():
+            Interface.objects.bulk_update(ifaces, columns)
 
     # =================================================
     # HELPERS
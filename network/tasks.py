@@ -1,10 +1,16 @@
 import ipaddress
 import logging
+from collections import defaultdict
 from types import SimpleNamespace
 
-from celery import shared_task
+from celery import chord, shared_task
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 
+from automation.application import JobResultService, JobService
+from automation.choices import JobStatus
+from automation.models import JobRun
 from dcim.choices import DeviceStatusChoices
 from dcim.models import Device
 from network.models.discovery import (
@@ -16,6 +22,8 @@ from network.models.discovery import (
 )
 from network.services.auto_assignment_service import AutoAssignmentService
 from network.services.discover_network import NetworkDiscoveryService
+from network.services.discovery_progress import DiscoveryProgress
+from network.services.sync_metrics import SyncMetricsSummary
 from network.services.sync_service import SYNC_EXCLUDE_TAG, SyncService
 
 logger = logging.getLogger(__name__)
@@ -109,7 +117,8 @@ def run_discovery_scan_job(self, job_id: str) -> None:
     job.started_at = timezone.now()
     job.save(update_fields=["status", "started_at"])
 
-    service = NetworkDiscoveryService(site=job.site)
+    service = NetworkDiscoveryService(site=job.site, incremental=job.incremental)
+    progress = DiscoveryProgress(job.id)
     alive = 0
     processed = 0
 
@@ -164,12 +173,20 @@ def run_discovery_scan_job(self, job_id: str) -> None:
         job.total_ranges = len(ranges)
         job.save(update_fields=["total_ranges"])
 
-        for dr in ranges:
-            alive += service._scan_range(dr)
+        def _on_batch(count: int) -> None:
+            nonlocal alive
+            alive += count
+            job.alive_count = alive
+            job.save(update_fields=["alive_count"])
+
+        def _on_range(dr) -> None:
+            nonlocal processed
             processed += 1
             job.processed_ranges = processed
-            job.alive_count = alive
-            job.save(update_fields=["processed_ranges", "alive_count"])
+            job.skipped_count = service.skipped
+            job.save(update_fields=["processed_ranges", "skipped_count"])
+
+        service.scan_ranges(ranges, on_batch=_on_batch, on_range=_on_range, progress=progress)
 
         updated_candidates = DiscoveryCandidate.objects.filter(
             site=job.site,
@@ -196,44 +213,172 @@ def run_discovery_scan_job(self, job_id: str) -> None:
                 "exact_count",
                 "mismatch_count",
                 "new_count",
+                "skipped_count",
                 "completed_at",
                 "error_message",
                 "total_ranges",
             ]
         )
+        progress.finish(
+            str(job.status),
+            exact=job.exact_count,
+            mismatch=job.mismatch_count,
+            new=job.new_count,
+            skipped=job.skipped_count,
+            error=job.error_message,
+        )
+
+
+def _plan_sync_chunks(
+    devices: list[tuple[str, str | None]],
+    *,
+    global_concurrency: int,
+    site_concurrency: int,
+) -> list[list[str]]:
+    """
+    Split (device_id, site_id) pairs into chunks that are synced in parallel.
+
+    Each chunk is processed serially by one worker, so the number of chunks is
+    the global concurrency and no site is spread over more than
+    ``site_concurrency`` chunks.
+    """
+    by_site = defaultdict(list)
+    for device_id, site_id in devices:
+        by_site[site_id].append(device_id)
+
+    queues = []
+    for device_ids in by_site.values():
+        lanes = max(1, min(site_concurrency, len(device_ids)))
+        queues.extend(device_ids[i::lanes] for i in range(lanes))
+
+    chunks = [[] for _ in range(max(1, min(global_concurrency, len(queues))))]
+    for queue in sorted(queues, key=len, reverse=True):
+        min(chunks, key=len).extend(queue)
+    return [chunk for chunk in chunks if chunk]
+
+
+def _record_sync_progress(run_id: str, outcome: str) -> None:
+    with transaction.atomic():
+        run = JobRun.objects.select_for_update().get(id=run_id)
+        result = run.result or {}
+        progress = result.setdefault("progress", {})
+        progress[outcome] = progress.get(outcome, 0) + 1
+        run.result = result
+        run.save(update_fields=["result"])
 
 
 @shared_task
-def run_scheduled_sync_job(include_config: bool = False):
-    devices = (
+def run_scheduled_sync_job(
+    include_config: bool = False,
+    global_concurrency: int | None = None,
+    site_concurrency: int | None = None,
+    force: bool = False,
+):
+    devices_qs = (
         Device.objects.filter(status=DeviceStatusChoices.STATUS_ACTIVE)
         .exclude(tags__name=SYNC_EXCLUDE_TAG)
-        .select_related("site")
         .distinct()
     )
-    if not devices.exists():
-        return {"success": 0, "failed": 0, "skipped": 0}
+    devices = [
+        (str(device_id), str(site_id) if site_id else None)
+        for device_id, site_id in devices_qs.values_list("id", "site_id")
+    ]
+    if not devices:
+        return {"run_id": None, "devices": 0, "chunks": 0}
+
+    chunks = _plan_sync_chunks(
+        devices,
+        global_concurrency=global_concurrency or settings.SYNC_FANOUT_GLOBAL_CONCURRENCY,
+        site_concurrency=site_concurrency or settings.SYNC_FANOUT_SITE_CONCURRENCY,
+    )
+    _, run = JobService.create_sync_job(
+        devices=[device_id for device_id, _ in devices],
+        created_by=None,
+        params={"include_config": include_config, "force": force, "chunks": len(chunks)},
+    )
+    run.status = JobStatus.RUNNING
+    run.started_at = timezone.now()
+    run.result = {
+        "progress": {"total": len(devices), "success": 0, "failed": 0, "skipped": 0}
+    }
+    run.save(update_fields=["status", "started_at", "result"])
 
-    success = 0
-    failed = 0
-    skipped = 0
+    chord(
+        run_sync_chunk.s(str(run.id), chunk, include_config, force) for chunk in chunks
+    )(finalize_sync_job.s(str(run.id)).on_error(fail_sync_job.s(str(run.id))))
+
+    return {"run_id": str(run.id), "devices": len(devices), "chunks": len(chunks)}
 
+
+@shared_task
+def run_sync_chunk(
+    run_id: str,
+    device_ids: list[str],
+    include_config: bool = False,
+    force: bool = False,
+):
+    devices = Device.objects.filter(id__in=device_ids).select_related("site", "device_type")
+
+    counts = {"success": 0, "failed": 0, "skipped": 0}
+    metrics = SyncMetricsSummary()
     for device in devices:
         try:
             service = SyncService(site=device.site)
-            result = service.sync_device(device, include_config=include_config)
+            result = service.sync_device(device, include_config=include_config, force=force)
+            metrics.add(device.name, result)
             if result.get("skipped"):
-                skipped += 1
+                outcome = "skipped"
             elif result.get("success"):
-                success += 1
+                outcome = "success"
             else:
-                failed += 1
+                outcome = "failed"
                 logger.warning("Scheduled sync failed for %s: %s", device.name, result.get("error"))
         except Exception as exc:
-            failed += 1
+            outcome = "failed"
             logger.exception("Scheduled sync crashed for %s: %s", device.name, exc)
+        counts[outcome] += 1
+        _record_sync_progress(run_id, outcome)
+
+    return {**counts, "stages": metrics.as_dict()["stages"]}
+
 
-    return {"success": success, "failed": failed, "skipped": skipped}
+@shared_task
+def finalize_sync_job(chunk_results: list[dict], run_id: str):
+    summary = {"success": 0, "failed": 0, "skipped": 0}
+    metrics = SyncMetricsSummary()
+    for counts in chunk_results:
+        for key in summary:
+            summary[key] += (counts or {}).get(key, 0)
+        metrics.add_stage_totals((counts or {}).get("stages"))
+
+    run = JobRun.objects.select_related("job").get(id=run_id)
+    progress = (run.result or {}).get("progress")
+    JobResultService.finalize_success(run, {**summary, "stages": metrics.as_dict()["stages"]})
+    run.result["progress"] = progress
+    run.finished_at = timezone.now()
+    run.save(update_fields=["result", "finished_at"])
+
+    if settings.SYNC_METRICS_PUSHGATEWAY and metrics.stage_totals:
+        try:
+            metrics.push_to_prometheus(settings.SYNC_METRICS_PUSHGATEWAY)
+        except Exception as exc:
+            logger.warning("Sync metrics push failed: %s", exc)
+    return summary
+
+
+@shared_task
+def fail_sync_job(request, exc, traceback, run_id: str):
+    """
+    Chord errback: a chunk died (time limit, lost worker, crash) so the
+    callback never ran. Fail the run and keep the progress recorded so far.
+    """
+    run = JobRun.objects.select_related("job").get(id=run_id)
+    progress = (run.result or {}).get("progress")
+    logger.error("Scheduled sync run %s failed: %s", run_id, exc)
+    JobResultService.finalize_failure(run, exc)
+    run.result["progress"] = progress
+    run.finished_at = timezone.now()
+    run.save(update_fields=["result", "finished_at"])
 
 
 @shared_task
@@ -254,6 +399,7 @@ def run_scheduled_discovery_scan_job():
             scan_kind="all",
             scan_method="tcp",
             scan_port=22,
+            incremental=settings.DISCOVERY_INCREMENTAL,
         )
         run_discovery_scan_job.delay(str(job.id))
         scheduled += 1
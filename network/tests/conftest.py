@@ -0,0 +1,85 @@
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+
+from accounts.models.credentials import SSHCredential
+from dcim.choices import DevicePlatformChoices
+from dcim.models import (
+    Area,
+    Device,
+    DeviceRuntimeStatus,
+    DeviceType,
+    Organization,
+    Site,
+    Vendor,
+)
+from network.choices import CliCommandsChoices as cli
+
+
+IOS_FIXTURE_DIR = Path(settings.BASE_DIR) / "network" / "tests" / "fixtures" / "ios_xe"
+
+
+def _load_ios_fixture(name: str) -> str:
+    return (IOS_FIXTURE_DIR / name).read_text(encoding="utf-8")
+
+
+@pytest.fixture()
+def ios_xe_device_with_cred(db):
+    org = Organization.objects.create(name="Test Org")
+    site = Site.objects.create(name="Berlin", organization=org)
+    area = Area.objects.create(name="A101", site=site)
+    vendor = Vendor.objects.create(name="Cisco")
+    device_type = DeviceType.objects.create(
+        model="C9300-48P",
+        platform=DevicePlatformChoices.IOS_XE,
+        vendor=vendor,
+    )
+    device = Device.objects.create(
+        name="bcsw01-a179d-01.dwelle.de",
+        management_ip="10.10.10.10",
+        site=site,
+        area=area,
+        device_type=device_type,
+    )
+    DeviceRuntimeStatus.objects.create(device=device)
+    SSHCredential.objects.create(
+        site=site,
+        name="default",
+        type="ssh",
+        ssh_username="user",
+        ssh_password="pass",
+        ssh_port=22,
+    )
+    return device
+
+
+class FakeNetmikoAdapter:
+    def __init__(self, device, allow_autodetect=False):
+        self.device = device
+        self.allow_autodetect = allow_autodetect
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, exc_tb):
+        return False
+
+    def run_command_raw(self, command: str) -> dict:
+        mapping = {
+            cli.VERSION_CMD: _load_ios_fixture("show_version.txt"),
+            cli.INVENTORY_CMD: _load_ios_fixture("show_inventory.txt"),
+            cli.IF_STATUS_CMD: _load_ios_fixture("show_interface_status.txt"),
+            cli.IF_DESC_CMD: _load_ios_fixture("show_interface_description.txt"),
+            cli.IF_IP_BRIEF_CMD: _load_ios_fixture("show_ip_interface_brief.txt"),
+            cli.PORTCHANNEL_SUMMARY_ISO_CMD: _load_ios_fixture("show_etherchannel_summary.txt"),
+            cli.STACK_SWITCH_CMD: _load_ios_fixture("show_switch.txt"),
+            cli.CDP_NEIGHBORS_DETAIL_CMD: _load_ios_fixture("show_cdp_neighbors_detail.txt"),
+        }
+        return {"raw": mapping.get(command, ""), "parsed": None, "error": None}
+
+
+@pytest.fixture()
+def fake_netmiko_adapter():
+    """``NetmikoAdapter`` stand-in that answers from the IOS-XE fixture outputs."""
+    return FakeNetmikoAdapter
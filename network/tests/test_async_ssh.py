@@ -0,0 +1,250 @@
+import asyncio
+import threading
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+
+from dcim.choices import DevicePlatformChoices
+from dcim.models import Device, DeviceType, Interface
+from network.adapters.async_ssh import (
+    AsyncCollectionEngine,
+    AsyncSSHSession,
+    CollectionRequest,
+)
+from network.choices import CliCommandsChoices as cli
+from network.services.sync_service import SyncService
+
+
+class FakeStdin:
+    def __init__(self, device):
+        self.device = device
+
+    def write(self, data):
+        self.device.handle(data)
+
+
+class FakeStdout:
+    def __init__(self, device):
+        self.device = device
+
+    async def read(self, _size):
+        return await self.device.output.get()
+
+
+class FakeCliDevice:
+    """Echoes commands and answers with canned output followed by a prompt."""
+
+    def __init__(self, outputs):
+        self.outputs = outputs
+        self.sent = []
+        self.output = asyncio.Queue()
+        self.stdin = FakeStdin(self)
+        self.stdout = FakeStdout(self)
+
+    def handle(self, data):
+        command = data.rstrip("\n")
+        self.sent.append(command)
+        body = self.outputs.get(command, "")
+        reply = f"{command}\r\n{body}\r\n" if command else "\r\n"
+        # Split the reply to exercise reads that stop mid-prompt.
+        self.output.put_nowait(reply + "sw01")
+        self.output.put_nowait("#")
+
+    async def create_process(self, **_kwargs):
+        return self
+
+    def close(self):
+        pass
+
+    async def wait_closed(self):
+        pass
+
+
+def test_async_session_disables_paging_and_strips_echo():
+    device = FakeCliDevice({cli.VERSION_CMD: "Cisco IOS XE Software\r\nsw01 uptime is 1 week"})
+
+    async def _run():
+        async def _connect(*_args, **_kwargs):
+            return device
+
+        with patch("network.adapters.async_ssh.asyncssh.connect", _connect):
+            async with AsyncSSHSession({"device_type": "cisco_ios", "host": "10.0.0.1"}) as session:
+                return session.prompt, await session.run_command_raw(cli.VERSION_CMD)
+
+    prompt, result = asyncio.run(_run())
+
+    assert prompt == "sw01#"
+    assert device.sent[:3] == ["", "terminal length 0", "terminal width 511"]
+    assert result == {
+        "raw": "Cisco IOS XE Software\nsw01 uptime is 1 week",
+        "parsed": None,
+        "error": None,
+    }
+
+
+def test_async_session_aborts_on_a_command_timeout():
+    device = FakeCliDevice({})
+
+    def handle(data):
+        command = data.rstrip("\n")
+        device.sent.append(command)
+        if command != cli.VERSION_CMD:
+            device.output.put_nowait(f"{command}\r\nsw01#")
+
+    device.handle = handle
+
+    async def _run():
+        async def _connect(*_args, **_kwargs):
+            return device
+
+        with patch("network.adapters.async_ssh.asyncssh.connect", _connect):
+            async with AsyncSSHSession(
+                {"device_type": "cisco_ios", "host": "10.0.0.1"}, command_timeout=0.05
+            ) as session:
+                await session.run_command_raw(cli.VERSION_CMD)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(_run())
+
+
+def test_async_session_rejects_unsupported_platforms():
+    async def _run():
+        async with AsyncSSHSession({"device_type": "autodetect", "host": "10.0.0.1"}):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(_run())
+
+
+class FakeAsyncSession:
+    in_flight = 0
+    peak = 0
+
+    def __init__(self, params, *, command_timeout):
+        self.params = params
+
+    async def __aenter__(self):
+        cls = type(self)
+        cls.in_flight += 1
+        cls.peak = max(cls.peak, cls.in_flight)
+        await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, exc_type, exc, exc_tb):
+        type(self).in_flight -= 1
+
+    async def run_command_raw(self, command):
+        if command == cli.CDP_NEIGHBORS_DETAIL_CMD:
+            return {"raw": "% Invalid input detected", "parsed": None, "error": None}
+        return {"raw": f"{self.params['host']}:{command}", "parsed": None, "error": None}
+
+
+def test_engine_bounds_sessions_and_apply_workers():
+    FakeAsyncSession.in_flight = FakeAsyncSession.peak = 0
+    plan = [(cli.VERSION_CMD,), (cli.CDP_NEIGHBORS_DETAIL_CMD, cli.CDP_NEIGHBORS_CMD)]
+    requests = [
+        CollectionRequest(key=i, params={"host": f"10.0.0.{i}"}, plan=plan) for i in range(12)
+    ]
+    apply_threads = set()
+
+    def _apply(collected):
+        apply_threads.add(threading.get_ident())
+        return collected.results[cli.CDP_NEIGHBORS_DETAIL_CMD]["raw"]
+
+    engine = AsyncCollectionEngine(
+        max_sessions=3,
+        apply_workers=2,
+        session_factory=FakeAsyncSession,
+    )
+    completed = engine.run(requests, _apply)
+
+    assert sorted(result.key for result in completed) == list(range(12))
+    assert FakeAsyncSession.peak <= 3
+    assert len(apply_threads) <= 2
+    assert threading.get_ident() not in apply_threads
+    by_key = {result.key: result for result in completed}
+    assert by_key[4].applied == f"10.0.0.4:{cli.CDP_NEIGHBORS_CMD}"
+    assert by_key[4].results[cli.VERSION_CMD]["raw"] == f"10.0.0.4:{cli.VERSION_CMD}"
+
+
+def test_engine_reports_collection_failures_after_retries():
+    attempts = []
+
+    class BrokenSession(FakeAsyncSession):
+        async def __aenter__(self):
+            attempts.append(self.params["host"])
+            raise ConnectionError("refused")
+
+    engine = AsyncCollectionEngine(session_factory=BrokenSession)
+    completed = engine.run(
+        [CollectionRequest(key="sw", params={"host": "10.0.0.9"}, plan=[(cli.VERSION_CMD,)])],
+        lambda collected: collected.error,
+    )
+
+    assert attempts == ["10.0.0.9", "10.0.0.9"]
+    assert isinstance(completed[0].applied, ConnectionError)
+
+
+@pytest.mark.django_db
+def test_apply_collected_matches_sync_device(ios_xe_device_with_cred, fake_netmiko_adapter):
+    device = ios_xe_device_with_cred
+    service = SyncService(site=device.site)
+    adapter = fake_netmiko_adapter(device)
+
+    class AdapterSession(FakeAsyncSession):
+        async def run_command_raw(self, command):
+            return adapter.run_command_raw(command)
+
+    engine = AsyncCollectionEngine(session_factory=AdapterSession)
+    collected = asyncio.run(
+        engine.collect(
+            CollectionRequest(
+                key=device.id,
+                params={},
+                plan=service.build_collection_plan(device),
+            )
+        )
+    )
+    result = service.apply_collected(device, collected.results)
+
+    assert result["success"] is True
+    assert Device.objects.get(id=device.id).serial_number == "FOC2340X01D"
+    assert Interface.objects.filter(device=device, name="Gi2/0/3").exists()
+
+
+@pytest.mark.django_db
+def test_sync_runner_sends_unsupported_platforms_through_netmiko(ios_xe_device_with_cred, fake_netmiko_adapter):
+    ios = ios_xe_device_with_cred
+    eos_type = DeviceType.objects.create(
+        model="DCS-7050", platform=DevicePlatformChoices.EOS, vendor=ios.device_type.vendor
+    )
+    eos = Device.objects.create(
+        name="eos-leaf01", management_ip="10.10.10.11", site=ios.site, area=ios.area, device_type=eos_type
+    )
+    netmiko_synced = []
+
+    class RecordingAdapter(fake_netmiko_adapter):
+        def __enter__(self):
+            netmiko_synced.append(self.device.name)
+            return self
+
+    engines = []
+
+    class RecordingEngine(AsyncCollectionEngine):
+        def run(self, requests, apply):
+            requests = list(requests)
+            engines.append([request.params["host"] for request in requests])
+            return []
+
+    out = StringIO()
+    with patch("network.services.sync_service.NetmikoAdapter", RecordingAdapter), patch(
+        "network.management.commands.sync_runner.AsyncCollectionEngine", RecordingEngine
+    ):
+        call_command("sync_runner", site_id=str(ios.site_id), async_sessions=4, pushgateway="", stdout=out)
+
+    assert engines == [[ios.management_ip]]
+    assert netmiko_synced == [eos.name]
+    assert "[OK] eos-leaf01" in out.getvalue()
+
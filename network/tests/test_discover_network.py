@@ -0,0 +1,183 @@
+import socket
+import types
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from dcim.models import Area, Device, DeviceRuntimeStatus, Organization, Site
+from dcim.services.dns_resolver import ReverseResolver
+from network.models.discovery import DiscoveryCandidate, DiscoveryScanJob
+from network.services.discover_network import NetworkDiscoveryService
+from network.services.discovery_scanner import DiscoveryScanner, ScanResult
+from network.tasks import run_discovery_scan_job
+
+
+@pytest.fixture
+def site(db):
+    organization = Organization.objects.create(name="DiscoverOrg")
+    return Site.objects.create(name="Discover", organization=organization)
+
+
+def _fake_stream(alive_hosts, seen):
+    """Stand-in for ``stream_tcp_ranges`` that records what it was handed and pulls lazily."""
+
+    def stream(ranges, **kwargs):
+        for key, ips, port in ranges:
+            seen.append(ips)
+            for index, ip in enumerate(ips):
+                if index >= 50:
+                    break
+                yield key, ScanResult(
+                    ip=ip,
+                    alive=index < alive_hosts,
+                    hostname=f"edge-sw{index:02d}.example.com" if index < alive_hosts else None,
+                    method="tcp",
+                    port=port,
+                )
+
+    return stream
+
+
+@pytest.mark.django_db
+def test_scan_range_streams_hosts_and_writes_alive_ones_in_batches(site, settings):
+    settings.DISCOVERY_WRITE_BATCH_SIZE = 2
+    service = NetworkDiscoveryService(site=site)
+    seen = []
+    batches = []
+
+    with patch.object(service.scanner, "stream_tcp_ranges", _fake_stream(5, seen)):
+        alive = service._scan_range(
+            SimpleNamespace(cidr="10.20.0.0/16", scan_method="tcp", scan_port=22),
+            on_batch=batches.append,
+        )
+
+    assert alive == 5
+    assert batches == [2, 2, 1]
+    # the /16 is never materialized
+    assert isinstance(seen[0], types.GeneratorType)
+    candidates = DiscoveryCandidate.objects.filter(site=site).order_by("ip_address")
+    assert [c.ip_address for c in candidates] == [f"10.20.0.{i}" for i in range(1, 6)]
+    assert all(c.reachable_ssh and not c.reachable_ping and c.last_seen == service.now for c in candidates)
+
+
+@pytest.mark.django_db
+def test_discovery_scan_job_reports_alive_count_per_batch(site, settings):
+    settings.DISCOVERY_WRITE_BATCH_SIZE = 3
+    job = DiscoveryScanJob.objects.create(site=site, scan_kind="cidr", scan_params={"cidr": "10.21.0.0/24"})
+    progress = []
+    save = DiscoveryScanJob.save
+
+    def recording_save(self, *args, **kwargs):
+        if kwargs.get("update_fields") == ["alive_count"]:
+            progress.append(self.alive_count)
+        return save(self, *args, **kwargs)
+
+    with patch.object(DiscoveryScanner, "stream_tcp_ranges", side_effect=_fake_stream(7, [])), patch.object(
+        DiscoveryScanJob, "save", recording_save
+    ):
+        run_discovery_scan_job.run(str(job.id))
+
+    job.refresh_from_db()
+    assert job.status == DiscoveryScanJob.Status.COMPLETED
+    assert progress == [3, 6, 7]
+    assert (job.alive_count, job.processed_ranges, job.new_count) == (7, 1, 7)
+
+
+@pytest.mark.django_db
+def test_store_candidates_upserts_in_one_statement_and_keeps_review_state(site, django_assert_num_queries):
+    service = NetworkDiscoveryService(site=site)
+    DiscoveryCandidate.objects.create(
+        site=site,
+        ip_address="10.22.0.1",
+        hostname="old-name",
+        reachable_ping=True,
+        last_seen=service.now,
+        classified=True,
+        accepted=False,
+    )
+    batch = [
+        (ScanResult(ip=f"10.22.0.{i}", alive=True, method="tcp", port=22), f"edge-sw{i:02d}")
+        for i in range(1, 201)
+    ]
+
+    # select known IPs + one INSERT ... ON CONFLICT DO UPDATE (+ savepoint pair)
+    with django_assert_num_queries(4):
+        assert service._store_candidates(batch) == 200
+
+    assert (service.first_seen, service.refreshed) == (199, 1)
+    assert DiscoveryCandidate.objects.filter(site=site).count() == 200
+    known = DiscoveryCandidate.objects.get(site=site, ip_address="10.22.0.1")
+    assert (known.hostname, known.reachable_ssh, known.reachable_ping) == ("edge-sw01", True, False)
+    assert (known.classified, known.accepted) == (True, False)
+
+    service._store_candidates(batch[:3])
+    assert (service.first_seen, service.refreshed) == (199, 4)
+
+
+@pytest.mark.django_db
+def test_classify_matches_in_memory_with_constant_queries(site, django_assert_num_queries):
+    area = Area.objects.create(name="Core", site=site)
+    core = Device.objects.create(name="core-sw01", management_ip="10.30.0.1", site=site, area=area)
+    dist = Device.objects.create(name="dist-sw01", management_ip="10.30.0.2", site=site, area=area)
+    DeviceRuntimeStatus.objects.create(device=dist, reachable_ping=True)
+    service = NetworkDiscoveryService(site=site)
+
+    def candidate(ip, hostname, **fields):
+        return DiscoveryCandidate(site=site, ip_address=ip, hostname=hostname, last_seen=service.now, **fields)
+
+    DiscoveryCandidate.objects.bulk_create(
+        [
+            candidate("10.30.0.1", "CORE-SW01", reachable_ssh=True),
+            candidate("10.30.0.2", "dist-sw01", reachable_ssh=True),
+            candidate("10.30.0.9", "dist-sw01"),
+            *(candidate(f"10.31.{i // 250}.{i % 250 + 1}", f"new-sw{i:03d}") for i in range(300)),
+        ]
+    )
+
+    # devices + candidates + one UPDATE per outcome + runtimes select/bulk_create/bulk_update
+    # (+ savepoint pair)
+    with django_assert_num_queries(10):
+        assert service._classify() == (2, 1, 300)
+
+    exact = DiscoveryCandidate.objects.get(ip_address="10.30.0.1")
+    assert (exact.classified, exact.accepted) == (True, True)
+    mismatch = DiscoveryCandidate.objects.get(ip_address="10.30.0.9")
+    assert (mismatch.classified, mismatch.accepted) == (True, False)
+    assert DiscoveryCandidate.objects.filter(classified=False, accepted__isnull=True).count() == 300
+    runtime = DeviceRuntimeStatus.objects.get(device=core)
+    assert (runtime.reachable_ssh, runtime.reachable_ping, runtime.last_check) == (True, False, service.now)
+    runtime = DeviceRuntimeStatus.objects.get(device=dist)
+    assert (runtime.reachable_ssh, runtime.reachable_ping, runtime.last_check) == (True, True, service.now)
+
+
+def test_stream_tcp_yields_every_host_and_resolves_alive_ones():
+    scanner = DiscoveryScanner(max_workers=2, tcp_concurrency=2)
+    ReverseResolver.cache.clear()
+
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        port = server.getsockname()[1]
+        with patch("dcim.services.dns_resolver._getnameinfo", return_value="core-sw01.example.com") as mock_dns:
+            results = list(scanner.stream_tcp((f"127.0.0.{i}" for i in range(1, 6)), port))
+
+    assert sorted(result.ip for result in results) == [f"127.0.0.{i}" for i in range(1, 6)]
+    alive = [result for result in results if result.alive]
+    assert alive == [
+        ScanResult(ip="127.0.0.1", alive=True, hostname="core-sw01.example.com", method="tcp", port=port)
+    ]
+    mock_dns.assert_called_once_with("127.0.0.1")
+
+
+def test_stream_icmp_pings_in_chunks():
+    scanner = DiscoveryScanner(max_workers=1)
+    chunks = []
+
+    def fake_scan(ips):
+        chunks.append(ips)
+        return [ScanResult(ip=ip, alive=False, method="icmp") for ip in ips]
+
+    with patch.object(scanner, "scan_icmp", side_effect=fake_scan):
+        results = list(scanner.stream_icmp((f"192.0.2.{i}" for i in range(1, 8)), chunk_size=3))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert len(results) == 7
@@ -1,3 +1,6 @@
+import asyncio
+import random
+import socket
 from types import SimpleNamespace
 from unittest.mock import patch
 
@@ -5,7 +8,14 @@ import subprocess
 
 import pytest
 
-from network.services.discovery_filtering import hostname_matches_filter, hostname_passes_filters
+from automation.engine.icmp_engine import IcmpUnavailableError
+from dcim.services.dns_resolver import ReverseResolver
+from network.benchmarks import HostnameFilterBenchmark
+from network.services.discovery_filtering import (
+    HostnameFilterMatcher,
+    hostname_matches_filter,
+    hostname_passes_filters,
+)
 from network.services.discovery_scanner import DiscoveryScanner
 
 
@@ -30,6 +40,37 @@ def test_hostname_passes_filters_accepts_when_any_filter_matches():
     assert hostname_passes_filters("edge-sw01", filters) is True
 
 
+def test_compiled_matcher_agrees_with_per_filter_evaluation():
+    rng = random.Random(7)
+    # a tiny alphabet makes terms overlap, nest and repeat
+    words = ["".join(rng.choice("ab-c") for _ in range(rng.randint(1, 4))) for _ in range(40)]
+
+    def terms():
+        chosen = rng.sample(words, rng.randint(0, 3))
+        return rng.choice([",", ", "]).join(term.upper() if rng.random() < 0.3 else term for term in chosen)
+
+    for _ in range(50):
+        filters = [
+            SimpleNamespace(hostname_contains=terms(), hostname_not_contains=terms())
+            for _ in range(rng.randint(0, 4))
+        ]
+        filters.append(SimpleNamespace(hostname_contains=" , ", hostname_not_contains=""))
+        matcher = HostnameFilterMatcher(filters)
+        for _ in range(50):
+            hostname = "".join(rng.choice("abcAB- ") for _ in range(rng.randint(0, 10)))
+            assert matcher.passes(hostname) == hostname_passes_filters(hostname, filters), (hostname, filters)
+
+    assert HostnameFilterMatcher([]).passes("") is True
+
+
+def test_filter_benchmark_reports_throughput_and_no_mismatches():
+    report = HostnameFilterBenchmark(hostnames=2000, filters=20, seed=3).run(label="test")
+
+    assert (report["hostnames"], report["filters"], report["mismatches"]) == (2000, 20, 0)
+    assert 0 < report["accepted"] < 2000
+    assert report["compiled"]["hostnames_per_sec"] > 0
+
+
 def test_ping_returns_false_on_timeout():
     scanner = DiscoveryScanner(max_workers=1)
 
@@ -42,9 +83,10 @@ def test_ping_returns_false_on_timeout():
 
 def test_scan_icmp_only_resolves_dns_for_alive_hosts():
     scanner = DiscoveryScanner(max_workers=1)
+    ReverseResolver.cache.clear()
 
-    with patch.object(scanner, "_ping", side_effect=[True, False]):
-        with patch.object(scanner, "_resolve_dns", return_value="edge-sw01.example.com") as mock_dns:
+    with patch.object(scanner, "_ping_batch", return_value={"192.0.2.51": True, "192.0.2.52": False}):
+        with patch("dcim.services.dns_resolver._getnameinfo", return_value="edge-sw01.example.com") as mock_dns:
             results = scanner.scan_icmp(["192.0.2.51", "192.0.2.52"])
 
     assert [result.alive for result in results] == [True, False]
@@ -53,21 +95,66 @@ def test_scan_icmp_only_resolves_dns_for_alive_hosts():
     mock_dns.assert_called_once_with("192.0.2.51")
 
 
+def test_ping_batch_falls_back_to_ping_command_for_unsupported_addresses():
+    scanner = DiscoveryScanner(max_workers=1)
+
+    with patch(
+        "network.services.discovery_scanner.IcmpPinger.open_socket",
+        side_effect=IcmpUnavailableError("no permission"),
+    ):
+        with patch.object(scanner, "_ping", return_value=True) as mock_ping:
+            assert scanner._ping_batch(["192.0.2.56", "2001:db8::1"]) == {
+                "192.0.2.56": True,
+                "2001:db8::1": True,
+            }
+
+    assert mock_ping.call_count == 2
+
+
 def test_scan_tcp_records_method_port_and_hostname():
     scanner = DiscoveryScanner(max_workers=1)
+    ReverseResolver.cache.clear()
 
-    with patch.object(scanner, "_tcp_check", side_effect=[True, False]):
-        with patch.object(scanner, "_resolve_dns", return_value="dist-sw01.example.com"):
-            results = scanner.scan_tcp(["192.0.2.53", "192.0.2.54"], port=22)
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        port = server.getsockname()[1]
+        with patch("dcim.services.dns_resolver._getnameinfo", return_value="dist-sw01.example.com") as mock_dns:
+            # 127.0.0.2 is on loopback too but nothing listens there
+            results = scanner.scan_tcp(["127.0.0.1", "127.0.0.2"], port=port)
 
+    assert [result.ip for result in results] == ["127.0.0.1", "127.0.0.2"]
     assert results[0].method == "tcp"
-    assert results[0].port == 22
+    assert results[0].port == port
     assert results[0].hostname == "dist-sw01.example.com"
     assert results[1].alive is False
+    assert results[1].hostname is None
+    mock_dns.assert_called_once_with("127.0.0.1")
 
 
-def test_tcp_check_returns_false_on_socket_error():
+def test_tcp_connect_returns_false_on_socket_error():
     scanner = DiscoveryScanner(max_workers=1)
 
-    with patch("network.services.discovery_scanner.socket.create_connection", side_effect=OSError()):
-        assert scanner._tcp_check("192.0.2.55", 22) is False
+    with patch("asyncio.open_connection", side_effect=OSError()):
+        assert asyncio.run(scanner._tcp_connect("192.0.2.55", 22)) is False
+
+
+def test_connect_stream_respects_concurrency_limit():
+    scanner = DiscoveryScanner(max_workers=1, tcp_concurrency=3, tcp_rate=0)
+    in_flight = peak = 0
+
+    async def fake_connect(ip, port):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return ip.endswith("7")
+
+    async def collect():
+        return [item async for item in scanner._connect_stream((f"192.0.2.{i}" for i in range(20)), 22)]
+
+    with patch.object(scanner, "_tcp_connect", side_effect=fake_connect):
+        results = asyncio.run(collect())
+
+    assert peak == 3
+    assert sorted(ip for ip, alive in results if alive) == ["192.0.2.17", "192.0.2.7"]
+    assert len(results) == 20
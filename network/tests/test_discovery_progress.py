@@ -0,0 +1,116 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+
+from dcim.models import Organization, Site
+from network.discovery_routing import websocket_urlpatterns
+from network.models.discovery import DiscoveryRange, DiscoveryScanJob
+from network.services.discovery_progress import discovery_scan_group
+from network.services.discovery_scanner import DiscoveryScanner, ScanResult, _interleave
+from network.tasks import run_discovery_scan_job
+
+IN_MEMORY_LAYER = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+
+
+def test_interleave_round_robins_a_bounded_number_of_iterables():
+    items = _interleave([["a1", "a2", "a3"], ["b1"], ["c1", "c2"]], active=2)
+
+    assert list(items) == ["a1", "b1", "a2", "c1", "a3", "c2"]
+
+
+def test_ranges_progress_together_under_one_connect_budget(settings):
+    settings.DISCOVERY_RANGE_CONCURRENCY = 2
+    scanner = DiscoveryScanner(max_workers=1, tcp_concurrency=4, tcp_rate=0)
+    in_flight = peak = 0
+    started = []
+
+    async def fake_connect(ip, port):
+        nonlocal in_flight, peak
+        started.append(ip)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return False
+
+    ranges = [
+        (name, [f"192.0.2.{base + i}" for i in range(10)], 22)
+        for name, base in (("a", 0), ("b", 100), ("c", 200))
+    ]
+    with patch.object(scanner, "_tcp_connect", side_effect=fake_connect):
+        results = list(scanner.stream_tcp_ranges(ranges))
+
+    assert peak == 4
+    assert started[:4] == ["192.0.2.0", "192.0.2.100", "192.0.2.1", "192.0.2.101"]
+    assert {key for key, _ in results} == {"a", "b", "c"}
+    assert sorted(result.ip for key, result in results if key == "c") == [f"192.0.2.{200 + i}" for i in range(10)]
+
+
+@pytest.mark.django_db
+def test_scan_job_scans_ranges_concurrently_and_pushes_progress(settings):
+    settings.CHANNEL_LAYERS = IN_MEMORY_LAYER
+    settings.DISCOVERY_PROGRESS_INTERVAL = 3600
+    organization = Organization.objects.create(name="ProgressOrg")
+    site = Site.objects.create(name="Progress", organization=organization)
+    DiscoveryRange.objects.create(site=site, cidr="10.50.0.0/29")
+    DiscoveryRange.objects.create(site=site, cidr="10.51.0.0/30")
+    job = DiscoveryScanJob.objects.create(site=site, scan_kind="all")
+    layer = get_channel_layer()
+    async_to_sync(layer.group_add)(discovery_scan_group(job.id), "progress-test")
+    handed = []
+
+    def fake_stream(ranges, **kwargs):
+        ranges = [(key, list(ips), port) for key, ips, port in ranges]
+        handed.append(len(ranges))
+        for index in range(max(len(ips) for _, ips, _ in ranges)):
+            for key, ips, port in ranges:
+                if index < len(ips):
+                    yield key, ScanResult(ip=ips[index], alive=index == 0, hostname="sw", method="tcp", port=port)
+
+    with patch.object(DiscoveryScanner, "stream_tcp_ranges", side_effect=fake_stream):
+        run_discovery_scan_job.run(str(job.id))
+
+    job.refresh_from_db()
+    assert handed == [2]
+    assert (job.status, job.processed_ranges, job.alive_count) == (DiscoveryScanJob.Status.COMPLETED, 2, 2)
+
+    events = [async_to_sync(layer.receive)("progress-test") for _ in range(4)]
+    assert [(e["status"], e["ranges_done"], e["hosts_probed"]) for e in events] == [
+        ("running", 0, 0),
+        ("running", 1, 4),
+        ("running", 2, 8),
+        ("completed", 2, 8),
+    ]
+    assert events[0]["hosts_total"] == 8
+    assert (events[-1]["alive"], events[-1]["new"], events[-1]["eta_seconds"]) == (2, 2, 0)
+
+
+def test_consumer_relays_progress_events_to_authenticated_users(settings):
+    settings.CHANNEL_LAYERS = IN_MEMORY_LAYER
+    job_id = "6f1c1d2e-8a4b-4f7e-9a52-1f9f2d3c4b5a"
+
+    async def scenario():
+        application = URLRouter(websocket_urlpatterns)
+        anonymous = WebsocketCommunicator(application, f"/ws/discovery/scan/{job_id}/")
+        anonymous.scope["user"] = SimpleNamespace(is_authenticated=False)
+        connected, _ = await anonymous.connect()
+        assert connected is False
+
+        communicator = WebsocketCommunicator(application, f"/ws/discovery/scan/{job_id}/")
+        communicator.scope["user"] = SimpleNamespace(is_authenticated=True)
+        connected, _ = await communicator.connect()
+        assert connected is True
+        await get_channel_layer().group_send(
+            discovery_scan_group(job_id),
+            {"type": "discovery.progress", "status": "running", "hosts_probed": 5},
+        )
+        assert await communicator.receive_json_from() == {"status": "running", "hosts_probed": 5}
+        await communicator.disconnect()
+
+    asyncio.run(scenario())
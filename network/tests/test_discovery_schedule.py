@@ -0,0 +1,156 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from dcim.choices import DeviceStatusChoices
+from dcim.models import Area, Device, DeviceRuntimeStatus, Organization, Site
+from network.models.discovery import DiscoveryCandidate, DiscoveryFilter, DiscoveryRange, DiscoveryScanJob
+from network.services.discover_network import NetworkDiscoveryService
+from network.services.discovery_scanner import DiscoveryScanner, ScanResult
+from network.services.discovery_schedule import DiscoveryScheduleService
+from network.tasks import run_discovery_scan_job, run_scheduled_discovery_scan_job
+
+
+@pytest.fixture
+def site(db):
+    organization = Organization.objects.create(name="DeltaOrg")
+    return Site.objects.create(name="Delta", organization=organization)
+
+
+def _fake_stream(alive_ips, probed):
+    def stream(ranges, **kwargs):
+        for key, ips, port in ranges:
+            for ip in ips:
+                probed.append(ip)
+                alive = ip in alive_ips
+                hostname = f"host-{ip}" if alive else None
+                yield key, ScanResult(ip=ip, alive=alive, hostname=hostname, method="tcp", port=port)
+
+    return stream
+
+
+def test_dead_interval_doubles_up_to_the_full_sweep_interval(settings):
+    settings.DISCOVERY_DEAD_BACKOFF_HOURS = 6
+    settings.DISCOVERY_FULL_SWEEP_HOURS = 48
+
+    assert [DiscoveryScheduleService.dead_interval(missed) for missed in (1, 2, 3, 4, 50)] == [
+        timedelta(hours=6),
+        timedelta(hours=12),
+        timedelta(hours=24),
+        timedelta(hours=48),
+        timedelta(hours=48),
+    ]
+
+
+@pytest.mark.django_db
+def test_incremental_scan_skips_fresh_devices_and_backs_off_dead_hosts(site, settings):
+    settings.DISCOVERY_DEAD_BACKOFF_HOURS = 6
+    service = NetworkDiscoveryService(site=site, incremental=True)
+    now = service.now
+    dr = DiscoveryRange.objects.create(site=site, cidr="10.40.0.0/28", last_full_scan=now - timedelta(hours=1))
+    area = Area.objects.create(name="Delta", site=site)
+    device = Device.objects.create(
+        name="core-sw01",
+        management_ip="10.40.0.1",
+        site=site,
+        area=area,
+        status=DeviceStatusChoices.STATUS_ACTIVE,
+    )
+    DeviceRuntimeStatus.objects.create(device=device, last_check=now - timedelta(minutes=5))
+
+    def candidate(ip, **fields):
+        return DiscoveryCandidate(site=site, ip_address=ip, last_seen=now - timedelta(days=1), **fields)
+
+    DiscoveryCandidate.objects.bulk_create(
+        [
+            candidate("10.40.0.1", alive=True),
+            candidate("10.40.0.2", alive=True),
+            candidate("10.40.0.3", missed_probes=3, next_probe=now + timedelta(days=1)),
+            candidate("10.40.0.4", missed_probes=1, next_probe=now - timedelta(minutes=1)),
+            candidate("10.41.0.1", alive=True),
+        ]
+    )
+    probed = []
+
+    with patch.object(service.scanner, "stream_tcp_ranges", _fake_stream({"10.40.0.2"}, probed)):
+        assert service._scan_range(dr) == 1
+
+    assert probed == ["10.40.0.2", "10.40.0.4"]
+    assert service.skipped == 14 - 2
+    dr.refresh_from_db()
+    assert dr.last_full_scan == now - timedelta(hours=1)
+    candidates = {str(c.ip_address): c for c in DiscoveryCandidate.objects.filter(site=site)}
+    assert (candidates["10.40.0.2"].missed_probes, candidates["10.40.0.2"].next_probe) == (0, None)
+    dead = candidates["10.40.0.4"]
+    assert (dead.alive, dead.missed_probes, dead.next_probe) == (False, 2, now + timedelta(hours=12))
+    assert candidates["10.40.0.3"].missed_probes == 3
+
+
+@pytest.mark.django_db
+def test_full_sweep_only_backs_off_silent_candidates_of_the_range(site):
+    DiscoveryFilter.objects.create(site=site, hostname_not_contains="10.43.0.2")
+    service = NetworkDiscoveryService(site=site, incremental=True)
+    dr = DiscoveryRange.objects.create(site=site, cidr="10.43.0.0/29")
+    DiscoveryCandidate.objects.bulk_create(
+        [
+            DiscoveryCandidate(site=site, ip_address=ip, alive=True, last_seen=service.now - timedelta(days=1))
+            for ip in ("10.43.0.2", "10.43.0.3", "10.44.0.3")
+        ]
+    )
+
+    with patch.object(service.scanner, "stream_tcp_ranges", _fake_stream({"10.43.0.1", "10.43.0.2"}, [])):
+        assert service._scan_range(dr) == 1
+
+    missed = dict(DiscoveryCandidate.objects.filter(site=site).values_list("ip_address", "missed_probes"))
+    # 10.43.0.2 answered but was filtered out; 10.44.0.3 is outside the range
+    assert missed == {"10.43.0.1": 0, "10.43.0.2": 0, "10.43.0.3": 1, "10.44.0.3": 0}
+
+
+@pytest.mark.django_db
+def test_manual_scan_does_not_back_off_silent_candidates(site):
+    service = NetworkDiscoveryService(site=site)
+    dr = DiscoveryRange.objects.create(site=site, cidr="10.45.0.0/29")
+    DiscoveryCandidate.objects.create(
+        site=site, ip_address="10.45.0.3", alive=True, last_seen=service.now - timedelta(days=1)
+    )
+
+    with patch.object(service.scanner, "stream_tcp_ranges", _fake_stream(set(), [])):
+        assert service._scan_range(dr) == 0
+
+    candidate = DiscoveryCandidate.objects.get(site=site, ip_address="10.45.0.3")
+    assert (candidate.alive, candidate.missed_probes, candidate.next_probe) == (True, 0, None)
+
+
+@pytest.mark.django_db
+def test_scheduled_scan_sweeps_every_host_once_the_full_sweep_is_due(site, settings):
+    settings.DISCOVERY_FULL_SWEEP_HOURS = 24
+    dr = DiscoveryRange.objects.create(site=site, cidr="10.42.0.0/29")
+    DiscoveryRange.objects.filter(pk=dr.pk).update(last_full_scan=dr.created_at - timedelta(days=2))
+    DiscoveryCandidate.objects.create(site=site, ip_address="10.42.0.5", alive=True, last_seen=dr.created_at)
+    probed = []
+
+    with patch.object(
+        DiscoveryScanner, "stream_tcp_ranges", side_effect=_fake_stream({"10.42.0.1"}, probed)
+    ), patch.object(run_discovery_scan_job, "delay") as delay:
+        run_scheduled_discovery_scan_job()
+        job = DiscoveryScanJob.objects.get(site=site)
+        assert job.incremental is True
+        run_discovery_scan_job.run(*delay.call_args.args)
+
+    job.refresh_from_db()
+    assert (job.status, job.skipped_count, job.alive_count) == (DiscoveryScanJob.Status.COMPLETED, 0, 1)
+    assert probed == [f"10.42.0.{i}" for i in range(1, 7)]
+    dr.refresh_from_db()
+    assert dr.last_full_scan == DiscoveryCandidate.objects.get(ip_address="10.42.0.1").last_seen
+    assert DiscoveryCandidate.objects.get(ip_address="10.42.0.5").missed_probes == 1
+
+    probed.clear()
+    with patch.object(DiscoveryScanner, "stream_tcp_ranges", side_effect=_fake_stream(set(), probed)):
+        job = DiscoveryScanJob.objects.create(site=site, scan_kind="all", incremental=True)
+        run_discovery_scan_job.run(str(job.id))
+
+    job.refresh_from_db()
+    # only the previously alive candidate is due; 10.42.0.5 backs off
+    assert probed == ["10.42.0.1"]
+    assert job.skipped_count == 5
@@ -0,0 +1,64 @@
+import pytest
+
+from dcim.models import Device, DeviceModule, DeviceStackMember, Organization
+from network.benchmarks import SyncReplayBenchmark, load_transcripts
+from network.benchmarks.replay import BENCHMARK_ORGANIZATION, StageMetrics, personalize_output, reset_peak_rss
+from network.choices import CliCommandsChoices as cli
+
+
+def test_transcripts_split_commands_on_the_recorded_prompt():
+    transcripts = {transcript.name: transcript for transcript in load_transcripts()}
+
+    assert set(transcripts) == {"aci_leaf", "ios_xe", "ios_xe_stack9", "nxos"}
+    stack = transcripts["ios_xe_stack9"]
+    assert stack.platform == "iosxe"
+    assert stack.hostname == "bcsw09-a100-01"
+    # "Switch#   Role ..." in the show switch header is output, not a prompt.
+    assert "Switch#   Role" in stack.outputs[cli.STACK_SWITCH_CMD]
+    assert not stack.outputs[cli.STACK_SWITCH_CMD].endswith("#")
+
+
+def test_personalize_output_prefixes_valid_serials_only():
+    raw = "PID: C9300-48P , VID: V02  , SN: FOC2340X01D\nPID: FAN , VID: N/A  , SN: N/A"
+
+    assert personalize_output(raw, 7) == (
+        "PID: C9300-48P , VID: V02  , SN: R00007FOC2340X01D\nPID: FAN , VID: N/A  , SN: N/A"
+    )
+
+
+@pytest.mark.skipif(not reset_peak_rss(), reason="needs a resettable RSS high-water mark")
+def test_measure_reports_the_peak_of_each_stage_only():
+    benchmark = SyncReplayBenchmark([])
+    big, small = StageMetrics(), StageMetrics()
+
+    with benchmark.measure(big):
+        ballast = bytearray(200 * 1024 * 1024)
+        ballast[::4096] = b"x" * len(ballast[::4096])
+        del ballast
+    with benchmark.measure(small):
+        pass
+
+    assert big.peak_rss_kb - small.peak_rss_kb > 150 * 1024
+
+
+@pytest.mark.django_db
+def test_replay_benchmark_reports_every_stage():
+    benchmark = SyncReplayBenchmark(load_transcripts(), devices_per_transcript=2, keep=True)
+
+    report = benchmark.run(label="test")
+
+    assert list(report["stages"]) == ["fleet_setup", "initial_sync", "resync", "forced_resync"]
+    initial = report["stages"]["initial_sync"]
+    assert initial["devices"] == 8
+    assert initial["failed"] == 0
+    assert initial["queries"] > report["stages"]["resync"]["queries"]
+    assert set(initial["profiles"]) == {"aci_leaf", "ios_xe", "ios_xe_stack9", "nxos"}
+    stack = Device.objects.get(name="bcsw09-a100-01-bench00000")
+    assert DeviceStackMember.objects.filter(device=stack).count() == 9
+    # Serials are personalized, so every device keeps its own modules.
+    assert DeviceModule.objects.filter(device__name="bcsw01-a179d-01-bench00001").exists()
+    assert DeviceModule.objects.filter(device__name="bcsw01-a179d-01-bench00000").exists()
+
+    benchmark.keep = False
+    benchmark.cleanup()
+    assert not Organization.objects.filter(name=BENCHMARK_ORGANIZATION).exists()
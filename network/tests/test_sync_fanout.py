@@ -0,0 +1,115 @@
+from collections import Counter
+from unittest.mock import patch
+
+import pytest
+from celery import current_app
+from celery.exceptions import TimeLimitExceeded
+
+from automation.choices import JobStatus, JobType
+from automation.models import JobRun
+from dcim.choices import DevicePlatformChoices
+from dcim.models import Area, Device, DeviceType, Organization, Site, Tag, Vendor
+from network.tasks import _plan_sync_chunks, fail_sync_job, run_scheduled_sync_job
+
+
+def test_plan_sync_chunks_respects_global_and_site_limits():
+    devices = [(f"a{i}", "site-a") for i in range(10)]
+    devices += [(f"b{i}", "site-b") for i in range(3)]
+    devices += [("c0", None)]
+
+    chunks = _plan_sync_chunks(devices, global_concurrency=4, site_concurrency=2)
+
+    assert len(chunks) <= 4
+    assert sorted(d for chunk in chunks for d in chunk) == sorted(d for d, _ in devices)
+    site_lanes = Counter()
+    for chunk in chunks:
+        for prefix in {device_id[0] for device_id in chunk}:
+            site_lanes[prefix] += 1
+    assert site_lanes["a"] <= 2
+    assert site_lanes["b"] <= 2
+
+
+@pytest.fixture()
+def fleet(db):
+    org = Organization.objects.create(name="Fleet Org")
+    vendor = Vendor.objects.create(name="Cisco")
+    device_type = DeviceType.objects.create(
+        model="C9300-48P",
+        platform=DevicePlatformChoices.IOS_XE,
+        vendor=vendor,
+    )
+    no_sync = Tag.objects.create(name="no_sync")
+    devices = []
+    for site_name in ("Berlin", "Bonn"):
+        site = Site.objects.create(name=site_name, organization=org)
+        area = Area.objects.create(name="A1", site=site)
+        for i in range(3):
+            devices.append(
+                Device.objects.create(
+                    name=f"{site_name.lower()}-sw{i}",
+                    management_ip=f"10.{len(devices)}.0.1",
+                    site=site,
+                    area=area,
+                    device_type=device_type,
+                    status="active",
+                )
+            )
+    devices[-1].tags.add(no_sync)
+    return devices
+
+
+@pytest.mark.django_db
+def test_run_scheduled_sync_job_fans_out_and_aggregates(fleet, monkeypatch):
+    monkeypatch.setattr(current_app.conf, "task_always_eager", True)
+    failing = fleet[0].id
+
+    def fake_sync(self, device, **kwargs):
+        return {
+            "device": device,
+            "success": device.id != failing,
+            "error": "boom",
+            "stages": {"collect": {"seconds": 0.5, "queries": 0}, "write": {"seconds": 0.25, "queries": 3}},
+        }
+
+    with patch("network.tasks.SyncService.sync_device", fake_sync):
+        dispatch = run_scheduled_sync_job.apply(
+            kwargs={"global_concurrency": 3, "site_concurrency": 2}
+        ).get()
+
+    assert dispatch["devices"] == 5
+    run = JobRun.objects.select_related("job").get(id=dispatch["run_id"])
+    assert run.job.job_type == JobType.DEVICE_SYNC
+    assert run.status == JobStatus.SUCCESS
+    assert run.finished_at is not None
+    assert run.result["artifacts"] == {
+        "success": 4,
+        "failed": 1,
+        "skipped": 0,
+        "stages": {
+            "collect": {"seconds": 2.5, "queries": 0, "devices": 5},
+            "write": {"seconds": 1.25, "queries": 15, "devices": 5},
+        },
+    }
+    assert run.result["progress"] == {"total": 5, "success": 4, "failed": 1, "skipped": 0}
+    assert run.devices.count() == 5
+
+
+@pytest.mark.django_db
+def test_run_scheduled_sync_job_without_devices_returns_the_dispatch_shape():
+    assert run_scheduled_sync_job.apply().get() == {"run_id": None, "devices": 0, "chunks": 0}
+
+
+@pytest.mark.django_db
+def test_failed_chunk_fails_the_run_and_keeps_its_progress(fleet):
+    with patch("network.tasks.chord") as dispatch:
+        run_id = run_scheduled_sync_job.apply().get()["run_id"]
+    errback = dispatch.return_value.call_args.args[0].options["link_error"][0]
+    assert errback["task"] == fail_sync_job.name
+
+    fail_sync_job(None, TimeLimitExceeded(300), None, *errback["args"])
+
+    run = JobRun.objects.select_related("job").get(id=run_id)
+    assert (run.status, run.job.status) == (JobStatus.FAILED, JobStatus.FAILED)
+    assert run.finished_at is not None
+    assert run.result["progress"] == {"total": 5, "success": 0, "failed": 0, "skipped": 0}
+    assert "TimeLimitExceeded" in run.result["error"]
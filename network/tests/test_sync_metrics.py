@@ -0,0 +1,86 @@
+import json
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+
+from network.choices import CliCommandsChoices as cli
+from network.services.sync_metrics import SyncMetricsSummary
+from network.services.sync_service import SyncService
+
+
+@pytest.mark.django_db
+def test_sync_device_reports_stage_breakdown(ios_xe_device_with_cred, fake_netmiko_adapter):
+    service = SyncService(site=ios_xe_device_with_cred.site)
+    with patch("network.services.sync_service.NetmikoAdapter", fake_netmiko_adapter):
+        result = service.sync_device(ios_xe_device_with_cred)
+
+    stages = result["stages"]
+    for name in (
+        "collect",
+        "connect",
+        f"command:{cli.VERSION_CMD}",
+        f"command:{cli.CDP_NEIGHBORS_DETAIL_CMD}",
+        f"command:{cli.LLDP_NEIGHBORS_CMD}",
+        "parse",
+        "write",
+        "apply:version",
+        "apply:inventory",
+        "apply:interfaces",
+        "apply:stack",
+        "topology",
+    ):
+        assert name in stages, name
+    assert stages["apply:interfaces"]["queries"] > 0
+    assert stages["write"]["queries"] >= stages["apply:interfaces"]["queries"]
+    assert result["timings"]["write"] == pytest.approx(stages["write"]["seconds"], abs=1e-5)
+
+
+def test_metrics_summary_ranks_devices_and_stages():
+    summary = SyncMetricsSummary()
+    summary.add(
+        "fast",
+        {"stages": {"collect": {"seconds": 1.0, "queries": 0}, "apply:version": {"seconds": 0.1, "queries": 2}}},
+    )
+    summary.add(
+        "slow",
+        {
+            "stages": {
+                "collect": {"seconds": 5.0, "queries": 0},
+                "write": {"seconds": 2.0, "queries": 40},
+                "apply:interfaces": {"seconds": 1.5, "queries": 30},
+            }
+        },
+    )
+    summary.add("skipped", {"success": False, "skipped": True})
+
+    assert [name for name, _ in summary.slowest_devices()] == ["slow", "fast"]
+    assert summary.devices["slow"]["seconds"] == 7.0
+    assert [name for name, _ in summary.slowest_stages()] == ["apply:interfaces", "apply:version"]
+
+    merged = SyncMetricsSummary()
+    merged.add_stage_totals(summary.as_dict()["stages"])
+    merged.add_stage_totals(summary.as_dict()["stages"])
+    assert merged.stage_totals["collect"] == {"seconds": 12.0, "queries": 0, "devices": 4}
+
+
+@pytest.mark.django_db
+def test_sync_runner_prints_summary_and_exports_metrics(ios_xe_device_with_cred, tmp_path, fake_netmiko_adapter):
+    out = StringIO()
+    metrics_path = tmp_path / "metrics.json"
+    with patch("network.services.sync_service.NetmikoAdapter", fake_netmiko_adapter):
+        call_command(
+            "sync_runner",
+            device=ios_xe_device_with_cred.name,
+            metrics_json=str(metrics_path),
+            pushgateway="",
+            stdout=out,
+        )
+
+    output = out.getvalue()
+    assert "Slowest devices" in output
+    assert "Slowest stages" in output
+    exported = json.loads(metrics_path.read_text())
+    assert ios_xe_device_with_cred.name in exported["devices"]
+    assert exported["stages"]["apply:interfaces"]["devices"] == 1
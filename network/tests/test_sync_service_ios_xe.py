@@ -145,3 +145,35 @@ def test_apply_stack_members_from_raw(ios_xe_device):
     assert ios_xe_device.stack_members.count() == 2
     assert ios_xe_device.stack_members.filter(switch_number=2).exists()
     assert ios_xe_device.stack_members.filter(switch_number=3).exists()
+
+
+@pytest.mark.django_db
+def test_apply_interfaces_is_write_free_when_unchanged(ios_xe_device, django_assert_num_queries):
+    service = SyncService(site=ios_xe_device.site)
+    results = {
+        cli.IF_STATUS_CMD: {"raw": _load_fixture("show_interface_status.txt")},
+        cli.IF_DESC_CMD: {"raw": _load_fixture("show_interface_description.txt")},
+        cli.IF_IP_BRIEF_CMD: {"raw": _load_fixture("show_ip_interface_brief.txt")},
+        cli.PORTCHANNEL_SUMMARY_ISO_CMD: {"raw": _load_fixture("show_etherchannel_summary.txt")},
+    }
+    service._parse_results(ios_xe_device, results)
+    kwargs = {
+        "device": ios_xe_device,
+        "status_result": results[cli.IF_STATUS_CMD],
+        "desc_result": results[cli.IF_DESC_CMD],
+        "ip_result": results[cli.IF_IP_BRIEF_CMD],
+        "po_result": results[cli.PORTCHANNEL_SUMMARY_ISO_CMD],
+    }
+    service._apply_interfaces(**kwargs)
+
+    with django_assert_num_queries(1):
+        service._apply_interfaces(**kwargs)
+
+    Interface.objects.filter(device=ios_xe_device, name="Gi2/0/3").update(description="stale")
+    with django_assert_num_queries(2):
+        service._apply_interfaces(**kwargs)
+    assert Interface.objects.get(device=ios_xe_device, name="Gi2/0/3").description != "stale"
+
+    Interface.objects.create(device=ios_xe_device, name="Gi9/0/99")
+    service._apply_interfaces(**kwargs)
+    assert not Interface.objects.filter(device=ios_xe_device, name="Gi9/0/99").exists()
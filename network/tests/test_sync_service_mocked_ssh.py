@@ -1,91 +1,26 @@
-from pathlib import Path
 from unittest.mock import patch
 
 import pytest
-from django.conf import settings
+from django.db import connection, transaction
 
-from accounts.models.credentials import SSHCredential
-from dcim.choices import DevicePlatformChoices, InterfaceStatusChoices
+from dcim.choices import InterfaceStatusChoices
 from dcim.models import (
-    Area,
     Device,
     DeviceRuntimeStatus,
-    DeviceType,
     DeviceModule,
-    Organization,
-    Site,
-    Vendor,
+    DeviceType,
     Interface,
 )
+from dcim.services.dns_resolver import ReverseResolver
 from network.choices import CliCommandsChoices as cli
 from network.services.sync_service import SyncService
-
-
-IOS_FIXTURE_DIR = Path(settings.BASE_DIR) / "network" / "tests" / "fixtures" / "ios_xe"
-
-
-def _load_ios_fixture(name: str) -> str:
-    return (IOS_FIXTURE_DIR / name).read_text(encoding="utf-8")
-
-
-@pytest.fixture()
-def ios_xe_device_with_cred(db):
-    org = Organization.objects.create(name="Test Org")
-    site = Site.objects.create(name="Berlin", organization=org)
-    area = Area.objects.create(name="A101", site=site)
-    vendor = Vendor.objects.create(name="Cisco")
-    device_type = DeviceType.objects.create(
-        model="C9300-48P",
-        platform=DevicePlatformChoices.IOS_XE,
-        vendor=vendor,
-    )
-    device = Device.objects.create(
-        name="bcsw01-a179d-01.dwelle.de",
-        management_ip="10.10.10.10",
-        site=site,
-        area=area,
-        device_type=device_type,
-    )
-    DeviceRuntimeStatus.objects.create(device=device)
-    SSHCredential.objects.create(
-        site=site,
-        name="default",
-        type="ssh",
-        ssh_username="user",
-        ssh_password="pass",
-        ssh_port=22,
-    )
-    return device
-
-
-class FakeNetmikoAdapter:
-    def __init__(self, device, allow_autodetect=False):
-        self.device = device
-        self.allow_autodetect = allow_autodetect
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc, exc_tb):
-        return False
-
-    def run_command_raw(self, command: str) -> dict:
-        mapping = {
-            cli.VERSION_CMD: _load_ios_fixture("show_version.txt"),
-            cli.INVENTORY_CMD: _load_ios_fixture("show_inventory.txt"),
-            cli.IF_STATUS_CMD: _load_ios_fixture("show_interface_status.txt"),
-            cli.IF_DESC_CMD: _load_ios_fixture("show_interface_description.txt"),
-            cli.IF_IP_BRIEF_CMD: _load_ios_fixture("show_ip_interface_brief.txt"),
-            cli.PORTCHANNEL_SUMMARY_ISO_CMD: _load_ios_fixture("show_etherchannel_summary.txt"),
-            cli.STACK_SWITCH_CMD: _load_ios_fixture("show_switch.txt"),
-        }
-        return {"raw": mapping.get(command, ""), "parsed": None, "error": None}
+from topology.models import TopologyNeighbor
 
 
 @pytest.mark.django_db
-def test_sync_device_with_mocked_ssh(ios_xe_device_with_cred):
+def test_sync_device_with_mocked_ssh(ios_xe_device_with_cred, fake_netmiko_adapter):
     service = SyncService(site=ios_xe_device_with_cred.site)
-    with patch("network.services.sync_service.NetmikoAdapter", FakeNetmikoAdapter):
+    with patch("network.services.sync_service.NetmikoAdapter", fake_netmiko_adapter):
         result = service.sync_device(ios_xe_device_with_cred, include_config=False)
 
     assert result["success"] is True
@@ -105,10 +40,10 @@ def test_sync_device_with_mocked_ssh(ios_xe_device_with_cred):
 
 
 @pytest.mark.django_db
-def test_sync_device_retry_on_failure(ios_xe_device_with_cred):
+def test_sync_device_retry_on_failure(ios_xe_device_with_cred, fake_netmiko_adapter):
     call_count = {"value": 0}
 
-    class FlakyNetmikoAdapter(FakeNetmikoAdapter):
+    class FlakyNetmikoAdapter(fake_netmiko_adapter):
         def __enter__(self):
             call_count["value"] += 1
             if call_count["value"] == 1:
@@ -121,3 +56,123 @@ def test_sync_device_retry_on_failure(ios_xe_device_with_cred):
 
     assert call_count["value"] == 2
     assert result["success"] is True
+
+
+@pytest.mark.django_db
+def test_sync_device_collects_topology_over_the_sync_session(ios_xe_device_with_cred, fake_netmiko_adapter):
+    sessions = []
+
+    class CountingNetmikoAdapter(fake_netmiko_adapter):
+        def __enter__(self):
+            sessions.append(self)
+            return self
+
+    service = SyncService(site=ios_xe_device_with_cred.site)
+    with patch("network.services.sync_service.NetmikoAdapter", CountingNetmikoAdapter), patch(
+        "automation.tasks.topology_collector.NetmikoAdapter",
+        side_effect=AssertionError("topology must not open its own session"),
+    ):
+        result = service.sync_device(ios_xe_device_with_cred, include_config=False)
+
+    assert result["success"] is True
+    assert len(sessions) == 1
+    neighbor = TopologyNeighbor.objects.get(device=ios_xe_device_with_cred, protocol="cdp")
+    assert neighbor.local_interface.name == "Gi2/0/3"
+    assert neighbor.neighbor_interface == "GigabitEthernet1/0/48"
+
+
+
+@pytest.mark.django_db
+def test_sync_device_resolves_ip_named_neighbors_before_the_write_transaction(
+    ios_xe_device_with_cred, fake_netmiko_adapter
+):
+    class IpNeighborAdapter(fake_netmiko_adapter):
+        def run_command_raw(self, command):
+            result = super().run_command_raw(command)
+            if command == cli.CDP_NEIGHBORS_DETAIL_CMD:
+                result["raw"] = result["raw"].replace("bcsw02-a179d-01.dwelle.de", "10.10.10.11")
+            return result
+
+    outer_blocks = len(connection.atomic_blocks)
+    lookups = []
+
+    def _resolve_many_sync(ips):
+        lookups.append((list(ips), len(connection.atomic_blocks)))
+        return {"10.10.10.11": "bcsw02-a179d-01.dwelle.de."}
+
+    service = SyncService(site=ios_xe_device_with_cred.site)
+    with patch("network.services.sync_service.NetmikoAdapter", IpNeighborAdapter), patch.object(
+        ReverseResolver, "resolve_many_sync", side_effect=_resolve_many_sync
+    ):
+        result = service.sync_device(ios_xe_device_with_cred, include_config=False)
+
+    assert result["success"] is True
+    assert lookups == [(["10.10.10.11"], outer_blocks)]
+    neighbor = TopologyNeighbor.objects.get(device=ios_xe_device_with_cred, protocol="cdp")
+    assert neighbor.neighbor_name == "bcsw02-a179d-01.dwelle.de"
+
+@pytest.mark.django_db
+def test_sync_device_skips_stages_with_unchanged_output(ios_xe_device_with_cred, fake_netmiko_adapter):
+    device = ios_xe_device_with_cred
+    with patch("network.services.sync_service.NetmikoAdapter", fake_netmiko_adapter):
+        first = SyncService(site=device.site).sync_device(device)
+        assert first["skipped_stages"] == []
+
+        Interface.objects.filter(device=device, name="Gi2/0/3").update(description="manual")
+        second_service = SyncService(site=device.site)
+        second = second_service.sync_device(device)
+
+        assert set(second["skipped_stages"]) == {"inventory", "interfaces", "stack"}
+        assert Interface.objects.get(device=device, name="Gi2/0/3").description == "manual"
+        runtime = DeviceRuntimeStatus.objects.get(device=device)
+        assert runtime.last_check == second_service.now
+        assert Device.objects.get(id=device.id).last_seen == second_service.now
+
+        forced = SyncService(site=device.site).sync_device(device, force=True)
+
+    assert forced["skipped_stages"] == []
+    assert Interface.objects.get(device=device, name="Gi2/0/3").description != "manual"
+
+
+@pytest.mark.django_db
+def test_sync_device_updates_device_type_when_inventory_is_unchanged(ios_xe_device_with_cred, fake_netmiko_adapter):
+    device = ios_xe_device_with_cred
+    detected = device.device_type
+    with patch("network.services.sync_service.NetmikoAdapter", fake_netmiko_adapter):
+        SyncService(site=device.site).sync_device(device)
+        other = DeviceType.objects.create(model="C9200-24T", vendor=detected.vendor, platform=detected.platform)
+        Device.objects.filter(id=device.id).update(device_type=other)
+        device.refresh_from_db()
+
+        result = SyncService(site=device.site).sync_device(device)
+
+    assert "inventory" in result["skipped_stages"]
+    assert Device.objects.get(id=device.id).device_type == detected
+
+
+@pytest.mark.django_db
+def test_sync_device_collects_outside_the_write_transaction(ios_xe_device_with_cred, fake_netmiko_adapter):
+    connection = transaction.get_connection()
+    baseline = len(connection.savepoint_ids)
+    depths = []
+
+    class RecordingNetmikoAdapter(fake_netmiko_adapter):
+        def run_command_raw(self, command: str) -> dict:
+            depths.append(len(connection.savepoint_ids))
+            return super().run_command_raw(command)
+
+    service = SyncService(site=ios_xe_device_with_cred.site)
+    with patch("network.services.sync_service.NetmikoAdapter", RecordingNetmikoAdapter):
+        result = service.sync_device(ios_xe_device_with_cred, include_config=False)
+
+    assert result["success"] is True
+    assert depths and set(depths) == {baseline}
+    assert set(result["timings"]) == {"collect", "parse", "write"}
+
+
+def test_fingerprint_ignores_exec_timestamp_banners():
+    plain = "Port    Name\nGi1/0/1  uplink\n"
+    stamped = "Load for five secs: 3%/0%; one minute: 4%\nTime source is NTP, 10:01:02 CET\n\n" + plain
+
+    assert SyncService._fingerprint_output(plain) == SyncService._fingerprint_output(stamped)
+    assert SyncService._fingerprint_output(plain) != SyncService._fingerprint_output(plain + "Gi1/0/2\n")
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 
 from asset.models import InventoryItem
@@ -159,3 +161,51 @@ def test_sync_version_does_not_reconcile_device_serial_against_storage_or_other_
     assert new_device.serial_number == "DEV-300"
     assert old_device.serial_number == "DEV-300"
     assert InventoryItem.objects.filter(serial_number="DEV-300").exists()
+
+
+@pytest.mark.django_db
+def test_sync_transceivers_reconcile_in_constant_queries(
+    serial_conflict_context, django_assert_max_num_queries
+):
+    site = serial_conflict_context["site"]
+    area = serial_conflict_context["area"]
+    device_type = serial_conflict_context["device_type"]
+    other_device = _create_device(
+        name="other-device",
+        ip="10.0.0.20",
+        site=site,
+        area=area,
+        device_type=device_type,
+    )
+    device = _create_device(
+        name="optics-device",
+        ip="10.0.0.21",
+        site=site,
+        area=area,
+        device_type=device_type,
+    )
+    DeviceModule.objects.create(device=other_device, name="Transceiver Ethernet1/9", serial_number="sfp-1")
+    DeviceModule.objects.create(device=device, name="Transceiver Ethernet1/99", serial_number="SFP-OLD")
+    InventoryItem.objects.create(
+        designation="Spare optic",
+        model="SFP-10G-SR",
+        site=site,
+        area=area,
+        serial_number="Sfp-2",
+    )
+    entries = [
+        {"name": f"Transceiver Ethernet1/{index}", "serial": f"SFP-{index}", "description": "SFP-10G-SR"}
+        for index in range(1, 97)
+    ]
+    service = SyncService(site=site)
+
+    with patch.object(service, "_parse_transceiver_entries", return_value=entries):
+        with django_assert_max_num_queries(8):
+            service._apply_transceivers(device, {})
+        with django_assert_max_num_queries(3):
+            service._apply_transceivers(device, {})
+
+    assert DeviceModule.objects.filter(device=device).count() == 96
+    assert not DeviceModule.objects.filter(device=other_device).exists()
+    assert not DeviceModule.objects.filter(name="Transceiver Ethernet1/99").exists()
+    assert not InventoryItem.objects.filter(serial_number="Sfp-2").exists()
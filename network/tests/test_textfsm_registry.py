@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+
+from dcim.choices import DevicePlatformChoices
+from network.choices import CliCommandsChoices as cli
+from network.parsers import ACI_PLATFORM, TextFSMTemplateRegistry, template_registry
+
+
+FIXTURE_DIR = Path(settings.BASE_DIR) / "network" / "tests" / "fixtures"
+
+
+def _load_fixture(platform: str, name: str) -> str:
+    return (FIXTURE_DIR / platform / name).read_text(encoding="utf-8")
+
+
+def test_template_lookup_by_platform_and_command():
+    assert (
+        template_registry.template_for(DevicePlatformChoices.IOS_XE, cli.IF_STATUS_CMD)
+        == "cisco_ios_show_interface_status.textfsm"
+    )
+    assert (
+        template_registry.template_for(ACI_PLATFORM, cli.IF_STATUS_CMD)
+        == "cisco_aci_show_interface_status.textfsm"
+    )
+    # ACI falls back to NX-OS for commands without a dedicated template.
+    assert (
+        template_registry.template_for(ACI_PLATFORM, cli.IF_DESC_CMD)
+        == "cisco_nxos_show_interface_description.textfsm"
+    )
+    assert template_registry.template_for(DevicePlatformChoices.EOS, cli.VERSION_CMD) is None
+    assert template_registry.template_for(None, cli.VERSION_CMD) is None
+
+
+def test_registry_compiles_once_and_clones_are_independent(monkeypatch):
+    registry = TextFSMTemplateRegistry()
+    registry.register(DevicePlatformChoices.IOS, {cli.INVENTORY_CMD: "cisco_ios_show_inventory.textfsm"})
+    compiled = []
+    original = registry._compile
+    monkeypatch.setattr(
+        registry, "_compile", lambda name: compiled.append(name) or original(name)
+    )
+    raw = _load_fixture("ios_xe", "show_inventory.txt")
+
+    first = registry.parse_command(DevicePlatformChoices.IOS, cli.INVENTORY_CMD, raw)
+    second = registry.parse_command(DevicePlatformChoices.IOS, cli.INVENTORY_CMD, raw)
+
+    assert compiled == ["cisco_ios_show_inventory.textfsm"]
+    assert first == second
+    assert registry.get("cisco_ios_show_inventory.textfsm") is not registry.get(
+        "cisco_ios_show_inventory.textfsm"
+    )
+
+
+def test_registry_parses_concurrently_with_identical_results():
+    raw = _load_fixture("nxos", "show_interface_status.txt")
+    expected = template_registry.parse_command(DevicePlatformChoices.NX_OS, cli.IF_STATUS_CMD, raw)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(
+            pool.map(
+                lambda _: template_registry.parse_command(
+                    DevicePlatformChoices.NX_OS, cli.IF_STATUS_CMD, raw
+                ),
+                range(32),
+            )
+        )
+
+    assert expected
+    assert all(result == expected for result in results)
+
+
+def test_prewarm_compiles_all_registered_templates():
+    registry = TextFSMTemplateRegistry()
+    registry.register(DevicePlatformChoices.IOS, {cli.VERSION_CMD: "cisco_ios_show_version.textfsm"})
+    registry.register(ACI_PLATFORM, {cli.VERSION_CMD: "cisco_nxos_aci_show_version.textfsm"})
+
+    assert registry.prewarm() == 2
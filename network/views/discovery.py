@@ -763,6 +763,8 @@ def discovery_scan_status(request, job_id):
             "exact": job.exact_count,
             "mismatch": job.mismatch_count,
             "new": job.new_count,
+            "incremental": job.incremental,
+            "skipped": job.skipped_count,
             "error": job.error_message,
         }
     )
@@ -20,8 +20,12 @@ class TopologyService:
         protocol: str,
         platform: str = "",
         capabilities: str = "",
+        ptr_names: dict[str, str] | None = None,
     ) -> TopologyNeighbor:
         neighbor_name = normalize_hostname(neighbor_name, site=device.site)
+        # neighbors that only advertise an address are named after its PTR record;
+        # callers resolve those up front so no lookup runs inside their transaction
+        neighbor_name = (ptr_names or {}).get(neighbor_name, neighbor_name)
         if not neighbor_name or not local_interface:
             raise ValueError("neighbor_name and local_interface are required")
 
@@ -9,12 +9,20 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "zas.settings")
 
 django_asgi_app = get_asgi_application()
 
+websocket_urlpatterns = []
 try:
     from automation import ssh_routing
 
-    websocket_urlpatterns = ssh_routing.websocket_urlpatterns
+    websocket_urlpatterns += ssh_routing.websocket_urlpatterns
 except Exception:
-    websocket_urlpatterns = []
+    pass
+
+try:
+    from network import discovery_routing
+
+    websocket_urlpatterns += discovery_routing.websocket_urlpatterns
+except Exception:
+    pass
 
 application = ProtocolTypeRouter(
     {
@@ -2,6 +2,7 @@
 from __future__ import absolute_import, unicode_literals
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 
 # Set the default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'zas.settings.base')
@@ -15,6 +16,15 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Auto-discover tasks from all installed apps
 app.autodiscover_tasks()
 
+
+@worker_process_init.connect
+def prewarm_textfsm_templates(**kwargs):
+    # Compile parser templates once per worker process so the first device
+    # sync does not pay for it.
+    from network.parsers import template_registry
+    template_registry.prewarm()
+
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
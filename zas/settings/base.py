@@ -170,6 +170,51 @@ CELERY_ENABLE_UTC = True
 # Tell Celery beat to load schedules from database
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers.DatabaseScheduler'
 
+# Fleet sync fan-out (network.tasks.run_scheduled_sync_job)
+SYNC_FANOUT_GLOBAL_CONCURRENCY = env.int("SYNC_FANOUT_GLOBAL_CONCURRENCY", default=16)
+SYNC_FANOUT_SITE_CONCURRENCY = env.int("SYNC_FANOUT_SITE_CONCURRENCY", default=4)
+# Prometheus Pushgateway for per-stage sync metrics (empty disables the push)
+SYNC_METRICS_PUSHGATEWAY = env("SYNC_METRICS_PUSHGATEWAY", default="")
+# Concurrent probes per reachability run (automation.engine.reachability_engine)
+REACHABILITY_CONCURRENCY = env.int("REACHABILITY_CONCURRENCY", default=200)
+# Bump last_check on runtime rows whose reachability flags did not change
+REACHABILITY_TOUCH_UNCHANGED = env.bool("REACHABILITY_TOUCH_UNCHANGED", default=True)
+# Reachability time series retention (automation.application.reachability_history_service)
+REACHABILITY_SAMPLE_RETENTION_DAYS = env.int("REACHABILITY_SAMPLE_RETENTION_DAYS", default=14)
+REACHABILITY_HOURLY_ROLLUP_RETENTION_DAYS = env.int("REACHABILITY_HOURLY_ROLLUP_RETENTION_DAYS", default=90)
+REACHABILITY_DAILY_ROLLUP_RETENTION_DAYS = env.int("REACHABILITY_DAILY_ROLLUP_RETENTION_DAYS", default=730)
+# Adaptive reachability scheduling (automation.application.reachability_schedule_service)
+REACHABILITY_ADAPTIVE = env.bool("REACHABILITY_ADAPTIVE", default=True)
+REACHABILITY_BACKOFF_CHECKS = env.int("REACHABILITY_BACKOFF_CHECKS", default=6)
+REACHABILITY_MAX_STALENESS_MINUTES = env.int("REACHABILITY_MAX_STALENESS_MINUTES", default=60)
+REACHABILITY_RECHECK_SECONDS = env.int("REACHABILITY_RECHECK_SECONDS", default=60)
+# Reachability runs larger than one shard fan out across workers (automation.tasks)
+REACHABILITY_SHARD_SIZE = env.int("REACHABILITY_SHARD_SIZE", default=250)
+REACHABILITY_SHARD_CONCURRENCY = env.int("REACHABILITY_SHARD_CONCURRENCY", default=8)
+REACHABILITY_SHARD_TIME_LIMIT = env.int("REACHABILITY_SHARD_TIME_LIMIT", default=300)
+# Discovery TCP connect scan: connects in flight and started per second (0 = unlimited)
+DISCOVERY_TCP_CONCURRENCY = env.int("DISCOVERY_TCP_CONCURRENCY", default=1000)
+DISCOVERY_TCP_RATE = env.int("DISCOVERY_TCP_RATE", default=0)
+# Discovery streaming: ICMP hosts pinged per chunk, alive candidates written per transaction
+DISCOVERY_ICMP_CHUNK_SIZE = env.int("DISCOVERY_ICMP_CHUNK_SIZE", default=4096)
+DISCOVERY_WRITE_BATCH_SIZE = env.int("DISCOVERY_WRITE_BATCH_SIZE", default=500)
+# Discovery jobs: TCP ranges scanned at once (sharing the connect budget), seconds between progress pushes
+DISCOVERY_RANGE_CONCURRENCY = env.int("DISCOVERY_RANGE_CONCURRENCY", default=8)
+DISCOVERY_PROGRESS_INTERVAL = env.float("DISCOVERY_PROGRESS_INTERVAL", default=1.0)
+# Incremental discovery (network.services.discovery_schedule): scheduled scans delta-scan
+# ranges between full sweeps, skip freshly checked devices and back off dead addresses
+DISCOVERY_INCREMENTAL = env.bool("DISCOVERY_INCREMENTAL", default=True)
+DISCOVERY_FULL_SWEEP_HOURS = env.int("DISCOVERY_FULL_SWEEP_HOURS", default=168)
+DISCOVERY_DEVICE_FRESH_MINUTES = env.int("DISCOVERY_DEVICE_FRESH_MINUTES", default=60)
+DISCOVERY_DEAD_BACKOFF_HOURS = env.int("DISCOVERY_DEAD_BACKOFF_HOURS", default=6)
+# Reverse DNS (dcim.services.dns_resolver): per-lookup timeout, lookups in flight, cache TTLs
+DNS_TIMEOUT = env.float("DNS_TIMEOUT", default=1.0)
+DNS_CONCURRENCY = env.int("DNS_CONCURRENCY", default=64)
+DNS_CACHE_TTL = env.int("DNS_CACHE_TTL", default=3600)
+DNS_NEGATIVE_CACHE_TTL = env.int("DNS_NEGATIVE_CACHE_TTL", default=300)
+# Share the PTR cache between workers through Redis (empty = per-process cache only)
+DNS_CACHE_REDIS_URL = env("DNS_CACHE_REDIS_URL", default="")
+
 # Authentication settings
 LOGIN_URL = '/admin/login/'
 LOGOUT_REDIRECT_URL = '/admin/login/'